@@ -1,3 +1,4 @@
 from pysgrid.sgrid import SGrid2D, SGrid3D, from_ncfile, from_nc_dataset
+from pysgrid.stations import extract_stations
 
 __version__ = "0.0.4-beta"
@@ -0,0 +1,128 @@
+'''
+Created on Oct 18, 2026
+
+asyncio interface for loading grids and reading
+variables without blocking the event loop.
+
+netCDF I/O runs in a bounded thread pool. Calls into
+the netCDF4 library are serialized by NETCDF_LOCK,
+so any number of grids or files can be requested
+concurrently without the caller managing threads.
+
+'''
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .sgrid import SGrid2D, SGrid3D
+from .sgrid import from_ncfile as _from_ncfile
+
+
+DEFAULT_MAX_WORKERS = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Get the thread pool used for netCDF I/O,
+    creating it on first use.
+
+    :return: the I/O executor
+    :rtype: concurrent.futures.ThreadPoolExecutor
+
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS,
+                                           thread_name_prefix='pysgrid-io'
+                                           )
+        return _executor
+
+
+def set_max_workers(max_workers):
+    """
+    Replace the I/O executor with one bounded to
+    max_workers threads. Work already submitted
+    to the previous executor is allowed to finish.
+
+    :param int max_workers: maximum number of I/O threads
+    """
+    global _executor
+    with _executor_lock:
+        previous_executor = _executor
+        _executor = ThreadPoolExecutor(max_workers=max_workers,
+                                       thread_name_prefix='pysgrid-io'
+                                       )
+    if previous_executor is not None:
+        previous_executor.shutdown(wait=False)
+
+
+async def run_in_executor(func, *args, **kwargs):
+    """
+    Run a blocking function in the I/O executor
+    and wait for its result.
+
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def from_ncfile(nc_url, grid_topology_var=None, variables=None, exclude_variables=None):
+    """
+    Get a SGrid object from a file without blocking the
+    event loop. Arguments are the same as for
+    pysgrid.from_ncfile.
+
+    :param str nc_url: URL or filepath to the netCDF file
+    :param str grid_topology_var: the name of the grid topology variable; defaults to None
+    :param list variables: names of the variables to attach; defaults to all variables
+    :param list exclude_variables: names of variables not to attach; defaults to None
+    :return: SGrid object
+    :rtype: sgrid.SGrid2D or sgrid.SGrid3D
+
+    """
+    return await run_in_executor(_from_ncfile,
+                                 nc_url,
+                                 grid_topology_var,
+                                 variables=variables,
+                                 exclude_variables=exclude_variables
+                                 )
+
+
+async def from_cache(cache_dir, topology_dimension=2):
+    """
+    Open a grid cache written by to_cache without
+    blocking the event loop.
+
+    :param str cache_dir: directory containing the cache
+    :param int topology_dimension: topology dimension of the cached grid
+    :return: SGrid object
+    :rtype: sgrid.SGrid2D or sgrid.SGrid3D
+
+    """
+    if topology_dimension == 2:
+        grid_class = SGrid2D
+    elif topology_dimension == 3:
+        grid_class = SGrid3D
+    else:
+        raise ValueError('Only topology dimensions of 2 or 3 are supported')
+    return await run_in_executor(grid_class.from_cache, cache_dir)
+
+
+async def read_variable(sgrid_variable, index=Ellipsis):
+    """
+    Read data for a grid variable without blocking
+    the event loop.
+
+    :param sgrid_variable: the variable to read
+    :type sgrid_variable: variables.SGridVariable
+    :param index: index or slices of the data to read; defaults to all data
+    :return: the requested data
+    :rtype: numpy.ma.MaskedArray
+
+    """
+    return await run_in_executor(sgrid_variable.read, index)
@@ -0,0 +1,177 @@
+'''
+Created on Oct 18, 2026
+
+Helpers for passing large grid arrays to other
+processes by reference instead of by value.
+
+'''
+import mmap
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedArrayReference(object):
+    """
+    Picklable reference to a numpy array stored
+    in a multiprocessing.shared_memory block.
+
+    """
+    __slots__ = ('name', 'shape', 'dtype')
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+
+    def __getstate__(self):
+        return self.name, self.shape, self.dtype.str
+
+    def __setstate__(self, state):
+        name, shape, dtype = state
+        self.name = name
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+
+    def attach(self):
+        """
+        Attach to the shared memory block.
+
+        The returned SharedMemory object must be kept
+        alive for as long as the array is in use.
+
+        :return: the shared memory block and an array backed by it
+        :rtype: tuple
+
+        """
+        shm = attach_shared_memory(self.name)
+        array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+        return shm, array
+
+
+class MemmapArrayReference(object):
+    """
+    Picklable reference to a numpy array that is
+    memory-mapped from a file.
+
+    """
+    __slots__ = ('filename', 'shape', 'dtype', 'offset', 'order')
+
+    def __init__(self, filename, shape, dtype, offset=0, order='C'):
+        self.filename = filename
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.offset = offset
+        self.order = order
+
+    def __getstate__(self):
+        return self.filename, self.shape, self.dtype.str, self.offset, self.order
+
+    def __setstate__(self, state):
+        filename, shape, dtype, offset, order = state
+        self.filename = filename
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+        self.offset = offset
+        self.order = order
+
+    def attach(self):
+        """
+        Map the file read-only.
+
+        :return: memory-mapped array
+        :rtype: numpy.memmap
+
+        """
+        return np.memmap(self.filename,
+                         dtype=self.dtype,
+                         mode='r',
+                         offset=self.offset,
+                         shape=self.shape,
+                         order=self.order
+                         )
+
+
+def attach_shared_memory(name):
+    """
+    Attach to an existing shared memory block without
+    handing it to the resource tracker where the Python
+    version allows it; only the creator should unlink it.
+
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # track was added in Python 3.13
+        shm = shared_memory.SharedMemory(name=name)
+    return shm
+
+
+def shareable_array(array):
+    """
+    Get the plain ndarray that can be moved into shared
+    memory, or None if the array should stay as it is.
+    Masked arrays are only shared when nothing is masked.
+
+    """
+    if not isinstance(array, np.ndarray) or is_mapped_array(array):
+        return None
+    if isinstance(array, np.ma.MaskedArray):
+        if np.ma.is_masked(array):
+            return None
+        array = np.ma.getdata(array)
+    if array.dtype.hasobject or array.nbytes == 0:
+        return None
+    return array
+
+
+def create_shared_array(array):
+    """
+    Copy an array into a new shared memory block.
+
+    :param numpy.ndarray array: the array to copy
+    :return: the shared memory block and an array backed by it
+    :rtype: tuple
+
+    """
+    shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+    shared_array = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    shared_array[...] = array
+    return shm, shared_array
+
+
+def is_mapped_array(array):
+    """
+    Determine whether an array is a memory map of a
+    whole file region (not a view of one), which can
+    be re-opened from its file name and offset.
+
+    """
+    return (isinstance(array, np.memmap) and
+            isinstance(array.base, mmap.mmap) and
+            array.filename is not None
+            )
+
+
+def array_reference(array, shm=None):
+    """
+    Get a picklable reference for an array, if it
+    can be passed by reference.
+
+    :param numpy.ndarray array: the array
+    :param shm: the shared memory block backing the array, if any
+    :type shm: multiprocessing.shared_memory.SharedMemory
+    :return: a reference, or None if the array must be pickled by value
+    :rtype: SharedArrayReference or MemmapArrayReference
+
+    """
+    if shm is not None:
+        reference = SharedArrayReference(shm.name, array.shape, array.dtype)
+    elif is_mapped_array(array):
+        if array.flags.f_contiguous and not array.flags.c_contiguous:
+            order = 'F'
+        else:
+            order = 'C'
+        reference = MemmapArrayReference(array.filename, array.shape, array.dtype, array.offset, order)
+    else:
+        reference = None
+    return reference
@@ -0,0 +1,120 @@
+'''
+Created on Oct 18, 2026
+
+Face and edge connectivity of structured grids,
+in the form used by unstructured (UGRID) tools.
+
+Nodes are numbered row-major over the node
+dimensions (eta, xi). Faces are the cells between
+nodes, numbered row-major. Edges are numbered with
+the ones running along xi (between nodes (j, i) and
+(j, i + 1)) first, followed by the ones running
+along eta (between nodes (j, i) and (j + 1, i)).
+
+'''
+import numpy as np
+
+from .operators import EDGE_FACE_OFFSETS
+
+
+def connectivity_dtype(count):
+    """
+    Get the smallest signed integer type, int32 or
+    int64, that can index count elements.
+
+    :param int count: number of elements
+    :return: the integer type
+    :rtype: numpy.dtype
+
+    """
+    if count <= np.iinfo(np.int32).max:
+        return np.dtype(np.int32)
+    return np.dtype(np.int64)
+
+
+def _node_numbers(node_shape):
+    row_count, column_count = node_shape
+    return np.arange(row_count * column_count,
+                     dtype=connectivity_dtype(row_count * column_count)).reshape(node_shape)
+
+
+def face_nodes(node_shape):
+    """
+    Get the nodes of every face, counterclockwise
+    from the node with the lowest indices.
+
+    :param tuple node_shape: number of (eta, xi) nodes
+    :return: node numbers with shape (faces, 4)
+    :rtype: numpy.array
+
+    """
+    nodes = _node_numbers(node_shape)
+    return np.stack((nodes[:-1, :-1],
+                     nodes[:-1, 1:],
+                     nodes[1:, 1:],
+                     nodes[1:, :-1]), axis=-1).reshape(-1, 4)
+
+
+def edge_nodes(node_shape):
+    """
+    Get the two nodes of every edge.
+
+    :param tuple node_shape: number of (eta, xi) nodes
+    :return: node numbers with shape (edges, 2)
+    :rtype: numpy.array
+
+    """
+    nodes = _node_numbers(node_shape)
+    xi_edges = np.stack((nodes[:, :-1], nodes[:, 1:]), axis=-1).reshape(-1, 2)
+    eta_edges = np.stack((nodes[:-1, :], nodes[1:, :]), axis=-1).reshape(-1, 2)
+    return np.concatenate((xi_edges, eta_edges))
+
+
+def face_edges(node_shape):
+    """
+    Get the edges of every face, in the same order
+    as the face nodes: the edge from the first to the
+    second node first.
+
+    :param tuple node_shape: number of (eta, xi) nodes
+    :return: edge numbers with shape (faces, 4)
+    :rtype: numpy.array
+
+    """
+    row_count, column_count = node_shape
+    xi_edge_count = row_count * (column_count - 1)
+    edge_count = xi_edge_count + (row_count - 1) * column_count
+    dtype = connectivity_dtype(edge_count)
+    xi_edges = np.arange(xi_edge_count, dtype=dtype).reshape(row_count, column_count - 1)
+    eta_edges = np.arange(xi_edge_count, edge_count, dtype=dtype).reshape(row_count - 1, column_count)
+    return np.stack((xi_edges[:-1, :],
+                     eta_edges[:, 1:],
+                     xi_edges[1:, :],
+                     eta_edges[:, :-1]), axis=-1).reshape(-1, 4)
+
+
+def edge_points(node_shape, x_padding='both', y_padding='both'):
+    """
+    Get the SGRID edge points that lie on each edge.
+    Edges along xi carry edge2 (y-directed) values and
+    edges along eta carry edge1 (x-directed) values;
+    the padding of the face dimensions sets how the
+    edge points line up with the nodes.
+
+    :param tuple node_shape: number of (eta, xi) nodes
+    :param str x_padding: padding type of the x face dimension
+    :param str y_padding: padding type of the y face dimension
+    :return: (rows, columns) of the edge2 points on the edges along xi and (rows, columns) of the edge1 points on the edges along eta
+    :rtype: tuple
+
+    """
+    row_count, column_count = node_shape
+    # the face between nodes i and i + 1 is face i + offset
+    xi_edge_rows, xi_edge_columns = np.meshgrid(np.arange(row_count),
+                                                np.arange(column_count - 1) + EDGE_FACE_OFFSETS[x_padding],
+                                                indexing='ij')
+    eta_edge_rows, eta_edge_columns = np.meshgrid(np.arange(row_count - 1) + EDGE_FACE_OFFSETS[y_padding],
+                                                  np.arange(column_count),
+                                                  indexing='ij')
+    return ((xi_edge_rows.ravel(), xi_edge_columns.ravel()),
+            (eta_edge_rows.ravel(), eta_edge_columns.ravel()))
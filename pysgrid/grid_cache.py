@@ -0,0 +1,157 @@
+'''
+Created on Oct 18, 2026
+
+Read and write the on-disk grid cache: topology
+metadata as JSON and arrays as raw .npy files
+that are memory-mapped when the cache is opened.
+
+'''
+import json
+import os
+
+import numpy as np
+
+from .read_netcdf import NetCDFVariableAttributes
+from .utils import GridPadding
+
+
+CACHE_FORMAT_VERSION = 1
+METADATA_FILE = 'sgrid.json'
+
+
+def _dtype_to_json(dtype):
+    # netCDF variable-length strings report the python str type as their dtype
+    if dtype is str:
+        return 'str'
+    return np.dtype(dtype).str
+
+
+def _dtype_from_json(dtype_str):
+    if dtype_str == 'str':
+        return str
+    return np.dtype(dtype_str)
+
+
+def _value_to_json(value):
+    if isinstance(value, tuple):
+        return [_value_to_json(item) for item in value]
+    elif isinstance(value, list):
+        return [_value_to_json(item) for item in value]
+    elif isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    else:
+        return value
+
+
+def _attribute_from_json(attr_name, value):
+    """
+    Restore the python types of a grid attribute
+    that were flattened to lists by JSON.
+
+    """
+    if value is None:
+        return None
+    if attr_name.endswith('_padding'):
+        return tuple(GridPadding(*padding_info) for padding_info in value)
+    elif attr_name.endswith('_coordinates'):
+        return tuple(value)
+    elif attr_name == 'dimensions':
+        return [tuple(dimension) for dimension in value]
+    else:
+        return value
+
+
+def _variable_to_json(variable_source):
+    variable_json = {'name': variable_source.name,
+                     'dimensions': list(variable_source.dimensions),
+                     'dtype': _dtype_to_json(variable_source.dtype),
+                     'attributes': dict((attr, _value_to_json(attr_value))
+                                        for attr, attr_value in variable_source.attributes.items())
+                     }
+    return variable_json
+
+
+def _variable_from_json(variable_json):
+    variable_source = NetCDFVariableAttributes(variable_json['name'],
+                                               variable_json['dimensions'],
+                                               _dtype_from_json(variable_json['dtype']),
+                                               variable_json['attributes']
+                                               )
+    return variable_source
+
+
+def write_grid_cache(sgrid, cache_dir, arrays, attributes):
+    """
+    Write a grid cache directory.
+
+    The metadata file is written last, so a cache
+    that was only partially written is never read.
+
+    :param sgrid: the grid being cached
+    :type sgrid: sgrid.SGrid2D or sgrid.SGrid3D
+    :param str cache_dir: directory to write the cache to; created if needed
+    :param dict arrays: arrays to store by attribute name
+    :param dict attributes: JSON serializable grid attributes by name
+    :return: path to the metadata file
+    :rtype: str
+
+    """
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    array_files = {}
+    for attr_name, array in arrays.items():
+        data_file = '{0}.npy'.format(attr_name)
+        np.save(os.path.join(cache_dir, data_file), np.ma.getdata(array))
+        mask = np.ma.getmask(array)
+        if mask is not np.ma.nomask:
+            mask_file = '{0}_mask.npy'.format(attr_name)
+            np.save(os.path.join(cache_dir, mask_file), mask)
+        else:
+            mask_file = None
+        array_files[attr_name] = {'data': data_file, 'mask': mask_file}
+    variable_sources = sgrid.__dict__.get('_variable_sources', {})
+    metadata = {'format_version': CACHE_FORMAT_VERSION,
+                'grid_class': type(sgrid).__name__,
+                'topology_dimension': sgrid.topology_dimension,
+                'attributes': dict((attr_name, _value_to_json(value))
+                                   for attr_name, value in attributes.items()),
+                'arrays': array_files,
+                'variables': [_variable_to_json(variable_sources[variable])
+                              for variable in (sgrid.variables or [])
+                              if variable in variable_sources]
+                }
+    metadata_path = os.path.join(cache_dir, METADATA_FILE)
+    tmp_metadata_path = '{0}.tmp'.format(metadata_path)
+    with open(tmp_metadata_path, 'w') as metadata_file:
+        json.dump(metadata, metadata_file)
+    os.replace(tmp_metadata_path, metadata_path)
+    return metadata_path
+
+
+def read_grid_cache(cache_dir, mmap_mode='r'):
+    """
+    Read a grid cache directory.
+
+    :param str cache_dir: directory containing the cache
+    :param str mmap_mode: memory-map mode passed to numpy.load; None reads the arrays into memory
+    :return: grid class name, grid attributes, arrays, and variable snapshots
+    :rtype: tuple
+
+    """
+    metadata_path = os.path.join(cache_dir, METADATA_FILE)
+    with open(metadata_path) as metadata_file:
+        metadata = json.load(metadata_file)
+    if metadata.get('format_version') != CACHE_FORMAT_VERSION:
+        raise ValueError('Unsupported grid cache version in {0}'.format(metadata_path))
+    attributes = dict((attr_name, _attribute_from_json(attr_name, value))
+                      for attr_name, value in metadata['attributes'].items())
+    arrays = {}
+    for attr_name, array_files in metadata['arrays'].items():
+        data = np.load(os.path.join(cache_dir, array_files['data']), mmap_mode=mmap_mode)
+        if array_files['mask'] is not None:
+            mask = np.load(os.path.join(cache_dir, array_files['mask']))
+            data = np.ma.masked_array(data, mask=mask)
+        arrays[attr_name] = data
+    variable_sources = dict((variable_json['name'], _variable_from_json(variable_json))
+                            for variable_json in metadata['variables'])
+    return metadata['grid_class'], attributes, arrays, variable_sources
@@ -0,0 +1,154 @@
+'''
+Created on Oct 18, 2026
+
+Compact storage of the wet (unmasked) points of a
+grid location. Data are gathered into 1-D arrays of
+wet points that share one index map, processed in
+that form, and scattered back to the full grid only
+when needed.
+
+'''
+import numpy as np
+
+
+# ROMS land mask variables by grid location; 1 is water and 0 is land
+MASK_VARIABLES = {'face': 'mask_rho',
+                  'edge1': 'mask_u',
+                  'edge2': 'mask_v',
+                  'node': 'mask_psi'
+                  }
+# rows of the grid whose wet points are read together
+WET_BLOCK_ROWS = 64
+
+
+class WetPointIndex(object):
+    """
+    Index map between a 2-D grid location and
+    the 1-D array of its wet points.
+
+    """
+    def __init__(self, mask):
+        """
+        :param mask: True (or nonzero) at wet points
+        :type mask: numpy.array
+        """
+        mask = np.ma.filled(np.ma.asarray(mask), 0).astype(bool)
+        self.shape = mask.shape
+        self.flat_indices = np.flatnonzero(mask)
+        self._positions = None
+
+    @classmethod
+    def from_fill_values(cls, data):
+        """
+        Build the index from data whose land points are
+        masked or hold the fill value.
+
+        :param data: a 2-D masked array
+        :type data: numpy.ma.MaskedArray
+        :return: the index
+        :rtype: WetPointIndex
+
+        """
+        return cls(~np.ma.getmaskarray(data))
+
+    @property
+    def count(self):
+        return self.flat_indices.size
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def land_fraction(self):
+        return 1.0 - float(self.count) / self.size if self.size else 0.0
+
+    @property
+    def mask(self):
+        """
+        True at wet points.
+
+        """
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.flat_indices] = True
+        return mask.reshape(self.shape)
+
+    @property
+    def positions(self):
+        """
+        Position of every grid point in the compressed
+        array, or -1 for land points.
+
+        """
+        if self._positions is None:
+            positions = np.full(self.size, -1, dtype=np.intp)
+            positions[self.flat_indices] = np.arange(self.count)
+            self._positions = positions.reshape(self.shape)
+        return self._positions
+
+    def blocks(self, block_rows=WET_BLOCK_ROWS):
+        """
+        Split the wet points of a 2-D index into blocks of
+        rows and find the bounding box of each block, so
+        data can be read a box at a time. Rows without wet
+        points are skipped.
+
+        :param int block_rows: number of grid rows in a block
+        :return: yields the (row, column) slices of a box, the flat indices of its wet points within the box, and the slice of the compressed array they fill
+        :rtype: generator
+
+        """
+        if len(self.shape) != 2:
+            raise ValueError('Blocks are rows of a 2-D index, not of shape {0}'.format(self.shape))
+        rows, columns = np.divmod(self.flat_indices, self.shape[1])
+        # flat indices are sorted, so each block is a run of wet points
+        bounds = np.append(np.searchsorted(rows, np.arange(0, self.shape[0], block_rows)), self.count)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            if start == stop:
+                continue
+            wet_rows = rows[start:stop]
+            wet_columns = columns[start:stop]
+            row_start = wet_rows[0]
+            column_start = wet_columns.min()
+            box_width = wet_columns.max() + 1 - column_start
+            box = (slice(row_start, wet_rows[-1] + 1), slice(column_start, column_start + box_width))
+            yield box, (wet_rows - row_start) * box_width + wet_columns - column_start, slice(start, stop)
+
+    def compress(self, data):
+        """
+        Gather the wet points of data.
+
+        :param data: data whose trailing dimensions have the shape of the index
+        :type data: numpy.array
+        :return: data with shape leading dimensions + (wet points,)
+        :rtype: numpy.array
+
+        """
+        data_shape = np.shape(data)
+        if data_shape[len(data_shape) - len(self.shape):] != self.shape:
+            raise ValueError('Data with shape {0} do not end with the grid shape {1}'.format(data_shape,
+                                                                                            self.shape))
+        leading_shape = data_shape[:len(data_shape) - len(self.shape)]
+        return data.reshape(leading_shape + (-1,))[..., self.flat_indices]
+
+    def expand(self, compressed, fill_value=None):
+        """
+        Scatter compressed data back to the full grid.
+
+        :param compressed: data with shape leading dimensions + (wet points,)
+        :type compressed: numpy.array
+        :param fill_value: value for land points; defaults to masking them
+        :return: data with shape leading dimensions + grid shape
+        :rtype: numpy.array or numpy.ma.MaskedArray
+
+        """
+        compressed = np.ma.asarray(compressed)
+        if compressed.shape[-1] != self.count:
+            raise ValueError('Expected {0} wet points, not {1}'.format(self.count, compressed.shape[-1]))
+        leading_shape = compressed.shape[:-1]
+        expanded = np.ma.masked_all(leading_shape + (self.size,), dtype=compressed.dtype)
+        expanded[..., self.flat_indices] = compressed
+        expanded = expanded.reshape(leading_shape + self.shape)
+        if fill_value is not None:
+            return expanded.filled(fill_value)
+        return expanded
@@ -0,0 +1,67 @@
+'''
+Created on Oct 18, 2026
+
+Grid metrics: the widths and areas of grid cells
+in meters, computed from node or center coordinates.
+
+'''
+import numpy as np
+
+from .utils import calculate_distance
+
+
+# ROMS variables holding the inverse cell widths (1/dx, 1/dy)
+METRIC_VARIABLES = {'dx': 'pm',
+                    'dy': 'pn'
+                    }
+METRIC_NAMES = ('dx', 'dy', 'area')
+
+
+def cell_widths_from_nodes(nodes):
+    """
+    Compute the widths of the cells enclosed by
+    grid nodes. Each width is the mean length of
+    the two cell edges crossing that direction.
+
+    :param nodes: paired (lon, lat) node coordinates with shape (eta, xi, 2)
+    :type nodes: numpy.array
+    :return: dx (along xi) and dy (along eta) with shape (eta - 1, xi - 1)
+    :rtype: tuple
+
+    """
+    nodes = np.ma.filled(np.ma.asarray(nodes, dtype=np.float64)[..., :2], np.nan)
+    x_edges = calculate_distance(nodes[:, :-1], nodes[:, 1:])
+    y_edges = calculate_distance(nodes[:-1, :], nodes[1:, :])
+    dx = 0.5 * (x_edges[:-1, :] + x_edges[1:, :])
+    dy = 0.5 * (y_edges[:, :-1] + y_edges[:, 1:])
+    return dx, dy
+
+
+def cell_widths_from_centers(centers):
+    """
+    Estimate cell widths from the distances between
+    neighboring cell centers: the mean of the distances
+    to the two neighbors, or the distance to the only
+    neighbor at the boundary.
+
+    :param centers: paired (lon, lat) center coordinates with shape (eta, xi, 2)
+    :type centers: numpy.array
+    :return: dx (along xi) and dy (along eta) with the shape of the centers
+    :rtype: tuple
+
+    """
+    centers = np.ma.filled(np.ma.asarray(centers, dtype=np.float64)[..., :2], np.nan)
+    widths = []
+    for axis in (1, 0):
+        if centers.shape[axis] < 2:
+            raise ValueError('At least 2 cell centers are needed along each axis')
+        lower = [slice(None)] * 2
+        upper = [slice(None)] * 2
+        lower[axis] = slice(None, -1)
+        upper[axis] = slice(1, None)
+        spacing = calculate_distance(centers[tuple(lower)], centers[tuple(upper)])
+        pad_width = [(0, 0), (0, 0)]
+        pad_width[axis] = (1, 1)
+        spacing = np.pad(spacing, pad_width, mode='edge')
+        widths.append(0.5 * (spacing[tuple(lower)] + spacing[tuple(upper)]))
+    return tuple(widths)
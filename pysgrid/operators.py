@@ -0,0 +1,231 @@
+'''
+Created on Oct 18, 2026
+
+Differential operators on the staggered grid.
+
+Arrays follow the grid's staggering: face (cell center)
+scalars have the shape of the faces, x-directed values
+(edge1) are staggered along the last axis, and
+y-directed values (edge2) along the second to last
+axis. The padding type of each face dimension sets how
+edges line up with faces:
+
+* with padding 'both' or 'low', edge i lies between
+  faces i and i + 1
+* with padding 'none' or 'high', edge i lies between
+  faces i - 1 and i
+
+Nodes line up with edges along the staggered axis.
+Results have the full shape of their location and are
+NaN where an operator cannot be evaluated. Any leading
+dimensions, such as time and depth, are computed
+together and can be split across threads.
+
+'''
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+# index of the face after edge 0, by face padding type
+EDGE_FACE_OFFSETS = {'both': 1,
+                     'low': 1,
+                     'none': 0,
+                     'high': 0
+                     }
+
+
+def _edge_face_offset(padding):
+    try:
+        return EDGE_FACE_OFFSETS[padding]
+    except KeyError:
+        raise ValueError('Unknown padding type: {0}'.format(padding))
+
+
+def _span(start, length, size):
+    # slice of a location array covered by values computed for `length` consecutive points from `start`
+    stop = min(start + length, size)
+    start = max(start, 0)
+    return slice(start, max(stop, start))
+
+
+def _prepare_out(out, shape, dtype=np.float64):
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError('out has shape {0}; expected {1}'.format(out.shape, shape))
+    out.fill(np.nan)
+    return out
+
+
+def _run_blocks(kernel, arrays, out, workers):
+    """
+    Run a kernel over blocks of the leading axis.
+    arrays are the inputs with leading dimensions;
+    the kernel writes into the matching block of out.
+
+    """
+    leading_size = out.shape[0] if out.ndim > 2 else 1
+    if workers is None or workers < 2 or out.ndim <= 2 or leading_size < 2:
+        kernel(out, *arrays)
+        return out
+    bounds = np.linspace(0, leading_size, min(workers, leading_size) + 1).astype(int)
+    blocks = [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+    with ThreadPoolExecutor(max_workers=len(blocks)) as executor:
+        futures = [executor.submit(kernel, out[block], *[array[block] for array in arrays])
+                   for block in blocks]
+        for future in futures:
+            future.result()
+    return out
+
+
+def divergence(u, v, dy_u, dx_v, area, x_padding='both', y_padding='both', out=None, workers=None):
+    """
+    Compute the horizontal divergence of a vector
+    field at faces from the fluxes through the
+    cell edges.
+
+    :param u: x-directed values on edge1
+    :type u: numpy.array
+    :param v: y-directed values on edge2
+    :type v: numpy.array
+    :param dy_u: cell widths along y on edge1
+    :type dy_u: numpy.array
+    :param dx_v: cell widths along x on edge2
+    :type dx_v: numpy.array
+    :param area: cell areas on faces
+    :type area: numpy.array
+    :param str x_padding: padding type of the x face dimension
+    :param str y_padding: padding type of the y face dimension
+    :param out: array with the shape of the result to write into
+    :type out: numpy.array
+    :param int workers: number of threads to split the leading axis across
+    :return: divergence on faces
+    :rtype: numpy.array
+
+    """
+    u = np.ma.filled(np.ma.asarray(u, dtype=np.float64), np.nan)
+    v = np.ma.filled(np.ma.asarray(v, dtype=np.float64), np.nan)
+    leading_shape = np.broadcast_shapes(u.shape[:-2], v.shape[:-2])
+    out = _prepare_out(out, leading_shape + area.shape)
+    rows = _span(_edge_face_offset(y_padding), v.shape[-2] - 1, area.shape[-2])
+    columns = _span(_edge_face_offset(x_padding), u.shape[-1] - 1, area.shape[-1])
+    row_count = rows.stop - rows.start
+    column_count = columns.stop - columns.start
+
+    def kernel(block_out, u_block, v_block):
+        result = block_out[..., rows, columns]
+        scratch = np.empty_like(result)
+        np.multiply(u_block[..., rows, 1:column_count + 1], dy_u[rows, 1:column_count + 1], out=result)
+        np.multiply(u_block[..., rows, :column_count], dy_u[rows, :column_count], out=scratch)
+        result -= scratch
+        np.multiply(v_block[..., 1:row_count + 1, columns], dx_v[1:row_count + 1, columns], out=scratch)
+        result += scratch
+        np.multiply(v_block[..., :row_count, columns], dx_v[:row_count, columns], out=scratch)
+        result -= scratch
+        result /= area[rows, columns]
+
+    u = np.broadcast_to(u, leading_shape + u.shape[-2:])
+    v = np.broadcast_to(v, leading_shape + v.shape[-2:])
+    return _run_blocks(kernel, (u, v), out, workers)
+
+
+def vorticity(u, v, dy_u, dx_v, x_padding='both', y_padding='both', out=None, workers=None):
+    """
+    Compute the relative vorticity, dv/dx - du/dy,
+    at nodes. Nodes have as many rows as edge2 and
+    as many columns as edge1.
+
+    :param u: x-directed values on edge1
+    :type u: numpy.array
+    :param v: y-directed values on edge2
+    :type v: numpy.array
+    :param dy_u: cell widths along y on edge1
+    :type dy_u: numpy.array
+    :param dx_v: cell widths along x on edge2
+    :type dx_v: numpy.array
+    :param str x_padding: padding type of the x face dimension
+    :param str y_padding: padding type of the y face dimension
+    :param out: array with the shape of the result to write into
+    :type out: numpy.array
+    :param int workers: number of threads to split the leading axis across
+    :return: vorticity on nodes
+    :rtype: numpy.array
+
+    """
+    u = np.ma.filled(np.ma.asarray(u, dtype=np.float64), np.nan)
+    v = np.ma.filled(np.ma.asarray(v, dtype=np.float64), np.nan)
+    leading_shape = np.broadcast_shapes(u.shape[:-2], v.shape[:-2])
+    node_shape = (v.shape[-2], u.shape[-1])
+    out = _prepare_out(out, leading_shape + node_shape)
+    # node i lies between faces i - 1 + offset and i + offset
+    rows = _span(1 - _edge_face_offset(y_padding), u.shape[-2] - 1, node_shape[0])
+    columns = _span(1 - _edge_face_offset(x_padding), v.shape[-1] - 1, node_shape[1])
+    u_rows = slice(rows.start - 1 + _edge_face_offset(y_padding), rows.stop - 1 + _edge_face_offset(y_padding))
+    v_columns = slice(columns.start - 1 + _edge_face_offset(x_padding),
+                      columns.stop - 1 + _edge_face_offset(x_padding))
+    dx_between_v = 0.5 * (dx_v[rows, v_columns.start + 1:v_columns.stop + 1] + dx_v[rows, v_columns])
+    dy_between_u = 0.5 * (dy_u[u_rows.start + 1:u_rows.stop + 1, columns] + dy_u[u_rows, columns])
+
+    def kernel(block_out, u_block, v_block):
+        result = block_out[..., rows, columns]
+        scratch = np.empty_like(result)
+        np.subtract(v_block[..., rows, v_columns.start + 1:v_columns.stop + 1], v_block[..., rows, v_columns],
+                    out=result)
+        result /= dx_between_v
+        np.subtract(u_block[..., u_rows.start + 1:u_rows.stop + 1, columns], u_block[..., u_rows, columns],
+                    out=scratch)
+        scratch /= dy_between_u
+        result -= scratch
+
+    u = np.broadcast_to(u, leading_shape + u.shape[-2:])
+    v = np.broadcast_to(v, leading_shape + v.shape[-2:])
+    return _run_blocks(kernel, (u, v), out, workers)
+
+
+def gradient(phi, dx_u, dy_v, x_padding='both', y_padding='both', out=None, workers=None):
+    """
+    Compute the gradient of a face scalar on the
+    edges between faces.
+
+    :param phi: values on faces
+    :type phi: numpy.array
+    :param dx_u: cell widths along x on edge1; sets the shape of the x gradient
+    :type dx_u: numpy.array
+    :param dy_v: cell widths along y on edge2; sets the shape of the y gradient
+    :type dy_v: numpy.array
+    :param str x_padding: padding type of the x face dimension
+    :param str y_padding: padding type of the y face dimension
+    :param out: pair of arrays to write the x and y gradients into
+    :type out: tuple
+    :param int workers: number of threads to split the leading axis across
+    :return: x gradient on edge1 and y gradient on edge2
+    :rtype: tuple
+
+    """
+    phi = np.ma.filled(np.ma.asarray(phi, dtype=np.float64), np.nan)
+    leading_shape = phi.shape[:-2]
+    x_out, y_out = out if out is not None else (None, None)
+    x_out = _prepare_out(x_out, leading_shape + dx_u.shape)
+    y_out = _prepare_out(y_out, leading_shape + dy_v.shape)
+    # edge i lies between faces i - 1 + offset and i + offset
+    x_offset = _edge_face_offset(x_padding)
+    y_offset = _edge_face_offset(y_padding)
+    x_columns = _span(1 - x_offset, phi.shape[-1] - 1, dx_u.shape[-1])
+    y_rows = _span(1 - y_offset, phi.shape[-2] - 1, dy_v.shape[-2])
+    x_faces = slice(x_columns.start - 1 + x_offset, x_columns.stop - 1 + x_offset)
+    y_faces = slice(y_rows.start - 1 + y_offset, y_rows.stop - 1 + y_offset)
+
+    def x_kernel(block_out, phi_block):
+        result = block_out[..., x_columns]
+        np.subtract(phi_block[..., x_faces.start + 1:x_faces.stop + 1], phi_block[..., x_faces], out=result)
+        result /= dx_u[:, x_columns]
+
+    def y_kernel(block_out, phi_block):
+        result = block_out[..., y_rows, :]
+        np.subtract(phi_block[..., y_faces.start + 1:y_faces.stop + 1, :], phi_block[..., y_faces, :], out=result)
+        result /= dy_v[y_rows, :]
+
+    _run_blocks(x_kernel, (phi,), x_out, workers)
+    _run_blocks(y_kernel, (phi,), y_out, workers)
+    return x_out, y_out
@@ -0,0 +1,146 @@
+'''
+Created on Oct 18, 2026
+
+Read steps of a variable on a background thread
+so that netCDF reads and decompression overlap
+with the caller's processing of earlier steps.
+
+'''
+import queue
+import threading
+
+import netCDF4 as nc4
+
+from .read_netcdf import NETCDF_LOCK
+
+
+_END = object()
+
+
+class _ReadError(object):
+
+    def __init__(self, error):
+        self.error = error
+
+
+class PrefetchReader(object):
+    """
+    Iterate over the steps of a variable along one axis,
+    across one or more files, while a background thread
+    reads up to `prefetch` steps ahead.
+
+    Each step is yielded as the array netCDF read it
+    into, masked where it holds fill values, so it can
+    be kept without a copy. Up to prefetch steps are
+    queued ahead of the caller, plus the step being
+    read; steps the caller keeps add to those.
+    Iterating again after the reader is closed starts
+    over from the first step.
+
+    """
+    def __init__(self, sources, variable, axis=0, prefetch=2, index=()):
+        """
+        :param sources: path or URL of a netCDF file, or a sequence of them read in order
+        :type sources: str or list
+        :param str variable: name of the variable to read
+        :param int axis: axis to step along; defaults to the first (time) axis
+        :param int prefetch: number of steps to read ahead
+        :param tuple index: index applied to the dimensions after axis
+        """
+        if prefetch < 1:
+            raise ValueError('prefetch must be at least 1')
+        if isinstance(sources, str):
+            sources = [sources]
+        self.sources = list(sources)
+        self.variable = variable
+        self.axis = axis
+        self.prefetch = prefetch
+        self.index = tuple(index)
+        self._ready = queue.Queue(maxsize=prefetch)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __iter__(self):
+        self.start()
+        try:
+            while True:
+                item = self._ready.get()
+                if item is _END:
+                    break
+                if isinstance(item, _ReadError):
+                    raise item.error
+                yield item
+        finally:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        """
+        Start the background reader if it is not running.
+        A closed reader is restarted from the first step.
+
+        """
+        if self._thread is not None and not self._stop.is_set():
+            return
+        self._ready = queue.Queue(maxsize=self.prefetch)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._read_steps, name='pysgrid-prefetch')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def close(self):
+        """
+        Stop the background reader and wait for it to exit.
+
+        """
+        self._stop.set()
+        if self._thread is not None:
+            while self._thread.is_alive():
+                self._drain()
+                self._thread.join(timeout=0.05)
+            self._drain()
+
+    def _drain(self):
+        try:
+            while True:
+                self._ready.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._ready.put(item, timeout=0.05)
+            except queue.Full:
+                continue
+            else:
+                return True
+        return False
+
+    def _read_steps(self):
+        try:
+            for source in self.sources:
+                with NETCDF_LOCK:
+                    nc_dataset = nc4.Dataset(source)
+                    nc_var = nc_dataset.variables[self.variable]
+                    step_count = nc_var.shape[self.axis]
+                try:
+                    for step in range(step_count):
+                        if self._stop.is_set():
+                            return
+                        key = (slice(None),) * self.axis + (step,) + self.index
+                        with NETCDF_LOCK:
+                            data = nc_var[key]
+                        if not self._put(data):
+                            return
+                finally:
+                    with NETCDF_LOCK:
+                        nc_dataset.close()
+            self._put(_END)
+        except Exception as error:
+            self._put(_ReadError(error))
@@ -71,4 +71,96 @@ def avg_to_cell_center(data_array, avg_dim):
         da_avg = np.transpose(da_avg_raw)
     else:
         da_avg = da_avg_raw
-    return da_avg
\ No newline at end of file
+    return da_avg
+
+
+def _edge_pad_width(padding):
+    # faces to add on each side so that every edge lies between two faces
+    pad_widths = {'both': (0, 0),
+                  'none': (1, 1),
+                  'low': (0, 1),
+                  'high': (1, 0)
+                  }
+    try:
+        return pad_widths[padding]
+    except KeyError:
+        raise ValueError('Unknown padding type: {0}'.format(padding))
+
+
+def face_to_edge(face_array, axis, padding):
+    """
+    Average values at grid cell faces to the edges
+    between them along one axis. The padding type of
+    the face dimension determines how many edges there
+    are: faces padded on both sides have one fewer
+    edge than faces, faces without padding have one
+    more, and faces padded on one side have as many.
+    Edges beyond the outermost faces take the value of
+    the nearest face.
+    
+    :param face_array: data at faces
+    :type face_array: numpy.array
+    :param int axis: axis to average along
+    :param str padding: padding type of the face dimension; 'both', 'none', 'low', or 'high'
+    :return: data at edges
+    :rtype: numpy.array
+    
+    """
+    pad_width = _edge_pad_width(padding)
+    face_array = np.asarray(face_array)
+    axis = axis % face_array.ndim
+    if pad_width != (0, 0):
+        pad_widths_all = [(0, 0)] * face_array.ndim
+        pad_widths_all[axis] = pad_width
+        face_array = np.pad(face_array, pad_widths_all, mode='edge')
+    lower = [slice(None)] * face_array.ndim
+    upper = [slice(None)] * face_array.ndim
+    lower[axis] = slice(None, -1)
+    upper[axis] = slice(1, None)
+    return 0.5 * (face_array[tuple(lower)] + face_array[tuple(upper)])
+
+
+def edge_faces(edge_indices, face_count, padding):
+    """
+    Get the indices of the two faces that face_to_edge
+    averages for each of the given edges along one axis,
+    so that edges can be computed at a few points without
+    averaging the whole array.
+    
+    :param edge_indices: indices of the edges along the axis
+    :type edge_indices: numpy.array
+    :param int face_count: number of faces along the axis
+    :param str padding: padding type of the face dimension; 'both', 'none', 'low', or 'high'
+    :return: indices of the lower and upper faces of each edge
+    :rtype: tuple
+    
+    """
+    low_pad_width = _edge_pad_width(padding)[0]
+    lower_faces = np.clip(np.asarray(edge_indices) - low_pad_width, 0, face_count - 1)
+    upper_faces = np.clip(np.asarray(edge_indices) - low_pad_width + 1, 0, face_count - 1)
+    return lower_faces, upper_faces
+
+
+def block_mean(data_array, factor):
+    """
+    Average blocks of factor x factor values over the
+    last two axes. Rows and columns that do not fill a
+    whole block are dropped. Masked and NaN values are
+    left out of the averages; blocks without any valid
+    values are masked.
+    
+    :param data_array: data to coarsen; leading dimensions are kept
+    :type data_array: numpy.array
+    :param int factor: number of values along each axis in a block
+    :return: block averages
+    :rtype: numpy.ma.MaskedArray
+    
+    """
+    if factor < 1:
+        raise ValueError('The coarsening factor must be at least 1')
+    data_array = np.ma.masked_invalid(np.ma.asarray(data_array, dtype=np.float64))
+    row_count = data_array.shape[-2] // factor
+    column_count = data_array.shape[-1] // factor
+    trimmed = data_array[..., :row_count * factor, :column_count * factor]
+    blocks = trimmed.reshape(data_array.shape[:-2] + (row_count, factor, column_count, factor))
+    return blocks.mean(axis=(-3, -1))
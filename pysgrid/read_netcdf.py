@@ -3,13 +3,47 @@ Created on Mar 19, 2015
 
 @author: ayan
 '''
+import functools
 import re
+import threading
+
+import netCDF4 as nc4
+import numpy as np
 
 from .custom_exceptions import CannotFindPaddingError, SGridNonCompliantError
 from .lookup import X_COORDINATES, Y_COORDINATES
 from .utils import GridPadding
 
 
+# compiled once and shared by every call
+PADDING_PATTERN = re.compile(r'([a-zA-Z0-9_]+:) ([a-zA-Z0-9_]+) (\(padding: [a-zA-Z]+\))')
+PARENTHESES_PATTERN = re.compile(r'[\(\)]')
+AXES_PATTERN = re.compile(r'([a-zA-Z]: [a-zA-Z_]+)')
+VECTOR_AXIS_PATTERN = re.compile(r'[a-z_]+_[xyz]_[a-z_]+')
+VECTOR_DIRECTION_PATTERN = re.compile(r'_[xyz]_')
+
+# number of distinct attribute strings remembered by each parser
+PARSER_CACHE_SIZE = 512
+
+# the netCDF4 library is not thread-safe; every netCDF call that
+# pysgrid makes from a thread other than the caller's holds this lock
+NETCDF_LOCK = threading.RLock()
+
+
+def netcdf_locked(func):
+    """
+    Decorator that holds NETCDF_LOCK while the
+    decorated function runs.
+    
+    """
+    @functools.wraps(func)
+    def locked_func(*args, **kwargs):
+        with NETCDF_LOCK:
+            return func(*args, **kwargs)
+    return locked_func
+
+
+@functools.lru_cache(maxsize=PARSER_CACHE_SIZE)
 def parse_padding(padding_str, mesh_topology_var):
     """
     Use regex expressions to break apart an
@@ -21,22 +55,24 @@ def parse_padding(padding_str, mesh_topology_var):
     for each node dimension of an edge, face, or vertical
     dimension. The named tuples have the following attributes:
     mesh_topology_var, dim_name, dim_var, and padding.
-    Padding information is returned as a list
+    Padding information is returned as a tuple
     of these named tuples.
     
+    Results are memoized on the raw attribute string, so
+    the same tuple is returned for every file sharing it.
+    
     :param str padding_str: string containing padding types from a netCDF attribute
     :return: named tuples with padding information
-    :rtype: list
+    :rtype: tuple
     
     """
-    p = re.compile('([a-zA-Z0-9_]+:) ([a-zA-Z0-9_]+) (\(padding: [a-zA-Z]+\))')
-    padding_matches = p.findall(padding_str)
+    padding_matches = PADDING_PATTERN.findall(padding_str)
     padding_type_list = []
     for padding_match in padding_matches:
         raw_dim, raw_sub_dim, raw_padding_var = padding_match
         dim = raw_dim.split(':')[0]
         sub_dim = raw_sub_dim
-        cleaned_padding_var = re.sub('[\(\)]', '', raw_padding_var)  # remove parentheses
+        cleaned_padding_var = PARENTHESES_PATTERN.sub('', raw_padding_var)  # remove parentheses
         padding_type = cleaned_padding_var.split(':')[1].strip()  # get the padding value and remove spaces
         grid_padding = GridPadding(mesh_topology_var=mesh_topology_var,
                                    face_dim=dim,
@@ -45,16 +81,16 @@ def parse_padding(padding_str, mesh_topology_var):
                                    )
         padding_type_list.append(grid_padding)
     if len(padding_type_list) > 0:
-        final_padding_types = padding_type_list
+        final_padding_types = tuple(padding_type_list)
     else:
         final_padding_types = None
         raise CannotFindPaddingError
     return final_padding_types
 
 
+@functools.lru_cache(maxsize=PARSER_CACHE_SIZE)
 def parse_axes(axes_attr):
-    p = re.compile('([a-zA-Z]: [a-zA-Z_]+)')
-    matches = p.findall(axes_attr)
+    matches = AXES_PATTERN.findall(axes_attr)
     x_axis = None
     y_axis = None
     z_axis = None
@@ -71,18 +107,164 @@ def parse_axes(axes_attr):
     return x_axis, y_axis, z_axis
 
 
+@functools.lru_cache(maxsize=PARSER_CACHE_SIZE)
 def parse_vector_axis(variable_standard_name):
-    p = re.compile('[a-z_]+_[xyz]_[a-z_]+')
-    match = p.match(variable_standard_name)
+    match = VECTOR_AXIS_PATTERN.match(variable_standard_name)
     if match is not None:
-        direction_pattern = re.compile('_[xyz]_')
-        direction_substr = direction_pattern.search(match.string).group()
+        direction_substr = VECTOR_DIRECTION_PATTERN.search(match.string).group()
         vector_direction = direction_substr.replace('_', '').upper()
     else:
         vector_direction = None
     return vector_direction
 
 
+class NetCDFVariableAttributes(object):
+    """
+    Lightweight snapshot of a netCDF variable holding only
+    what is needed to build an SGridVariable. It stays
+    usable after the dataset it came from is closed.
+    
+    Attributes that were not defined on the netCDF variable
+    raise an AttributeError, just like a netCDF4.Variable.
+    
+    """
+    __slots__ = ('name', 'dimensions', 'dtype', 'attributes')
+    
+    sgrid_attributes = ('grid', 'location', 'axes', 'standard_name', 'coordinates')
+    
+    def __init__(self, name, dimensions, dtype, attributes=None):
+        self.name = name
+        self.dimensions = tuple(dimensions)
+        self.dtype = dtype
+        self.attributes = attributes if attributes is not None else {}
+        
+    @classmethod
+    def from_nc_variable(cls, nc_var_obj):
+        nc_var_attrs = nc_var_obj.ncattrs()
+        attributes = dict((attr, nc_var_obj.getncattr(attr)) 
+                          for attr in cls.sgrid_attributes if attr in nc_var_attrs)
+        return cls(nc_var_obj.name, nc_var_obj.dimensions, nc_var_obj.dtype, attributes)
+        
+    def __getattr__(self, name):
+        # never look up special or slot attributes in the attributes
+        # dictionary; this keeps copying and pickling from recursing
+        if name.startswith('__') or name in self.__slots__:
+            raise AttributeError(name)
+        try:
+            return self.attributes[name]
+        except KeyError:
+            raise AttributeError(name)
+        
+    def __getstate__(self):
+        return self.name, self.dimensions, self.dtype, self.attributes
+    
+    def __setstate__(self, state):
+        self.name, self.dimensions, self.dtype, self.attributes = state
+
+
+class NetCDFCoordinateArray(object):
+    """
+    Read-on-demand array of paired coordinates, like the
+    arrays built by utils.pair_arrays. Nothing is read
+    until the array is indexed or converted with numpy;
+    indexing reads only the requested block of each
+    coordinate variable.
+    
+    The last axis indexes the coordinate variables in
+    the order they were given, e.g. (lon, lat, z).
+    
+    """
+    __slots__ = ('dataset_path', 'coordinate_variables', 'shape', 'dtype')
+    
+    def __init__(self, dataset_path, coordinate_variables, shape):
+        """
+        :param str dataset_path: file or URL containing the coordinate variables
+        :param tuple coordinate_variables: names of the coordinate variables
+        :param tuple shape: shape of each coordinate variable
+        """
+        self.dataset_path = dataset_path
+        self.coordinate_variables = tuple(coordinate_variables)
+        self.shape = tuple(shape) + (len(self.coordinate_variables),)
+        self.dtype = np.dtype(np.float64)
+        
+    @property
+    def ndim(self):
+        return len(self.shape)
+    
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+    
+    def __len__(self):
+        return self.shape[0]
+    
+    def __repr__(self):
+        return '{0}({1!r}, {2!r}, shape={3!r})'.format(type(self).__name__,
+                                                       self.dataset_path,
+                                                       self.coordinate_variables,
+                                                       self.shape
+                                                       )
+    
+    def _split_key(self, key):
+        # expand the key to one entry per axis and split off the coordinate axis
+        if not isinstance(key, tuple):
+            key = (key,)
+        ellipsis_count = sum(1 for item in key if item is Ellipsis)
+        if ellipsis_count > 1:
+            raise IndexError('an index can only have a single ellipsis')
+        elif ellipsis_count == 1:
+            ellipsis_index = [item is Ellipsis for item in key].index(True)
+            fill = (slice(None),) * (self.ndim - len(key) + 1)
+            key = key[:ellipsis_index] + fill + key[ellipsis_index + 1:]
+        if len(key) > self.ndim:
+            raise IndexError('too many indices for array')
+        key = key + (slice(None),) * (self.ndim - len(key))
+        return key[:-1], key[-1]
+    
+    def __getitem__(self, key):
+        variable_key, coordinate_key = self._split_key(key)
+        coordinate_variables = self.coordinate_variables[coordinate_key]
+        with NETCDF_LOCK:
+            with nc4.Dataset(self.dataset_path) as nc_dataset:
+                if isinstance(coordinate_variables, str):
+                    block = nc_dataset.variables[coordinate_variables][variable_key]
+                    if np.ma.is_masked(block):
+                        return np.ma.masked_array(block, dtype=self.dtype)
+                    return np.asarray(block, dtype=self.dtype)
+                blocks = [nc_dataset.variables[coordinate_variable][variable_key]
+                          for coordinate_variable in coordinate_variables]
+        if any(np.ma.is_masked(block) for block in blocks):
+            # keep the masks of missing coordinates
+            return np.ma.stack([np.ma.masked_array(block, dtype=self.dtype) for block in blocks], axis=-1)
+        paired_array = np.empty(np.shape(blocks[0]) + (len(blocks),), dtype=self.dtype)
+        for coordinate_index, block in enumerate(blocks):
+            paired_array[..., coordinate_index] = block
+        return paired_array
+    
+    def __array__(self, dtype=None, copy=None):
+        # plain arrays mark missing coordinates with NaN
+        paired_array = np.ma.filled(self[...], np.nan)
+        if dtype is not None:
+            paired_array = paired_array.astype(dtype, copy=False)
+        return paired_array
+    
+    def load(self):
+        """
+        Read all of the coordinates.
+        
+        :return: paired coordinates
+        :rtype: numpy.array
+        
+        """
+        return self[...]
+        
+    def __getstate__(self):
+        return self.dataset_path, self.coordinate_variables, self.shape, self.dtype
+    
+    def __setstate__(self, state):
+        self.dataset_path, self.coordinate_variables, self.shape, self.dtype = state
+
+
 class NetCDFDataset(object):
     
     def __init__(self, nc_dataset_obj):
@@ -94,6 +276,10 @@ class NetCDFDataset(object):
             self._filepath = None
         self.sgrid_compliant_file()
         
+    @property
+    def filepath(self):
+        return self._filepath
+        
     def find_node_coordinates(self, node_dimensions):
         """
         Find the variables for the grid
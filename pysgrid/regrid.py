@@ -0,0 +1,424 @@
+'''
+Created on Oct 18, 2026
+
+Regrid data from curvilinear grid cell centers to
+arbitrary target points, such as a regular lon/lat
+grid.
+
+The interpolation geometry is solved once and stored
+as a sparse operator: for every target point, the flat
+indices of up to four source points and their weights.
+Applying the operator to any number of fields or time
+steps is a single gather and multiply.
+
+'''
+import numpy as np
+
+from .utils import calculate_distance
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional; fall back to a brute-force search
+    cKDTree = None
+
+
+REGRID_METHODS = ('nearest', 'bilinear')
+# bytes of distances computed at once by the brute-force search
+SEARCH_CHUNK_BYTES = 2 ** 25
+# Newton iterations used to invert the bilinear map of a cell
+BILINEAR_ITERATIONS = 8
+# tolerance on the cell coordinates of a point lying inside a cell
+BILINEAR_TOLERANCE = 1e-6
+
+
+def _planar_coordinates(lons, lats, reference_lat):
+    # equirectangular projection; adequate for finding neighbors
+    x = np.asarray(lons, dtype=np.float64) * np.cos(np.deg2rad(reference_lat))
+    y = np.asarray(lats, dtype=np.float64)
+    return np.stack((x.ravel(), y.ravel()), axis=-1)
+
+
+class CellLocator(object):
+    """
+    Find the grid cell centers nearest to arbitrary
+    points. Uses scipy's cKDTree when scipy is installed
+    and a chunked brute-force search otherwise.
+
+    """
+    def __init__(self, centers):
+        """
+        :param centers: paired (lon, lat) cell center coordinates with shape (..., 2)
+        :type centers: numpy.array
+        """
+        centers = np.ma.filled(np.ma.asarray(centers, dtype=np.float64), np.nan)
+        self.source_shape = centers.shape[:-1]
+        lons = centers[..., 0].ravel()
+        lats = centers[..., 1].ravel()
+        # cells without coordinates are never returned
+        self.finite_indices = np.flatnonzero(np.isfinite(lons) & np.isfinite(lats))
+        if self.finite_indices.size == 0:
+            raise ValueError('The grid has no cell centers with valid coordinates')
+        self.reference_lat = float(np.mean(lats[self.finite_indices]))
+        self._all_points = _planar_coordinates(lons, lats, self.reference_lat)
+        self.points = self._all_points[self.finite_indices]
+        if cKDTree is not None:
+            self._tree = cKDTree(self.points)
+        else:
+            self._tree = None
+        self._cell_radii = None
+
+    @property
+    def cell_radii(self):
+        """
+        Distance from each cell center to the corners of
+        its cell, estimated from the spacing of the
+        neighboring centers along each grid axis. Axes
+        without neighbors borrow the spacing of the other
+        axes; cells without any neighbors have an infinite
+        radius.
+
+        """
+        if self._cell_radii is None:
+            planar_centers = self._all_points.reshape(self.source_shape + (2,))
+            axis_count = len(self.source_shape)
+            squared_steps = np.full((axis_count,) + self.source_shape, np.nan)
+            for axis in range(axis_count):
+                lower = [slice(None)] * axis_count
+                upper = [slice(None)] * axis_count
+                lower[axis] = slice(None, -1)
+                upper[axis] = slice(1, None)
+                steps = (np.diff(planar_centers, axis=axis) ** 2).sum(axis=-1)
+                axis_steps = squared_steps[axis]
+                axis_steps[tuple(lower)] = steps
+                axis_steps[tuple(upper)] = np.fmax(axis_steps[tuple(upper)], steps)
+            with np.errstate(invalid='ignore'):
+                largest_steps = np.fmax.reduce(squared_steps, axis=0)
+            squared_steps = np.where(np.isnan(squared_steps), largest_steps, squared_steps)
+            radii = 0.5 * np.sqrt(squared_steps.sum(axis=0))
+            self._cell_radii = np.where(np.isnan(radii), np.inf, radii).ravel()
+        return self._cell_radii
+
+    def _query(self, targets):
+        if self._tree is not None:
+            distances, point_indices = self._tree.query(targets)
+            return point_indices, distances
+        point_indices = np.empty(targets.shape[0], dtype=np.intp)
+        distances = np.empty(targets.shape[0])
+        chunk_size = max(1, SEARCH_CHUNK_BYTES // (8 * self.points.shape[0]))
+        for start in range(0, targets.shape[0], chunk_size):
+            chunk = targets[start:start + chunk_size]
+            squared_distances = ((chunk[:, np.newaxis, :] - self.points[np.newaxis, :, :]) ** 2).sum(axis=-1)
+            point_indices[start:start + chunk_size] = squared_distances.argmin(axis=1)
+            distances[start:start + chunk_size] = np.sqrt(squared_distances.min(axis=1))
+        return point_indices, distances
+
+    def nearest(self, lons, lats):
+        """
+        Find the nearest cell center to each point.
+
+        :param lons: longitudes of the points
+        :type lons: numpy.array
+        :param lats: latitudes of the points
+        :type lats: numpy.array
+        :return: flat indices into the centers, with the shape of lons
+        :rtype: numpy.array
+
+        """
+        return self.locate(lons, lats)[0]
+
+    def locate(self, lons, lats):
+        """
+        Find the nearest cell center to each point and
+        whether the point lies on the grid: no further
+        from that center than the corners of its cell.
+
+        :param lons: longitudes of the points
+        :type lons: numpy.array
+        :param lats: latitudes of the points
+        :type lats: numpy.array
+        :return: flat indices into the centers and the points on the grid, with the shape of lons
+        :rtype: tuple
+
+        """
+        lons = np.asarray(lons, dtype=np.float64)
+        targets = _planar_coordinates(lons, lats, self.reference_lat)
+        point_indices, distances = self._query(targets)
+        indices = self.finite_indices[point_indices]
+        inside = distances <= self.cell_radii[indices]
+        return indices.reshape(lons.shape), inside.reshape(lons.shape)
+
+
+def _invert_bilinear(corners, points):
+    """
+    Solve for the cell coordinates (s, t) of points in
+    quadrilaterals with corners ordered (0, 0), (1, 0),
+    (1, 1), (0, 1), using Newton iterations.
+
+    :param corners: corner coordinates with shape (n, 4, 2)
+    :param points: point coordinates with shape (n, 2)
+    :return: s and t arrays with shape (n,)
+
+    """
+    p00, p10, p11, p01 = (corners[:, corner] for corner in range(4))
+    a = p10 - p00
+    b = p01 - p00
+    c = p11 - p10 - p01 + p00
+    s = np.full(points.shape[0], 0.5)
+    t = np.full(points.shape[0], 0.5)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(BILINEAR_ITERATIONS):
+            residual = p00 + a * s[:, np.newaxis] + b * t[:, np.newaxis] + c * (s * t)[:, np.newaxis] - points
+            ds_dir = a + c * t[:, np.newaxis]  # derivative with respect to s
+            dt_dir = b + c * s[:, np.newaxis]  # derivative with respect to t
+            determinant = ds_dir[:, 0] * dt_dir[:, 1] - ds_dir[:, 1] * dt_dir[:, 0]
+            s = s - (residual[:, 0] * dt_dir[:, 1] - residual[:, 1] * dt_dir[:, 0]) / determinant
+            t = t - (ds_dir[:, 0] * residual[:, 1] - ds_dir[:, 1] * residual[:, 0]) / determinant
+    return s, t
+
+
+class Regridder(object):
+    """
+    Sparse interpolation operator from grid cell
+    centers to target points.
+
+    """
+    def __init__(self, indices, weights, valid, source_shape, target_shape, method):
+        """
+        :param indices: flat source indices with shape (target points, neighbors)
+        :param weights: weights of the source points with shape (target points, neighbors)
+        :param valid: target points that lie on the grid
+        :param tuple source_shape: shape of the source cell centers
+        :param tuple target_shape: shape of the target points
+        :param str method: interpolation method used to build the operator
+        """
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.valid = np.asarray(valid, dtype=bool)
+        self.source_shape = tuple(source_shape)
+        self.target_shape = tuple(target_shape)
+        self.method = method
+
+    @classmethod
+    def from_centers(cls, centers, target_lons, target_lats, method='bilinear', locator=None):
+        """
+        Build the operator from cell center coordinates.
+
+        Bilinear weights come from the quadrilateral of four
+        neighboring cell centers containing each point; points
+        outside every quadrilateral are invalid. Nearest
+        neighbor points are invalid when they are further
+        from the nearest center than the corners of its cell.
+
+        :param centers: paired (lon, lat) cell center coordinates with shape (..., 2)
+        :type centers: numpy.array
+        :param target_lons: longitudes of the target points
+        :type target_lons: numpy.array
+        :param target_lats: latitudes of the target points, with the same shape as target_lons
+        :type target_lats: numpy.array
+        :param str method: 'bilinear' or 'nearest'
+        :param locator: a CellLocator for the centers; built if not given
+        :type locator: CellLocator
+        :return: the operator
+        :rtype: Regridder
+
+        """
+        if method not in REGRID_METHODS:
+            raise ValueError('Unknown regridding method: {0}'.format(method))
+        target_lons, target_lats = np.broadcast_arrays(np.asarray(target_lons, dtype=np.float64),
+                                                       np.asarray(target_lats, dtype=np.float64))
+        centers = np.ma.filled(np.ma.asarray(centers, dtype=np.float64), np.nan)
+        if locator is None:
+            locator = CellLocator(centers)
+        nearest, inside = locator.locate(target_lons, target_lats)
+        nearest = nearest.ravel()
+        if method == 'nearest':
+            return cls(nearest[:, np.newaxis],
+                       np.ones((nearest.size, 1)),
+                       inside.ravel(),
+                       centers.shape[:-1],
+                       target_lons.shape,
+                       method
+                       )
+        if centers.ndim != 3:
+            raise ValueError('Bilinear regridding needs cell centers on a 2-D grid')
+        row_count, column_count = centers.shape[:2]
+        if row_count < 2 or column_count < 2:
+            raise ValueError('Bilinear regridding needs at least 2 cell centers along each axis')
+        points = np.stack((target_lons.ravel(), target_lats.ravel()), axis=-1)
+        nearest_row, nearest_column = np.unravel_index(nearest, (row_count, column_count))
+        indices = np.zeros((points.shape[0], 4), dtype=np.intp)
+        weights = np.zeros((points.shape[0], 4))
+        valid = np.zeros(points.shape[0], dtype=bool)
+        # the nearest center is a corner of one of the four cells around it
+        for row_offset in (0, -1):
+            for column_offset in (0, -1):
+                rows = np.clip(nearest_row + row_offset, 0, row_count - 2)
+                columns = np.clip(nearest_column + column_offset, 0, column_count - 2)
+                corner_rows = np.stack((rows, rows, rows + 1, rows + 1), axis=-1)
+                corner_columns = np.stack((columns, columns + 1, columns + 1, columns), axis=-1)
+                s, t = _invert_bilinear(centers[corner_rows, corner_columns], points)
+                inside = ((s >= -BILINEAR_TOLERANCE) & (s <= 1 + BILINEAR_TOLERANCE) &
+                          (t >= -BILINEAR_TOLERANCE) & (t <= 1 + BILINEAR_TOLERANCE) & ~valid)
+                s = np.clip(s[inside], 0, 1)
+                t = np.clip(t[inside], 0, 1)
+                indices[inside] = np.ravel_multi_index((corner_rows[inside], corner_columns[inside]),
+                                                       (row_count, column_count))
+                weights[inside] = np.stack(((1 - s) * (1 - t), s * (1 - t), s * t, (1 - s) * t), axis=-1)
+                valid |= inside
+        return cls(indices, weights, valid, centers.shape[:-1], target_lons.shape, method)
+
+    def compress(self, wet_index):
+        """
+        Get an operator that reads its source data in the
+        compressed form of a WetPointIndex. Land neighbors
+        are dropped and the weights of the wet neighbors
+        renormalized, so targets next to the coast take
+        values from the water; targets surrounded by land
+        are invalid.
+
+        :param wet_index: index of the wet source points
+        :type wet_index: masking.WetPointIndex
+        :return: the operator for compressed data
+        :rtype: Regridder
+
+        """
+        if wet_index.shape != self.source_shape:
+            raise ValueError('The wet point index has shape {0}; expected {1}'.format(wet_index.shape,
+                                                                                      self.source_shape))
+        positions = wet_index.positions.ravel()[self.indices]
+        wet = positions >= 0
+        weights = np.where(wet, self.weights, 0.0)
+        weight_sums = weights.sum(axis=-1)
+        valid = self.valid & (weight_sums > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weights = np.where(valid[:, np.newaxis], weights / weight_sums[:, np.newaxis], 0.0)
+        return Regridder(np.where(wet, positions, 0),
+                         weights,
+                         valid,
+                         (wet_index.count,),
+                         self.target_shape,
+                         self.method
+                         )
+
+    def apply(self, data):
+        """
+        Interpolate data on the source grid to the target
+        points. Any leading dimensions, such as time and
+        depth, are interpolated together.
+
+        :param data: data whose trailing dimensions match the source shape
+        :type data: numpy.array
+        :return: data with shape leading dimensions + target shape; masked off the grid and where source data are masked
+        :rtype: numpy.ma.MaskedArray
+
+        """
+        data = np.ma.asarray(data)
+        source_ndim = len(self.source_shape)
+        if data.shape[data.ndim - source_ndim:] != self.source_shape:
+            raise ValueError('Data with shape {0} do not end with the source shape {1}'.format(data.shape,
+                                                                                              self.source_shape))
+        leading_shape = data.shape[:data.ndim - source_ndim]
+        flat_data = np.ma.filled(data.astype(np.float64), np.nan).reshape(leading_shape + (-1,))
+        result = (flat_data[..., self.indices] * self.weights).sum(axis=-1)
+        result = result.reshape(leading_shape + self.target_shape)
+        invalid = ~self.valid.reshape(self.target_shape) | np.isnan(result)
+        return np.ma.masked_where(invalid, result)
+
+    def save(self, filepath):
+        """
+        Save the operator to a .npz file.
+
+        :param str filepath: path of the file to write
+
+        """
+        np.savez(filepath,
+                 indices=self.indices,
+                 weights=self.weights,
+                 valid=self.valid,
+                 source_shape=np.array(self.source_shape, dtype=np.intp),
+                 target_shape=np.array(self.target_shape, dtype=np.intp),
+                 method=np.array(self.method)
+                 )
+
+    @classmethod
+    def load(cls, filepath):
+        """
+        Load an operator saved with save.
+
+        :param str filepath: path of a file written by save
+        :return: the operator
+        :rtype: Regridder
+
+        """
+        with np.load(filepath) as saved:
+            return cls(saved['indices'],
+                       saved['weights'],
+                       saved['valid'],
+                       tuple(saved['source_shape'].tolist()),
+                       tuple(saved['target_shape'].tolist()),
+                       str(saved['method'])
+                       )
+
+
+def sample_polyline(lons, lats, n_samples):
+    """
+    Place points at equal distances along a polyline.
+    Points are interpolated linearly in lon/lat within
+    each segment; distances are great circle distances.
+
+    :param lons: longitudes of the polyline vertices
+    :type lons: numpy.array
+    :param lats: latitudes of the polyline vertices
+    :type lats: numpy.array
+    :param int n_samples: number of points, including both ends
+    :return: longitudes, latitudes, and along-track distances in meters of the points
+    :rtype: tuple
+
+    """
+    vertices = np.stack((np.asarray(lons, dtype=np.float64), np.asarray(lats, dtype=np.float64)), axis=-1)
+    if vertices.ndim != 2 or vertices.shape[0] < 2:
+        raise ValueError('A polyline needs at least two vertices')
+    if n_samples < 2:
+        raise ValueError('A transect needs at least two samples')
+    vertex_distances = np.concatenate(([0.0], np.cumsum(calculate_distance(vertices[:-1], vertices[1:]))))
+    distances = np.linspace(0.0, vertex_distances[-1], n_samples)
+    sample_lons = np.interp(distances, vertex_distances, vertices[:, 0])
+    sample_lats = np.interp(distances, vertex_distances, vertices[:, 1])
+    return sample_lons, sample_lats, distances
+
+
+class Transect(object):
+    """
+    Points sampled along a polyline and the operator
+    that interpolates grid data to them. Data with
+    vertical dimensions give vertical sections with
+    shape (..., samples).
+
+    """
+    def __init__(self, lons, lats, distances, regridder):
+        """
+        :param lons: longitudes of the samples
+        :param lats: latitudes of the samples
+        :param distances: along-track distances of the samples in meters
+        :param regridder: operator from the cell centers to the samples
+        :type regridder: Regridder
+        """
+        self.lons = lons
+        self.lats = lats
+        self.distances = distances
+        self.regridder = regridder
+
+    def __len__(self):
+        return self.distances.size
+
+    def apply(self, data):
+        """
+        Interpolate data on the cell centers to the samples.
+
+        :param data: data whose trailing dimensions match the cell centers
+        :type data: numpy.array
+        :return: data with shape leading dimensions + (samples,)
+        :rtype: numpy.ma.MaskedArray
+
+        """
+        return self.regridder.apply(data)
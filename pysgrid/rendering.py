@@ -0,0 +1,195 @@
+'''
+Created on Oct 18, 2026
+
+Render grid data onto web mercator (z/x/y) map tiles.
+
+The cells under the pixels of a tile are found once
+and kept as a lookup table (a Regridder), so rendering
+a tile for another variable or time step is a gather
+over its pixels. Zoomed-out tiles sample a coarse
+level of the grid pyramid instead of the full grid.
+Rendered tiles are kept in a bounded LRU cache.
+
+'''
+import collections
+import io
+import threading
+
+import numpy as np
+
+from .utils import EARTH_RADIUS
+
+
+TILE_SIZE = 256
+# number of per-tile lookup tables kept by a renderer
+LOOKUP_CACHE_SIZE = 256
+# number of rendered tiles kept by a renderer
+TILE_CACHE_SIZE = 256
+# latitude limit of the web mercator projection
+MAX_MERCATOR_LAT = 85.0511287798
+
+
+def tile_pixel_coordinates(z, x, y, tile_size=TILE_SIZE):
+    """
+    Get the longitudes and latitudes of the pixel
+    centers of a web mercator tile.
+
+    :param int z: zoom level
+    :param int x: tile column, increasing eastward
+    :param int y: tile row, increasing southward
+    :param int tile_size: number of pixels along each side of the tile
+    :return: longitudes and latitudes with shape (tile_size, tile_size); rows run north to south
+    :rtype: tuple
+
+    """
+    tile_count = 2 ** z
+    if not (0 <= x < tile_count and 0 <= y < tile_count):
+        raise ValueError('Tile {0}/{1}/{2} does not exist'.format(z, x, y))
+    pixel_offsets = (np.arange(tile_size) + 0.5) / tile_size
+    lons = (x + pixel_offsets) / tile_count * 360.0 - 180.0
+    lats = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + pixel_offsets) / tile_count))))
+    return np.meshgrid(lons, lats)
+
+
+class TileRenderer(object):
+    """
+    Sample data on the cell centers of a grid onto
+    web mercator map tiles. Safe to share between the
+    threads of a server; the caches of the grid it
+    renders are guarded by sgrid.GRID_CACHE_LOCK.
+
+    """
+    def __init__(self, grid, tile_size=TILE_SIZE, pyramid_levels=0, method='bilinear'):
+        """
+        :param grid: the grid of the variables to render
+        :type grid: sgrid.SGrid2D
+        :param int tile_size: number of pixels along each side of a tile
+        :param int pyramid_levels: number of coarse pyramid levels zoomed-out tiles can use
+        :param str method: 'bilinear' or 'nearest'
+        """
+        self.grid = grid
+        self.tile_size = tile_size
+        self.pyramid_levels = pyramid_levels
+        self.method = method
+        self._lookups = collections.OrderedDict()
+        self._tiles = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._cell_size = None
+
+    def get_level(self, z, y):
+        """
+        Get the coarsest pyramid level whose cells are
+        no larger than the pixels of a tile.
+
+        :param int z: zoom level
+        :param int y: tile row
+        :return: pyramid level
+        :rtype: int
+
+        """
+        if self.pyramid_levels < 1:
+            return 0
+        if self._cell_size is None:
+            self._cell_size = float(np.nanmean(np.sqrt(self.grid.area)))
+        center_lat = tile_pixel_coordinates(z, 0, y, tile_size=1)[1][0, 0]
+        pixel_size = 2 * np.pi * EARTH_RADIUS * np.cos(np.radians(center_lat)) / (2 ** z * self.tile_size)
+        level = 0
+        while level < self.pyramid_levels and self._cell_size * 2 ** (level + 1) <= pixel_size:
+            level += 1
+        return level
+
+    def get_lookup(self, z, x, y):
+        """
+        Get the lookup table of a tile, building it on
+        first use.
+
+        :param int z: zoom level
+        :param int x: tile column
+        :param int y: tile row
+        :return: pyramid level sampled by the tile and the operator from its cell centers to the pixels
+        :rtype: tuple
+
+        """
+        tile_key = (z, x, y)
+        with self._lock:
+            lookup = self._lookups.pop(tile_key, None)
+            if lookup is not None:
+                self._lookups[tile_key] = lookup  # most recently used last
+                return lookup
+        level = self.get_level(z, y)
+        level_grid = self.grid.pyramid(level)[level]
+        lons, lats = tile_pixel_coordinates(z, x, y, self.tile_size)
+        lookup = (level, level_grid.regridder(lons, lats, self.method))
+        with self._lock:
+            self._lookups[tile_key] = lookup
+            while len(self._lookups) > LOOKUP_CACHE_SIZE:
+                self._lookups.popitem(last=False)
+        return lookup
+
+    def render(self, variable, index, z, x, y):
+        """
+        Render a tile of a face or edge variable.
+
+        :param str variable: name of the variable
+        :param index: index applied to the leading dimensions of the variable, such as a time step; the result must be 2-D
+        :param int z: zoom level
+        :param int x: tile column
+        :param int y: tile row
+        :return: values at the pixels, NaN off the grid; rows run north to south
+        :rtype: numpy.array
+
+        """
+        if not isinstance(index, tuple):
+            index = (index,)
+        cache_key = (variable, index, z, x, y)
+        with self._lock:
+            tile = self._tiles.pop(cache_key, None)
+            if tile is not None:
+                self._tiles[cache_key] = tile
+                return tile
+        level, regridder = self.get_lookup(z, x, y)
+        data = self.grid.pyramid_data(variable, index, level)[level]
+        if data.ndim != 2:
+            raise ValueError('{0} at index {1} has shape {2}; tiles need 2-D data'.format(variable,
+                                                                                         index,
+                                                                                         data.shape))
+        tile = regridder.apply(data).astype(np.float32).filled(np.nan)
+        tile.flags.writeable = False  # shared by every request for the tile
+        with self._lock:
+            self._tiles[cache_key] = tile
+            while len(self._tiles) > TILE_CACHE_SIZE:
+                self._tiles.popitem(last=False)
+        return tile
+
+    def wsgi_app(self, environ, start_response):
+        """
+        WSGI application serving tiles as .npy files from
+        paths of the form /variable/time/z/x/y.npy. An
+        optional `level` query parameter selects a vertical
+        level of 4-D variables.
+
+        """
+        path_parts = environ.get('PATH_INFO', '').strip('/').split('/')
+        query = dict(part.split('=', 1) for part in environ.get('QUERY_STRING', '').split('&') if '=' in part)
+        if len(path_parts) != 5 or not path_parts[-1].endswith('.npy'):
+            return self._respond(start_response, '404 Not Found', b'Tile paths are /variable/time/z/x/y.npy')
+        variable = path_parts[0]
+        try:
+            time, z, x = (int(part) for part in path_parts[1:4])
+            y = int(path_parts[4][:-len('.npy')])
+            index = (time, int(query['level'])) if 'level' in query else (time,)
+        except ValueError:
+            return self._respond(start_response, '400 Bad Request', b'Tile indices must be integers')
+        if variable not in (self.grid.variables or []):
+            return self._respond(start_response, '404 Not Found', b'Unknown variable')
+        try:
+            tile = self.render(variable, index, z, x, y)
+        except (IndexError, ValueError) as error:
+            return self._respond(start_response, '400 Bad Request', str(error).encode('utf-8'))
+        tile_file = io.BytesIO()
+        np.save(tile_file, tile)
+        return self._respond(start_response, '200 OK', tile_file.getvalue(), 'application/octet-stream')
+
+    def _respond(self, start_response, status, body, content_type='text/plain'):
+        start_response(status, [('Content-Type', content_type), ('Content-Length', str(len(body)))])
+        return [body]
@@ -4,13 +4,42 @@ Created on Apr 20, 2015
 @author: ayan
 '''
 import abc
+import collections
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
 import netCDF4 as nc4
+import numpy as np
 
+from .array_sharing import (MemmapArrayReference, SharedArrayReference, array_reference, 
+                            create_shared_array, shareable_array)
+from .connectivity import edge_nodes, edge_points, face_edges, face_nodes
 from .custom_exceptions import SGridNonCompliantError
-from .read_netcdf import NetCDFDataset, parse_padding
-from .utils import calculate_angle_from_true_east, pair_arrays
+from .grid_cache import read_grid_cache, write_grid_cache
+from .masking import MASK_VARIABLES, WET_BLOCK_ROWS, WetPointIndex
+from .metrics import METRIC_NAMES, METRIC_VARIABLES, cell_widths_from_centers, cell_widths_from_nodes
+from .operators import divergence, gradient, vorticity
+from .processing_2d import block_mean, edge_faces, face_to_edge
+from .read_netcdf import (NETCDF_LOCK, NetCDFCoordinateArray, NetCDFDataset, NetCDFVariableAttributes, 
+                          netcdf_locked, parse_padding)
+from .regrid import CellLocator, Regridder, Transect, sample_polyline
+from .tiling import iter_tiles, open_worker_dataset, process_tile
+from .transport import edge_transport, section_box, section_edges, staircase_path
+from .utils import (build_padding_lookup, calculate_angle_from_true_east, 
+                    infer_dimension_attributes, pair_arrays)
 from .variables import SGridVariable
+from .vertical import (SGRID_DEPTH_LOCATIONS, Z_INTERPOLATION_CACHE_SIZE, average_to_location, 
+                       interpolate_to_z, read_depth_terms, s_coordinate_depths, z_interpolation)
+
+
+# number of variables whose pyramid data are kept per grid
+PYRAMID_CACHE_SIZE = 4
+# largest total size in bytes of the pyramid data kept per grid
+PYRAMID_CACHE_BYTES = 2 ** 28
+# guards the grid caches that are shared between threads;
+# not held while data are read
+GRID_CACHE_LOCK = threading.RLock()
 
 
 class SGridND(object):
@@ -23,6 +52,12 @@ class SGridND(object):
                       'high': (None, 1)
                       }
     topology_dimension = None
+    # attributes naming the grid's own coordinate variables
+    coordinate_attributes = ('node_coordinates',)
+    # large arrays that can be moved into shared memory
+    shared_array_attributes = ('centers', 'nodes', 'angles')
+    # private attributes that are pickled; all others are caches
+    pickled_private_attributes = ('_variable_sources',)
     
     def __init__(self, 
                  nodes=None,
@@ -41,7 +76,8 @@ class SGridND(object):
                  edge2_coordinates=None,
                  angles=None,
                  edge1_dimensions=None,
-                 edge2_dimensions=None):
+                 edge2_dimensions=None,
+                 dataset_path=None):
         # general attributes
         self.nodes = nodes
         self.centers = centers
@@ -60,13 +96,255 @@ class SGridND(object):
         self.angles = angles
         self.edge1_dimensions = edge1_dimensions
         self.edge2_dimensions = edge2_dimensions
+        self.dataset_path = dataset_path  # file or URL the grid was read from
+        
+    def __setattr__(self, name, value):
+        # padding lookups are derived from these attributes,
+        # so drop them and let them be rebuilt on next use
+        if name == 'node_dimensions' or name.endswith('_padding'):
+            self.__dict__.pop('_padding_lookup', None)
+            self.__dict__.pop('_dimension_attributes', None)
+            self.__dict__.pop('_connectivity', None)
+        # as are the metrics and cell search structures
+        if name in ('nodes', 'centers'):
+            self.__dict__.pop('_metrics', None)
+            self.__dict__.pop('_cell_locator', None)
+            self.__dict__.pop('_node_locator', None)
+            self.__dict__.pop('_pyramid', None)
+            self.__dict__.pop('_pyramid_data', None)
+            self.__dict__.pop('_connectivity', None)
+        super(SGridND, self).__setattr__(name, value)
+        
+    def __getattr__(self, name):
+        # only called when normal attribute lookup fails;
+        # dataset variables are built on first access
+        variable_sources = self.__dict__.get('_variable_sources')
+        if variable_sources is None or name not in variable_sources:
+            raise AttributeError("'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
+        sgrid_var = SGridVariable.create_variable(variable_sources[name], self)
+        setattr(self, name, sgrid_var)
+        return sgrid_var
+    
+    def get_variable(self, name):
+        """
+        Get a dataset variable by name. Unlike attribute
+        access, this also reaches variables whose names
+        are taken by attributes of the grid, such as a
+        variable named dx or angles.
+        
+        :param str name: name of the variable in the dataset
+        :return: the variable
+        :rtype: variables.SGridVariable
+        
+        """
+        attr_value = self.__dict__.get(name)
+        if isinstance(attr_value, SGridVariable) and attr_value.variable == name:
+            return attr_value
+        shadowed_variables = self.__dict__.setdefault('_shadowed_variables', {})
+        if name in shadowed_variables:
+            return shadowed_variables[name]
+        variable_sources = self.__dict__.get('_variable_sources')
+        if variable_sources is None or name not in variable_sources:
+            raise ValueError('{0} is not a variable of the dataset'.format(name))
+        if name not in self.__dict__ and not hasattr(type(self), name):
+            return getattr(self, name)
+        sgrid_var = SGridVariable.create_variable(variable_sources[name], self)
+        shadowed_variables[name] = sgrid_var
+        return sgrid_var
+        
+    def __getstate__(self):
+        """
+        Pickle metadata by value. Arrays held in shared memory
+        or memory-mapped from a file are pickled as references,
+        so unpickling in another process does not copy them.
+        
+        """
+        shared_blocks = self.__dict__.get('_shared_memory', {})
+        state = {}
+        for attr_name, attr_value in self.__dict__.items():
+            if attr_name.startswith('_') and attr_name not in self.pickled_private_attributes:
+                continue  # caches are rebuilt on demand
+            if isinstance(attr_value, np.ndarray):
+                reference = array_reference(attr_value, shared_blocks.get(attr_name))
+                if reference is not None:
+                    attr_value = reference
+            state[attr_name] = attr_value
+        return state
+    
+    def __setstate__(self, state):
+        shared_blocks = {}
+        for attr_name, attr_value in state.items():
+            if isinstance(attr_value, SharedArrayReference):
+                shm, state[attr_name] = attr_value.attach()
+                shared_blocks[attr_name] = shm
+            elif isinstance(attr_value, MemmapArrayReference):
+                state[attr_name] = attr_value.attach()
+        self.__dict__.update(state)
+        if shared_blocks:
+            self._shared_memory = shared_blocks  # attached, so not owned
+        
+    def share_memory(self):
+        """
+        Move the grid's large arrays (centers, nodes, and
+        angles) into multiprocessing.shared_memory blocks.
+        
+        Pickling the grid afterwards only sends the names
+        of the blocks, so any number of worker processes
+        can share one copy of the grid geometry. Call
+        release_shared_memory when the workers are done.
+        
+        :return: the grid
+        :rtype: sgrid.SGrid2D or sgrid.SGrid3D
         
+        """
+        shared_blocks = self.__dict__.setdefault('_shared_memory', {})
+        # only blocks created here are unlinked on release
+        owned_blocks = self.__dict__.setdefault('_owned_shared_memory', set())
+        for attr_name in self.shared_array_attributes:
+            if attr_name in shared_blocks:
+                continue
+            array = shareable_array(getattr(self, attr_name, None))
+            if array is None:
+                continue
+            shm, shared_array = create_shared_array(array)
+            shared_blocks[attr_name] = shm
+            owned_blocks.add(attr_name)
+            setattr(self, attr_name, shared_array)
+        return self
+    
+    def release_shared_memory(self):
+        """
+        Copy the shared arrays back into private memory and
+        close the shared memory blocks. Blocks created by
+        share_memory are also unlinked.
+        
+        """
+        shared_blocks = self.__dict__.pop('_shared_memory', {})
+        owned_blocks = self.__dict__.pop('_owned_shared_memory', set())
+        for attr_name, shm in shared_blocks.items():
+            setattr(self, attr_name, np.array(getattr(self, attr_name)))
+            shm.close()
+            if attr_name in owned_blocks:
+                shm.unlink()
+        
+    def to_cache(self, cache_dir):
+        """
+        Write the grid to a cache directory. Topology metadata
+        and variable descriptions are stored as JSON, and the
+        coordinate, angle, and other arrays as .npy files.
+        Coordinates read on demand are read in full here.
+        The face metrics of a 2D grid, and pm and pn if read,
+        are computed here and cached too, so a grid opened
+        from the cache does not read them from the dataset.
+        
+        :param str cache_dir: directory to write to; created if it does not exist
+        :return: path to the cache's metadata file
+        :rtype: str
+        
+        """
+        arrays = {}
+        attributes = {}
+        for attr_name, attr_value in self.__dict__.items():
+            if attr_name.startswith('_') or isinstance(attr_value, SGridVariable):
+                continue  # caches and variables built from _variable_sources
+            if isinstance(attr_value, NetCDFCoordinateArray):
+                arrays[attr_name] = attr_value.load()
+            elif isinstance(attr_value, np.ndarray):
+                arrays[attr_name] = attr_value
+            else:
+                attributes[attr_name] = attr_value
+        if hasattr(type(self), 'get_metric') and self.centers is not None:
+            for metric_name in METRIC_NAMES:
+                arrays['_metric_{0}'.format(metric_name)] = self.get_metric(metric_name)
+        inverse_widths = self.__dict__.get('_inverse_widths')
+        if inverse_widths is not None:
+            arrays['_inverse_dx'], arrays['_inverse_dy'] = inverse_widths
+        return write_grid_cache(self, cache_dir, arrays, attributes)
+    
     @classmethod
-    def from_ncfile(cls, nc_file_path, topology_variable=None):
+    def from_cache(cls, cache_dir, mmap_mode='r'):
+        """
+        Open a grid written by to_cache. Arrays are memory-mapped
+        read-only by default, so opening is cheap regardless of
+        grid size and the pages are shared between processes.
+        
+        :param str cache_dir: directory containing the cache
+        :param str mmap_mode: memory-map mode for the arrays; None reads them into memory
+        :return: the cached grid
+        :rtype: sgrid.SGrid2D or sgrid.SGrid3D
+        
+        """
+        grid_class, attributes, arrays, variable_sources = read_grid_cache(cache_dir, mmap_mode)
+        if grid_class != cls.__name__:
+            raise ValueError('The cache at {0} holds a {1}, not a {2}'.format(cache_dir, grid_class, cls.__name__))
+        sgrid = cls()
+        for attr_name, attr_value in attributes.items():
+            setattr(sgrid, attr_name, attr_value)
+        for attr_name, array in arrays.items():
+            if not attr_name.startswith('_'):
+                setattr(sgrid, attr_name, array)
+        # cached metrics are set last, since setting the coordinates drops them
+        if all('_metric_{0}'.format(metric_name) in arrays for metric_name in METRIC_NAMES):
+            sgrid._metrics = dict(((metric_name, 'face'), arrays['_metric_{0}'.format(metric_name)])
+                                  for metric_name in METRIC_NAMES)
+        if '_inverse_dx' in arrays and '_inverse_dy' in arrays:
+            sgrid._inverse_widths = (arrays['_inverse_dx'], arrays['_inverse_dy'])
+        sgrid._variable_sources = variable_sources
+        return sgrid
+        
+    @classmethod
+    @netcdf_locked
+    def from_ncfile(cls, nc_file_path, topology_variable=None, variables=None, exclude_variables=None):
         with nc4.Dataset(nc_file_path) as nc_dataset:
-            sgrid = cls.from_nc_dataset(nc_dataset, topology_variable)
+            sgrid = cls.from_nc_dataset(nc_dataset, 
+                                        topology_variable, 
+                                        variables=variables, 
+                                        exclude_variables=exclude_variables
+                                        )
         return sgrid
     
+    @property
+    def padding_lookup(self):
+        """
+        Mappings of dimension name to padding information
+        and the set of node dimensions for this grid. These
+        are built once and shared by every variable.
+        
+        :return: padding lookups for the grid
+        :rtype: utils.GridPaddingLookup
+        
+        """
+        padding_lookup = self.__dict__.get('_padding_lookup')
+        if padding_lookup is None:
+            padding_lookup = build_padding_lookup(self)
+            self._padding_lookup = padding_lookup
+        return padding_lookup
+    
+    def get_dimension_attributes(self, nc_var_obj):
+        """
+        Get the slicing, averaging axes, and inferred
+        location for a variable. These are computed once
+        per unique tuple of dimensions and reused for
+        every variable sharing those dimensions.
+        
+        :param nc_var_obj: a netCDF variable defined on the grid
+        :type nc_var_obj: netCDF4.Variable
+        :return: attributes inferred from the variable's dimensions
+        :rtype: utils.DimensionAttributes
+        
+        """
+        dimension_cache = self.__dict__.get('_dimension_attributes')
+        if dimension_cache is None:
+            dimension_cache = {}
+            self._dimension_attributes = dimension_cache
+        var_dims = tuple(nc_var_obj.dimensions)
+        try:
+            dimension_attributes = dimension_cache[var_dims]
+        except KeyError:
+            dimension_attributes = infer_dimension_attributes(self, nc_var_obj)
+            dimension_cache[var_dims] = dimension_attributes
+        return dimension_attributes
+    
     @property
     def non_grid_variables(self):
         non_grid_variables = [variable for variable in self.variables if variable not in self.grid_variables]
@@ -133,7 +411,7 @@ class SGridND(object):
             if self.angles is not None:
                 grid_angle[:] = self.angles[:]
         for dataset_variable in self.variables:
-            dataset_var_obj = getattr(self, dataset_variable)
+            dataset_var_obj = self.get_variable(dataset_variable)
             try:
                 dataset_grid_var = nc_file.createVariable(dataset_var_obj.variable,
                                                           dataset_var_obj.dtype,
@@ -186,6 +464,11 @@ class SGridND(object):
 class SGrid2D(SGridND):
     
     topology_dimension = 2
+    coordinate_attributes = ('node_coordinates',
+                             'face_coordinates',
+                             'edge1_coordinates',
+                             'edge2_coordinates'
+                             )
     
     def __init__(self,
                  faces=None,
@@ -203,9 +486,94 @@ class SGrid2D(SGridND):
         self.vertical_padding = vertical_padding
         self.vertical_dimensions = vertical_dimensions
         super(SGrid2D, self).__init__(*args, **kwargs)
+    
+    @property
+    def faces(self):
+        """
+        Nodes of every face (cell between nodes) with
+        shape (faces, 4), counterclockwise. Unless set
+        explicitly, computed on first use from the node
+        dimensions. Nodes and faces are numbered
+        row-major; see the connectivity module.
+        
+        """
+        faces = self.__dict__.get('faces')
+        if faces is None:
+            faces = self._get_connectivity('faces', face_nodes)
+        return faces
+    
+    @faces.setter
+    def faces(self, faces):
+        self.__dict__['faces'] = faces
+    
+    @property
+    def edges(self):
+        """
+        Nodes of every edge with shape (edges, 2). Edges
+        along xi come first, then edges along eta. Unless
+        set explicitly, computed on first use from the
+        node dimensions.
+        
+        """
+        edges = self.__dict__.get('edges')
+        if edges is None:
+            edges = self._get_connectivity('edges', edge_nodes)
+        return edges
+    
+    @edges.setter
+    def edges(self, edges):
+        self.__dict__['edges'] = edges
+    
+    @property
+    def face_edges(self):
+        """
+        Edges of every face with shape (faces, 4), in the
+        order of the face nodes.
+        
+        """
+        return self._get_connectivity('face_edges', face_edges)
+    
+    @property
+    def node_shape(self):
+        """
+        Number of (eta, xi) nodes, from the node coordinates
+        or else the sizes of the node dimensions.
+        
+        """
+        if self.nodes is not None:
+            return tuple(self.nodes.shape[:2])
+        dimension_sizes = dict(self.dimensions or [])
+        node_dims = (self.node_dimensions or '').split()
+        if len(node_dims) != 2 or not all(node_dim in dimension_sizes for node_dim in node_dims):
+            raise ValueError('The grid has neither node coordinates nor node dimension sizes')
+        return tuple(dimension_sizes[node_dim]
+                     for node_dim in self._get_axis_dimensions(self.node_coordinates, node_dims))
+    
+    def _get_axis_dimensions(self, coordinates, dimension_names):
+        # order the two dimensions of a grid location as the
+        # (eta, xi) axes of its coordinate variables; without
+        # them, follow the SGRID attributes in listing xi first
+        variable_sources = self.__dict__.get('_variable_sources', {})
+        try:
+            axis_dims = tuple(variable_sources[coordinates[0]].dimensions[-2:])
+        except (KeyError, TypeError):
+            axis_dims = None
+        if axis_dims is not None and sorted(axis_dims) == sorted(dimension_names):
+            return axis_dims
+        return tuple(reversed(dimension_names))
+    
+    def _get_connectivity(self, name, build_connectivity):
+        connectivity = self.__dict__.setdefault('_connectivity', {})
+        try:
+            return connectivity[name]
+        except KeyError:
+            connectivity_array = build_connectivity(self.node_shape)
+            connectivity[name] = connectivity_array
+            return connectivity_array
         
     @classmethod
-    def from_nc_dataset(cls, nc_dataset, topology_variable=None):
+    @netcdf_locked
+    def from_nc_dataset(cls, nc_dataset, topology_variable=None, variables=None, exclude_variables=None):
         sa = SGridAttributes(nc_dataset, cls.topology_dimension, topology_variable)
         dimensions = sa.get_dimensions()
         node_dimensions, node_coordinates = sa.get_node_coordinates()
@@ -222,6 +590,7 @@ class SGrid2D(SGridND):
         nodes = sa.get_cell_node_lat_lon()
         sgrid = cls(angles=angles,
                     centers=centers,
+                    dataset_path=sa.get_dataset_path(),
                     dimensions=dimensions,
                     edge1_coordinates=edge1_coordinates,
                     edge1_dimensions=edge1_dimensions,
@@ -244,12 +613,12 @@ class SGrid2D(SGridND):
                     vertical_dimensions=vertical_dimensions,
                     vertical_padding=vertical_padding
                     )
-        sa.get_variable_attributes(sgrid)
+        sa.get_variable_attributes(sgrid, variables, exclude_variables)
         return sgrid
     
     def get_all_face_padding(self):
         if self.face_padding is not None:
-            all_face_padding = self.face_padding
+            all_face_padding = list(self.face_padding)
         else:
             all_face_padding = []
         return all_face_padding
@@ -267,7 +636,931 @@ class SGrid2D(SGridND):
         if self.vertical_padding is not None:
             all_padding += self.vertical_padding
         return all_padding
+    
+    def depth_terms(self, location='rho'):
+        """
+        Get the time-invariant terms of the ROMS s-coordinate
+        transformation at a location. They are computed on
+        first use and cached on the grid.
+        
+        :param str location: one of 'rho', 'w', 'u', or 'v'
+        :return: offset and scale arrays
+        :rtype: vertical.DepthTerms
+        
+        """
+        depth_cache = self.__dict__.setdefault('_depth_cache', {})
+        try:
+            return depth_cache[location]
+        except KeyError:
+            pass
+        if self.dataset_path is None:
+            raise ValueError('There is no dataset to read depths from')
+        with NETCDF_LOCK:
+            with nc4.Dataset(self.dataset_path) as nc_dataset:
+                depth_terms = read_depth_terms(nc_dataset, location)
+        depth_cache[location] = depth_terms
+        return depth_terms
+    
+    def depths(self, time=None, location='rho', zeta_variable='zeta'):
+        """
+        Compute the depths of the ROMS s-coordinate levels.
+        
+        Only the free surface for the requested time steps
+        is read; the rest of the calculation is cached. Use
+        iter_depths to step through many times without
+        holding all of them in memory.
+        
+        :param time: time index or slice; None gives depths for a flat surface
+        :param str location: one of 'rho', 'w', 'u', or 'v'
+        :param str zeta_variable: name of the free surface variable
+        :return: depths with shape ([time,] level, eta, xi); negative below the surface
+        :rtype: numpy.array
+        
+        """
+        depth_terms = self.depth_terms(location)
+        if time is None:
+            return s_coordinate_depths(depth_terms)
+        with NETCDF_LOCK:
+            with nc4.Dataset(self.dataset_path) as nc_dataset:
+                zeta = nc_dataset.variables[zeta_variable][time]
+        zeta = average_to_location(np.ma.filled(zeta, 0), location)
+        return s_coordinate_depths(depth_terms, zeta)
+    
+    def iter_depths(self, times=None, location='rho', zeta_variable='zeta'):
+        """
+        Iterate over the depths of the ROMS s-coordinate levels
+        one time step at a time. The dataset is kept open while
+        iterating.
+        
+        :param times: time indices to step through; defaults to all times
+        :type times: iterable
+        :param str location: one of 'rho', 'w', 'u', or 'v'
+        :param str zeta_variable: name of the free surface variable
+        :return: generator of depth arrays with shape (level, eta, xi)
+        :rtype: generator
+        
+        """
+        depth_terms = self.depth_terms(location)
+        with NETCDF_LOCK:
+            nc_dataset = nc4.Dataset(self.dataset_path)
+            zeta_var = nc_dataset.variables[zeta_variable]
+            if times is None:
+                times = range(zeta_var.shape[0])
+        try:
+            for time in times:
+                with NETCDF_LOCK:
+                    zeta = zeta_var[time]
+                zeta = average_to_location(np.ma.filled(zeta, 0), location)
+                yield s_coordinate_depths(depth_terms, zeta)
+        finally:
+            with NETCDF_LOCK:
+                nc_dataset.close()
+    
+    def get_depth_location(self, sgrid_variable):
+        """
+        Get the depth location ('rho', 'w', 'u', or 'v')
+        of a variable on ROMS s-coordinate levels.
+        
+        :param sgrid_variable: a variable of this grid
+        :type sgrid_variable: variables.SGridVariable
+        :return: depth location
+        :rtype: str
+        
+        """
+        try:
+            location = SGRID_DEPTH_LOCATIONS[sgrid_variable.location]
+        except KeyError:
+            raise ValueError('{0} is not on faces or edges'.format(sgrid_variable.variable))
+        if location == 'rho' and self.vertical_padding is not None:
+            w_dims = set(padding_info.node_dim for padding_info in self.vertical_padding)
+            if w_dims.intersection(sgrid_variable.dimensions):
+                location = 'w'
+        return location
+    
+    def get_z_interpolation(self, z_levels, time=None, location='rho'):
+        """
+        Get the bracketing levels and weights for interpolating
+        to fixed depths. They are cached for the most recent
+        time steps, so variables at the same location and time
+        share them.
+        
+        :param z_levels: target depths; negative below the surface
+        :type z_levels: numpy.array
+        :param int time: time index; None uses a flat surface
+        :param str location: one of 'rho', 'w', 'u', or 'v'
+        :return: bracketing indices and weights
+        :rtype: vertical.ZInterpolation
+        
+        """
+        if time is not None:
+            if not isinstance(time, (int, np.integer)):
+                raise TypeError('time must be a single time index or None, not {0!r}'.format(time))
+            time = int(time)  # numpy and Python integers share cache entries
+        z_levels = np.atleast_1d(np.asarray(z_levels, dtype=np.float64))
+        cache_key = (location, time, z_levels.tobytes())
+        z_interp_cache = self.__dict__.setdefault('_z_interp_cache', collections.OrderedDict())
+        try:
+            z_interp = z_interp_cache.pop(cache_key)
+        except KeyError:
+            z_interp = z_interpolation(self.depths(time, location), z_levels)
+        z_interp_cache[cache_key] = z_interp  # most recently used last
+        while len(z_interp_cache) > Z_INTERPOLATION_CACHE_SIZE:
+            z_interp_cache.popitem(last=False)
+        return z_interp
+    
+    def interp_to_z(self, variable, z_levels, time=None):
+        """
+        Interpolate a 3-D variable on ROMS s-coordinate levels
+        to fixed depths. The variable's first dimension is
+        time when time is given, followed by the levels.
+        
+        :param variable: a variable of this grid or its name
+        :type variable: variables.SGridVariable or str
+        :param z_levels: target depths; negative below the surface
+        :type z_levels: numpy.array
+        :param int time: time index; None for variables without a time dimension
+        :return: data with shape (z_level, eta, xi); masked below the bottom, above the surface, and on land
+        :rtype: numpy.ma.MaskedArray
+        
+        """
+        if not isinstance(variable, SGridVariable):
+            variable = self.get_variable(variable)
+        location = self.get_depth_location(variable)
+        z_interp = self.get_z_interpolation(z_levels, time, location)
+        if time is None:
+            data = variable.read()
+        else:
+            data = variable.read(time)
+        return interpolate_to_z(data, z_interp)
+    
+    @property
+    def face_window(self):
+        """
+        Slices that trim padding from arrays shaped like the
+        cell centers, leaving the cells that edge variables
+        are averaged onto.
+        
+        :return: slices for the last two dimensions
+        :rtype: tuple
+        
+        """
+        variable_sources = self.__dict__.get('_variable_sources', {})
+        try:
+            face_coordinate_source = variable_sources[self.face_coordinates[0]]
+        except (KeyError, TypeError):
+            return (np.s_[:], np.s_[:])
+        return self.get_dimension_attributes(face_coordinate_source).center_slicing[-2:]
+    
+    def center_variable(self, variable, data):
+        """
+        Put data for a face or edge variable on the cell
+        centers. Edge data are averaged to the centers and
+        padded with NaN outside the face window, so the
+        result always has the shape of the centers.
+        
+        :param variable: a variable of this grid or its name
+        :type variable: variables.SGridVariable or str
+        :param data: data read from the variable; leading dimensions are kept
+        :type data: numpy.array
+        :return: data on the cell centers
+        :rtype: numpy.ma.MaskedArray
+        
+        """
+        if not isinstance(variable, SGridVariable):
+            variable = self.get_variable(variable)
+        data = np.ma.asarray(data)
+        center_shape = self.centers.shape[:-1]
+        if variable.location == 'face' or data.shape[-2:] == center_shape:
+            return data
+        if variable.location not in ('edge1', 'edge2'):
+            raise ValueError('{0} is not on faces or edges'.format(variable.variable))
+        trimmed = data[(Ellipsis,) + tuple(variable.center_slicing[-2:])]
+        avg_axis = variable.center_axis - 2
+        lower = [slice(None)] * trimmed.ndim
+        upper = [slice(None)] * trimmed.ndim
+        lower[avg_axis] = slice(None, -1)
+        upper[avg_axis] = slice(1, None)
+        averaged = 0.5 * (trimmed[tuple(lower)] + trimmed[tuple(upper)])
+        centered = np.ma.masked_all(data.shape[:-2] + center_shape, dtype=np.float64)
+        window = (Ellipsis,) + tuple(self.face_window)
+        if centered[window].shape != averaged.shape:
+            raise ValueError('{0} does not average onto the face window of the grid'.format(variable.variable))
+        centered[window] = averaged
+        return centered
+    
+    def regridder(self, target_lons, target_lats, method='bilinear'):
+        """
+        Build a reusable operator that interpolates data
+        on the cell centers to target points.
+        
+        One-dimensional longitudes and latitudes describe a
+        regular grid with shape (lat, lon); otherwise they
+        are the coordinates of each target point.
+        
+        :param target_lons: target longitudes
+        :type target_lons: numpy.array
+        :param target_lats: target latitudes
+        :type target_lats: numpy.array
+        :param str method: 'bilinear' or 'nearest'
+        :return: the operator
+        :rtype: regrid.Regridder
+        
+        """
+        target_lons = np.asarray(target_lons, dtype=np.float64)
+        target_lats = np.asarray(target_lats, dtype=np.float64)
+        if target_lons.ndim == 1 and target_lats.ndim == 1:
+            target_lons, target_lats = np.meshgrid(target_lons, target_lats)
+        return Regridder.from_centers(self.centers, target_lons, target_lats, method, self.locator())
+    
+    def transect(self, lons, lats, n_samples, method='bilinear'):
+        """
+        Sample a polyline at equal distances and build the
+        operator that interpolates data on the cell centers
+        to the samples. The transect can be passed to regrid
+        to extract a section of any variable at any time.
+        
+        :param lons: longitudes of the polyline vertices
+        :type lons: numpy.array
+        :param lats: latitudes of the polyline vertices
+        :type lats: numpy.array
+        :param int n_samples: number of samples, including both ends
+        :param str method: 'bilinear' or 'nearest'
+        :return: the transect
+        :rtype: regrid.Transect
+        
+        """
+        sample_lons, sample_lats, distances = sample_polyline(lons, lats, n_samples)
+        regridder = Regridder.from_centers(self.centers, sample_lons, sample_lats, method, self.locator())
+        return Transect(sample_lons, sample_lats, distances, regridder)
+    
+    def regrid(self, variable, regridder, index=Ellipsis):
+        """
+        Read a face or edge variable and interpolate it
+        with a regridder built for this grid.
+        
+        :param variable: a variable of this grid or its name
+        :type variable: variables.SGridVariable or str
+        :param regridder: operator from regridder or transect
+        :type regridder: regrid.Regridder or regrid.Transect
+        :param index: index applied to the leading dimensions of the variable; defaults to all data
+        :return: data on the target points
+        :rtype: numpy.ma.MaskedArray
+        
+        """
+        if not isinstance(variable, SGridVariable):
+            variable = self.get_variable(variable)
+        if index is not Ellipsis:
+            if not isinstance(index, tuple):
+                index = (index,)
+            index = index + (Ellipsis,)
+        return regridder.apply(self.center_variable(variable, variable.read(index)))
+    
+    def section(self, lons, lats):
+        """
+        Build a section along the staircase path of grid
+        nodes joining the nodes nearest to the vertices
+        of a polyline. The section can be reused to
+        compute transports for any number of runs.
+        
+        :param lons: longitudes of the polyline vertices
+        :type lons: numpy.array
+        :param lats: latitudes of the polyline vertices
+        :type lats: numpy.array
+        :return: the nodes on the path and the edge points it crosses
+        :rtype: transport.Section
+        
+        """
+        if self.nodes is None:
+            raise ValueError('Sections follow grid nodes; the grid has no node coordinates')
+        nearest = self.locator('node').nearest(np.atleast_1d(lons), np.atleast_1d(lats))
+        node_rows, node_columns = staircase_path(*np.unravel_index(nearest, self.nodes.shape[:2]))
+        return section_edges(node_rows,
+                             node_columns,
+                             x_padding=self._get_face_axis_padding(-1),
+                             y_padding=self._get_face_axis_padding(-2)
+                             )
+    
+    def section_transport(self, section, times=None, u_variable='u', v_variable='v', zeta_variable='zeta',
+                          by_layer=False):
+        """
+        Compute the volume transport through a section in
+        m3/s, positive to the left of the path. Each time
+        step reads only the bounding boxes of the section's
+        edge points and sums over all of them at once.
+        
+        Velocities with a vertical dimension, such as
+        (time, s_rho, eta, xi), are multiplied by the layer
+        thicknesses; depth averaged velocities by the depth
+        of the water column.
+        
+        :param section: section from the section method
+        :type section: transport.Section
+        :param times: time indices to step through; defaults to all times
+        :type times: iterable
+        :param str u_variable: name of the xi velocity on edge1
+        :param str v_variable: name of the eta velocity on edge2
+        :param str zeta_variable: name of the free surface variable; None for a flat surface
+        :param bool by_layer: return the transport of each layer instead of the total
+        :return: transport with shape (time,) or (time, level)
+        :rtype: numpy.array
+        
+        """
+        u_var = self.get_variable(u_variable)
+        layered = len(u_var.dimensions) > 3
+        face_rows, face_columns = self.centers.shape[:-1]
+        # the faces on either side of each section edge
+        u_lower_columns, u_upper_columns = edge_faces(section.u_columns, face_columns, self._get_face_axis_padding(-1))
+        v_lower_rows, v_upper_rows = edge_faces(section.v_rows, face_rows, self._get_face_axis_padding(-2))
+        dy_u = self.get_metric('dy', 'edge1')[section.u_rows, section.u_columns]
+        dx_v = self.get_metric('dx', 'edge2')[section.v_rows, section.v_columns]
+        u_box, u_rows, u_columns = section_box(section.u_rows, section.u_columns)
+        v_box, v_rows, v_columns = section_box(section.v_rows, section.v_columns)
+        transports = []
+        nc_dataset = None
+        depth_steps = None
+        try:
+            with NETCDF_LOCK:
+                nc_dataset = nc4.Dataset(self.dataset_path)
+                nc_u = nc_dataset.variables[u_variable]
+                nc_v = nc_dataset.variables[v_variable]
+                if times is None:
+                    times = range(nc_u.shape[0])
+            times = list(times)
+            if zeta_variable is None:
+                flat_depths = self.depths(location='w')
+                depth_steps = (flat_depths for _ in times)
+            else:
+                depth_steps = self.iter_depths(times, location='w', zeta_variable=zeta_variable)
+            for time, w_depths in zip(times, depth_steps):
+                # w depths at the section edges, then the layer thicknesses there
+                w_u = 0.5 * (w_depths[..., section.u_rows, u_lower_columns] +
+                             w_depths[..., section.u_rows, u_upper_columns])
+                w_v = 0.5 * (w_depths[..., v_lower_rows, section.v_columns] +
+                             w_depths[..., v_upper_rows, section.v_columns])
+                if layered:
+                    dz_u = np.diff(w_u, axis=-2)
+                    dz_v = np.diff(w_v, axis=-2)
+                else:
+                    dz_u = w_u[-1] - w_u[0]
+                    dz_v = w_v[-1] - w_v[0]
+                with NETCDF_LOCK:
+                    u = nc_u[(time, Ellipsis) + u_box]
+                    v = nc_v[(time, Ellipsis) + v_box]
+                transport = (edge_transport(u[..., u_rows, u_columns], dy_u, dz_u, section.u_signs) +
+                             edge_transport(v[..., v_rows, v_columns], dx_v, dz_v, section.v_signs))
+                if layered and not by_layer:
+                    transport = transport.sum(axis=-1)
+                transports.append(transport)
+        finally:
+            if hasattr(depth_steps, 'close'):
+                depth_steps.close()
+            if nc_dataset is not None:
+                with NETCDF_LOCK:
+                    nc_dataset.close()
+        return np.array(transports)
+    
+    def coarsen(self, factor):
+        """
+        Build a grid whose cells are blocks of factor x factor
+        cells of this grid. Only the cells between nodes are
+        kept, so the coarse grid has no padding: its nodes
+        are every factor-th node of this grid and its centers
+        are the averages of the centers in each block. Cells
+        that do not fill a whole block are dropped.
+        
+        The coarse grid is held in memory and has no
+        variables; use pyramid_data for data to go with it.
+        
+        :param int factor: number of cells along each axis in a coarse cell
+        :return: the coarse grid
+        :rtype: SGrid2D
+        
+        """
+        if self.nodes is None:
+            raise ValueError('Coarsening aggregates cells between nodes; the grid has no node coordinates')
+        nodes = np.asarray(self.nodes)
+        window = (Ellipsis,) + tuple(self.face_window) + (slice(None),)
+        centers = np.asarray(self.centers)[window]
+        if centers.shape[:2] != (nodes.shape[0] - 1, nodes.shape[1] - 1):
+            raise ValueError('The cells between nodes do not line up with the cell centers')
+        coarse_centers = np.stack([block_mean(centers[..., coordinate], factor).filled(np.nan)
+                                   for coordinate in range(centers.shape[-1])], axis=-1)
+        row_count, column_count = coarse_centers.shape[:2]
+        coarse_nodes = nodes[:row_count * factor + 1:factor, :column_count * factor + 1:factor]
+        angles = None
+        if self.angles is not None:
+            # average the angles as unit vectors
+            angles = np.asarray(self.angles)[tuple(self.face_window)]
+            angles = np.arctan2(block_mean(np.sin(angles), factor).filled(np.nan),
+                                block_mean(np.cos(angles), factor).filled(np.nan))
+        face_padding = None
+        face_dimensions = None
+        dimensions = None
+        node_dimensions = self.node_dimensions
+        if self.face_padding is not None:
+            face_dims = [padding_info.face_dim for padding_info in self.face_padding]
+            row_dim, column_dim = self._get_axis_dimensions(self.face_coordinates, face_dims)
+            padding_by_dim = dict((padding_info.face_dim, padding_info) for padding_info in self.face_padding)
+            sizes = {row_dim: row_count, column_dim: column_count}
+            # list xi first, as the attributes of the coarse grid
+            # are not backed by variables with dimension orders
+            face_padding = tuple(padding_by_dim[face_dim]._replace(padding='none')
+                                 for face_dim in (column_dim, row_dim))
+            face_dimensions = ' '.join('{0}: {1} (padding: none)'.format(padding_info.face_dim, 
+                                                                         padding_info.node_dim)
+                                       for padding_info in face_padding)
+            dimensions = [(padding_info.face_dim, sizes[padding_info.face_dim]) for padding_info in face_padding]
+            dimensions += [(padding_info.node_dim, sizes[padding_info.face_dim] + 1)
+                           for padding_info in face_padding]
+            node_dimensions = ' '.join(padding_info.node_dim for padding_info in face_padding)
+        return SGrid2D(angles=angles,
+                       centers=coarse_centers,
+                       dimensions=dimensions,
+                       face_coordinates=self.face_coordinates,
+                       face_dimensions=face_dimensions,
+                       face_padding=face_padding,
+                       grid_topology_var=self.grid_topology_var,
+                       node_coordinates=self.node_coordinates,
+                       node_dimensions=node_dimensions,
+                       nodes=coarse_nodes
+                       )
+    
+    def pyramid(self, levels):
+        """
+        Get a stack of grids, each coarsened by a factor
+        of two from the one before. Level 0 is this grid.
+        Levels are built from the previous level and
+        cached on the grid.
+        
+        :param int levels: number of coarse levels
+        :return: grids from the finest to the coarsest
+        :rtype: list
+        
+        """
+        with GRID_CACHE_LOCK:
+            pyramid = self.__dict__.setdefault('_pyramid', [self])
+            while len(pyramid) <= levels:
+                pyramid.append(pyramid[-1].coarsen(2))
+            return pyramid[:levels + 1]
+    
+    def pyramid_data(self, variable, index, levels):
+        """
+        Get the data of a face or edge variable on every
+        level of the grid pyramid. The variable is read at
+        full resolution once, put on the cell centers
+        between nodes, and averaged down level by level.
+        Results for the most recently used variables and
+        indices are cached on the grid, up to
+        PYRAMID_CACHE_SIZE of them and PYRAMID_CACHE_BYTES
+        in total; larger results are not cached.
+        
+        :param variable: a variable of this grid or its name
+        :type variable: variables.SGridVariable or str
+        :param index: index applied to the leading dimensions of the variable; Ellipsis reads all data
+        :param int levels: number of coarse levels
+        :return: data from the finest to the coarsest level, each shaped like the centers of that level
+        :rtype: list
+        
+        """
+        if not isinstance(variable, SGridVariable):
+            variable = self.get_variable(variable)
+        if index is not Ellipsis:
+            if not isinstance(index, tuple):
+                index = (index,)
+            index = index + (Ellipsis,)
+        cache_key = (variable.variable, repr(index))
+        with GRID_CACHE_LOCK:
+            pyramid_cache = self.__dict__.setdefault('_pyramid_data', collections.OrderedDict())
+            # taken out of the cache while it is extended
+            pyramid_data = pyramid_cache.pop(cache_key, None)
+        if pyramid_data is None:
+            pyramid_data = [self.center_variable(variable, variable.read(index))]
+        if len(pyramid_data) == 1 and levels > 0:
+            # coarse levels only cover the cells between nodes
+            window = (Ellipsis,) + tuple(self.face_window)
+            pyramid_data.append(block_mean(pyramid_data[0][window], 2))
+        while len(pyramid_data) <= levels:
+            pyramid_data.append(block_mean(pyramid_data[-1], 2))
+        with GRID_CACHE_LOCK:
+            pyramid_cache[cache_key] = pyramid_data  # most recently used last
+            cache_bytes = sum(sum(level_data.nbytes for level_data in cached_data)
+                              for cached_data in pyramid_cache.values())
+            while pyramid_cache and (len(pyramid_cache) > PYRAMID_CACHE_SIZE or
+                                     cache_bytes > PYRAMID_CACHE_BYTES):
+                cache_bytes -= sum(level_data.nbytes for level_data in pyramid_cache.popitem(last=False)[1])
+        return pyramid_data[:levels + 1]
+    
+    @property
+    def dx(self):
+        """
+        Cell widths along xi in meters, on the cell centers.
+        
+        """
+        return self.get_metric('dx')
+    
+    @property
+    def dy(self):
+        """
+        Cell widths along eta in meters, on the cell centers.
+        
+        """
+        return self.get_metric('dy')
+    
+    @property
+    def area(self):
+        """
+        Cell areas in square meters, on the cell centers.
+        
+        """
+        return self.get_metric('area')
+    
+    def get_metric(self, name, location='face'):
+        """
+        Get a grid metric at a grid location. Metrics are
+        computed on first use and cached on the grid. Only
+        faces and edges have metrics; nodes do not.
+        
+        Face metrics come from the ROMS pm and pn variables,
+        read on first use, when they are variables of the
+        grid, otherwise from the node coordinates, otherwise
+        from the distances between cell centers. Face
+        metrics have the shape of the centers and are NaN
+        where they cannot be computed. Edge metrics are
+        averaged from the face metrics along the edge's
+        staggered axis: xi for edge1 and eta for edge2.
+        
+        :param str name: 'dx', 'dy', or 'area'
+        :param str location: 'face', 'edge1', or 'edge2'
+        :return: the metric
+        :rtype: numpy.array
+        
+        """
+        if name not in METRIC_NAMES:
+            raise ValueError('Unknown grid metric: {0}'.format(name))
+        metrics = self.__dict__.get('_metrics')
+        if metrics is None:
+            metrics = self._compute_face_metrics()
+            self._metrics = metrics
+        try:
+            return metrics[(name, location)]
+        except KeyError:
+            pass
+        if location == 'edge1':
+            axis = -1
+        elif location == 'edge2':
+            axis = -2
+        else:
+            raise ValueError('Metrics are only available on faces and edges, not {0}'.format(location))
+        edge_metric = face_to_edge(metrics[(name, 'face')], axis, self._get_face_axis_padding(axis))
+        metrics[(name, location)] = edge_metric
+        return edge_metric
+    
+    def divergence(self, u, v, out=None, workers=None):
+        """
+        Compute the horizontal divergence at faces.
+        
+        :param u: data on edge1 (staggered along xi); leading dimensions are kept
+        :type u: numpy.array
+        :param v: data on edge2 (staggered along eta)
+        :type v: numpy.array
+        :param out: array with the shape of the result to write into
+        :type out: numpy.array
+        :param int workers: number of threads to split the leading axis across
+        :return: divergence with the shape of the faces; NaN where it cannot be computed
+        :rtype: numpy.array
+        
+        """
+        return divergence(u, v, 
+                          self.get_metric('dy', 'edge1'), 
+                          self.get_metric('dx', 'edge2'), 
+                          self.area,
+                          x_padding=self._get_face_axis_padding(-1),
+                          y_padding=self._get_face_axis_padding(-2),
+                          out=out,
+                          workers=workers
+                          )
+    
+    def vorticity(self, u, v, out=None, workers=None):
+        """
+        Compute the relative vorticity at nodes.
+        
+        :param u: data on edge1 (staggered along xi); leading dimensions are kept
+        :type u: numpy.array
+        :param v: data on edge2 (staggered along eta)
+        :type v: numpy.array
+        :param out: array with the shape of the result to write into
+        :type out: numpy.array
+        :param int workers: number of threads to split the leading axis across
+        :return: vorticity with the shape of the nodes; NaN where it cannot be computed
+        :rtype: numpy.array
+        
+        """
+        return vorticity(u, v, 
+                         self.get_metric('dy', 'edge1'), 
+                         self.get_metric('dx', 'edge2'),
+                         x_padding=self._get_face_axis_padding(-1),
+                         y_padding=self._get_face_axis_padding(-2),
+                         out=out,
+                         workers=workers
+                         )
+    
+    def gradient(self, phi, out=None, workers=None):
+        """
+        Compute the gradient of a face scalar on edge1
+        (x gradient) and edge2 (y gradient).
+        
+        :param phi: data on faces; leading dimensions are kept
+        :type phi: numpy.array
+        :param out: pair of arrays to write the x and y gradients into
+        :type out: tuple
+        :param int workers: number of threads to split the leading axis across
+        :return: x and y gradients; NaN where they cannot be computed
+        :rtype: tuple
+        
+        """
+        return gradient(phi, 
+                        self.get_metric('dx', 'edge1'), 
+                        self.get_metric('dy', 'edge2'),
+                        x_padding=self._get_face_axis_padding(-1),
+                        y_padding=self._get_face_axis_padding(-2),
+                        out=out,
+                        workers=workers
+                        )
+    
+    def tiles(self, tile_shape, halo=1):
+        """
+        Split the faces of the grid into tiles. Each tile's
+        window includes a halo of faces around it, and the
+        edges and nodes bounding the window, so staggered
+        operators can be evaluated on the tile's faces.
+        
+        :param tuple tile_shape: number of (row, column) faces in each tile
+        :param int halo: number of faces around each tile to include in its window
+        :return: generator of tiles
+        :rtype: generator
+        
+        """
+        padding = (self._get_face_axis_padding(-2), self._get_face_axis_padding(-1))
+        return iter_tiles(self.centers.shape[:-1], tile_shape, halo, padding)
+    
+    def map_tiles(self, func, variables, tile_shape=(256, 256), halo=1, out=None, index=()):
+        """
+        Apply a function to a grid one tile at a time. Only
+        one tile of each variable is read at once, so memory
+        use is bounded by the tile size.
+        
+        func is called with the tile window's data for each
+        variable, in order, and must return values on the
+        faces of the window; any leading dimensions are kept.
+        The halo is trimmed from the result before it is
+        written to out.
+        
+        :param func: function to apply to each tile
+        :param list variables: variables of this grid, or their names, to read for each tile
+        :param tuple tile_shape: number of (row, column) faces in each tile
+        :param int halo: number of faces around each tile passed to func
+        :param out: array, memory map, or netCDF variable with the shape of the faces to write into; allocated if not given
+        :param tuple index: index applied to the leading dimensions of every variable, such as a time step
+        :return: out
+        
+        """
+        sgrid_variables = self._get_tile_variables(variables)
+        if not isinstance(index, tuple):
+            index = (index,)
+        with NETCDF_LOCK:
+            nc_dataset = nc4.Dataset(self.dataset_path)
+        try:
+            for tile in self.tiles(tile_shape, halo):
+                tile_data = [sgrid_variable.read(self._get_tile_key(sgrid_variable, tile, index), nc_dataset=nc_dataset)
+                             for sgrid_variable in sgrid_variables]
+                result = func(*tile_data)
+                if out is None:
+                    out = np.full(np.shape(result)[:-2] + self.centers.shape[:-1], np.nan)
+                with NETCDF_LOCK:  # out may be a netCDF variable
+                    out[(Ellipsis,) + tile.core] = result[(Ellipsis,) + tile.inner]
+        finally:
+            with NETCDF_LOCK:
+                nc_dataset.close()
+        return out
+    
+    def parallel_map(self, func, variables, workers=None, tile_shape=(256, 256), halo=1, out=None, index=()):
+        """
+        Apply a function to a grid tile by tile across a pool
+        of worker processes. Each worker opens the dataset
+        once and reads its own tiles; only tile indices are
+        sent to the workers and only trimmed results are sent
+        back, to be written into out as they arrive.
+        
+        func follows the same rules as for map_tiles, and must
+        be picklable, e.g. a function defined at module level.
         
+        :param func: function to apply to each tile
+        :param list variables: variables of this grid, or their names, to read for each tile
+        :param int workers: number of worker processes; defaults to the number of CPUs
+        :param tuple tile_shape: number of (row, column) faces in each tile
+        :param int halo: number of faces around each tile passed to func
+        :param out: array, memory map, or netCDF variable with the shape of the faces to write into; allocated if not given
+        :param tuple index: index applied to the leading dimensions of every variable, such as a time step
+        :return: out
+        
+        """
+        sgrid_variables = self._get_tile_variables(variables)
+        variable_names = [sgrid_variable.variable for sgrid_variable in sgrid_variables]
+        if not isinstance(index, tuple):
+            index = (index,)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        max_pending = 2 * workers  # bounds the results waiting to be written
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=open_worker_dataset,
+                                 initargs=(self.dataset_path,)
+                                 ) as executor:
+            pending = {}
+            tiles = iter(self.tiles(tile_shape, halo))
+            tiles_remaining = True
+            while tiles_remaining or pending:
+                while tiles_remaining and len(pending) < max_pending:
+                    try:
+                        tile = next(tiles)
+                    except StopIteration:
+                        tiles_remaining = False
+                        break
+                    keys = [self._get_tile_key(sgrid_variable, tile, index) for sgrid_variable in sgrid_variables]
+                    future = executor.submit(process_tile, func, variable_names, keys, tile.inner)
+                    pending[future] = tile
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tile = pending.pop(future)
+                    result = future.result()
+                    if out is None:
+                        out = np.full(np.shape(result)[:-2] + self.centers.shape[:-1], np.nan)
+                    with NETCDF_LOCK:  # out may be a netCDF variable
+                        out[(Ellipsis,) + tile.core] = result
+        return out
+    
+    def wet_index(self, location='face', variable=None):
+        """
+        Get the index of the wet points at a grid location.
+        It comes from the ROMS land mask for the location
+        (mask_rho, mask_u, mask_v, or mask_psi) when the
+        dataset has one, otherwise from the masked or fill
+        values of the first 2-D slice of variable. Indices
+        are cached on the grid, those from fill values by
+        variable.
+        
+        :param str location: 'face', 'edge1', 'edge2', or 'node'
+        :param variable: variable to take fill values from when there is no land mask
+        :type variable: variables.SGridVariable or str
+        :return: the index
+        :rtype: masking.WetPointIndex
+        
+        """
+        wet_indices = self.__dict__.setdefault('_wet_indices', {})
+        try:
+            return wet_indices[location]
+        except KeyError:
+            pass
+        mask_variable = MASK_VARIABLES.get(location)
+        if mask_variable is not None and mask_variable in (self.variables or []):
+            wet_index = WetPointIndex(self.get_variable(mask_variable).read())
+            wet_indices[location] = wet_index
+            return wet_index
+        if variable is None:
+            raise ValueError('There is no land mask for {0}; give a variable to take fill values from'.format(location))
+        if not isinstance(variable, SGridVariable):
+            variable = self.get_variable(variable)
+        try:
+            return wet_indices[(location, variable.variable)]
+        except KeyError:
+            pass
+        leading_index = (0,) * (len(variable.dimensions) - 2)
+        wet_index = WetPointIndex.from_fill_values(variable.read(leading_index))
+        wet_indices[(location, variable.variable)] = wet_index
+        return wet_index
+    
+    def read_compressed(self, variable, index=Ellipsis):
+        """
+        Read a variable and gather its wet points. Data are
+        read a block of WET_BLOCK_ROWS rows at a time, each
+        limited to the bounding box of its wet points, so
+        the full field is never held in memory.
+        
+        :param variable: a variable of this grid or its name
+        :type variable: variables.SGridVariable or str
+        :param index: index applied to the leading dimensions of the variable; defaults to all data
+        :return: the wet point data and the index to expand them with
+        :rtype: tuple
+        
+        """
+        if not isinstance(variable, SGridVariable):
+            variable = self.get_variable(variable)
+        location = variable.location if variable.location is not None else 'face'
+        wet_index = self.wet_index(location, variable)
+        if index is Ellipsis:
+            index = ()
+        elif not isinstance(index, tuple):
+            index = (index,)
+        compressed = None
+        for box, box_indices, positions in wet_index.blocks(WET_BLOCK_ROWS):
+            block = variable.read(index + (Ellipsis,) + box)
+            leading_shape = block.shape[:-2]
+            if compressed is None:
+                compressed = np.ma.zeros(leading_shape + (wet_index.count,), dtype=block.dtype)
+            compressed[..., positions] = block.reshape(leading_shape + (-1,))[..., box_indices]
+        if compressed is None:
+            # no wet points; read an empty box for the leading shape
+            block = variable.read(index + (Ellipsis, slice(0, 0), slice(0, 0)))
+            compressed = np.ma.zeros(block.shape[:-2] + (0,), dtype=block.dtype)
+        return compressed, wet_index
+    
+    def _get_tile_variables(self, variables):
+        if self.dataset_path is None:
+            raise ValueError('There is no dataset to read tiles from')
+        return [variable if isinstance(variable, SGridVariable) else self.get_variable(variable)
+                for variable in variables]
+    
+    def locator(self, location='face'):
+        """
+        Get the search structure over the cell centers or
+        the nodes of the grid. It is built on first use and
+        cached on the grid until the coordinates change.
+        
+        :param str location: 'face' for the cell centers or 'node' for the nodes
+        :return: the locator
+        :rtype: regrid.CellLocator
+        
+        """
+        if location == 'face':
+            attr_name, points = '_cell_locator', self.centers
+        elif location == 'node':
+            if self.nodes is None:
+                raise ValueError('The grid has no node coordinates')
+            attr_name, points = '_node_locator', self.nodes
+        else:
+            raise ValueError('Locators are built on faces or nodes, not {0}'.format(location))
+        with GRID_CACHE_LOCK:
+            locator = self.__dict__.get(attr_name)
+            if locator is None:
+                locator = CellLocator(points)
+                setattr(self, attr_name, locator)
+            return locator
+    
+    def _get_tile_key(self, sgrid_variable, tile, index):
+        # variables without a location are read as faces
+        location = sgrid_variable.location if sgrid_variable.location is not None else 'face'
+        return index + (Ellipsis,) + tuple(tile.index(location))
+    
+    def _get_face_axis_padding(self, axis):
+        # padding type of the face dimension along an array axis
+        variable_sources = self.__dict__.get('_variable_sources', {})
+        try:
+            face_dim = variable_sources[self.face_coordinates[0]].dimensions[axis]
+        except (KeyError, TypeError):
+            return 'none'
+        padding_info = self.padding_lookup.face_padding.get(face_dim)
+        if padding_info is None:
+            return 'none'
+        return padding_info.padding
+    
+    def _compute_face_metrics(self):
+        center_shape = self.centers.shape[:-1]
+        dx = dy = None
+        inverse_widths = self.__dict__.get('_inverse_widths')
+        dataset_variables = self.variables or []
+        if (inverse_widths is None and self.dataset_path is not None and
+                all(metric_var in dataset_variables for metric_var in METRIC_VARIABLES.values())):
+            # pm and pn are read on first use, together
+            with NETCDF_LOCK:
+                inverse_widths = tuple(np.ma.filled(self.get_variable(METRIC_VARIABLES[name]).read().astype(np.float64),
+                                                    np.nan)
+                                       for name in ('dx', 'dy'))
+            self._inverse_widths = inverse_widths
+        if inverse_widths is not None:
+            inverse_dx, inverse_dy = inverse_widths
+            if inverse_dx.shape == center_shape and inverse_dy.shape == center_shape:
+                with np.errstate(divide='ignore'):
+                    dx = np.where(inverse_dx != 0, 1.0 / inverse_dx, np.nan)
+                    dy = np.where(inverse_dy != 0, 1.0 / inverse_dy, np.nan)
+        if dx is None and self.nodes is not None:
+            node_dx, node_dy = cell_widths_from_nodes(np.asarray(self.nodes))
+            window = tuple(self.face_window)
+            dx = np.full(center_shape, np.nan)
+            dy = np.full(center_shape, np.nan)
+            if dx[window].shape == node_dx.shape:
+                dx[window] = node_dx
+                dy[window] = node_dy
+            else:
+                dx = dy = None
+        if dx is None:
+            dx, dy = cell_widths_from_centers(np.asarray(self.centers))
+        return {('dx', 'face'): dx,
+                ('dy', 'face'): dy,
+                ('area', 'face'): dx * dy
+                }
+        
+    @netcdf_locked
     def save_as_netcdf(self, filepath):
         with nc4.Dataset(filepath, 'w') as nclocal:
             grid_vars = self._save_common_components(nclocal)
@@ -277,11 +1570,147 @@ class SGrid2D(SGridND):
                 grid_vars.vertical_dimensions = self.vertical_dimensions
             if self.face_coordinates is not None:
                 grid_vars.face_coordinates = ' '.join(self.face_coordinates)
+    
+    @netcdf_locked
+    def save_as_ugrid(self, filepath, variables=None, mesh_name='mesh'):
+        """
+        Write the grid and its face, edge, and node variables
+        to a UGRID netCDF file. Faces are the cells between
+        nodes, numbered like the connectivity attributes.
+        Edge1 and edge2 variables are written on the mesh
+        edges that carry them and are fill values on the
+        others. Variables are read and written one step of
+        their first dimension at a time.
+        
+        :param str filepath: path of the file to write
+        :param list variables: names of the variables to write; defaults to all face, edge, and node variables
+        :param str mesh_name: name of the mesh topology variable
+        
+        """
+        if self.nodes is None:
+            raise ValueError('UGRID meshes are built on nodes; the grid has no node coordinates')
+        node_shape = self.node_shape
+        face_window = tuple(self.face_window)
+        xi_edge_points, eta_edge_points = edge_points(node_shape,
+                                                      x_padding=self._get_face_axis_padding(-1),
+                                                      y_padding=self._get_face_axis_padding(-2)
+                                                      )
+        grid_coordinates = set()
+        for coordinate_attribute in self.coordinate_attributes:
+            grid_coordinates.update(getattr(self, coordinate_attribute, None) or ())
+        if variables is None:
+            variables = [variable_name for variable_name in self.variables or []
+                         if variable_name not in grid_coordinates and 
+                         self.get_variable(variable_name).location in ('face', 'edge1', 'edge2', 'node')]
+        sgrid_variables = [self.get_variable(variable_name) for variable_name in variables]
+        node_dim = 'n{0}_node'.format(mesh_name)
+        face_dim = 'n{0}_face'.format(mesh_name)
+        edge_dim = 'n{0}_edge'.format(mesh_name)
+        location_dims = {'face': face_dim, 'edge1': edge_dim, 'edge2': edge_dim, 'node': node_dim}
+        with nc4.Dataset(filepath, 'w') as target:
+            target.Conventions = 'CF-1.6 UGRID-1.0'
+            target.createDimension(node_dim, node_shape[0] * node_shape[1])
+            target.createDimension(face_dim, (node_shape[0] - 1) * (node_shape[1] - 1))
+            target.createDimension(edge_dim, len(self.edges))
+            target.createDimension('two', 2)
+            target.createDimension('four', 4)
+            mesh = target.createVariable(mesh_name, 'i4')
+            mesh.cf_role = 'mesh_topology'
+            mesh.topology_dimension = 2
+            mesh.node_coordinates = '{0}_node_lon {0}_node_lat'.format(mesh_name)
+            mesh.face_coordinates = '{0}_face_lon {0}_face_lat'.format(mesh_name)
+            mesh.face_node_connectivity = '{0}_face_nodes'.format(mesh_name)
+            mesh.edge_node_connectivity = '{0}_edge_nodes'.format(mesh_name)
+            mesh.face_edge_connectivity = '{0}_face_edges'.format(mesh_name)
+            mesh.face_dimension = face_dim
+            mesh.edge_dimension = edge_dim
+            coordinates = ((node_dim, 'node', np.asarray(self.nodes).reshape(-1, 2)),
+                           (face_dim, 'face', np.asarray(self.centers)[face_window].reshape(-1, 2)))
+            for location_dim, location, location_coordinates in coordinates:
+                for axis, (standard_name, units) in enumerate((('longitude', 'degrees_east'),
+                                                               ('latitude', 'degrees_north'))):
+                    coordinate_var = target.createVariable('{0}_{1}_{2}'.format(mesh_name, location, standard_name[:3]),
+                                                           'f8', (location_dim,))
+                    coordinate_var.standard_name = standard_name
+                    coordinate_var.units = units
+                    coordinate_var[:] = location_coordinates[:, axis]
+            connectivities = (('face_nodes', 'face_node_connectivity', (face_dim, 'four'), self.faces),
+                              ('edge_nodes', 'edge_node_connectivity', (edge_dim, 'two'), self.edges),
+                              ('face_edges', 'face_edge_connectivity', (face_dim, 'four'), self.face_edges))
+            for suffix, cf_role, dims, connectivity in connectivities:
+                connectivity_var = target.createVariable('{0}_{1}'.format(mesh_name, suffix), connectivity.dtype, dims)
+                connectivity_var.cf_role = cf_role
+                connectivity_var.start_index = 0
+                connectivity_var[:] = connectivity
+            if not sgrid_variables:
+                return
+            if self.dataset_path is None:
+                raise ValueError('There is no dataset to read variables from')
+            with nc4.Dataset(self.dataset_path) as source:
+                for sgrid_variable in sgrid_variables:
+                    self._write_ugrid_variable(source, target, sgrid_variable, mesh_name, location_dims,
+                                               (xi_edge_points, eta_edge_points))
+    
+    def _write_ugrid_variable(self, source, target, sgrid_variable, mesh_name, location_dims, mesh_edge_points):
+        location = sgrid_variable.location
+        if location not in location_dims:
+            raise ValueError('{0} is not on faces, edges, or nodes'.format(sgrid_variable.variable))
+        leading_dims = tuple(sgrid_variable.dimensions[:-2])
+        for leading_dim in leading_dims:
+            if leading_dim in target.dimensions:
+                continue
+            target.createDimension(leading_dim, len(source.dimensions[leading_dim]))
+            if leading_dim in source.variables and source.variables[leading_dim].ndim == 1:
+                # copy coordinate variables such as time
+                source_coordinate = source.variables[leading_dim]
+                target_coordinate = target.createVariable(leading_dim, source_coordinate.dtype, (leading_dim,))
+                target_coordinate.setncatts(dict((attr_name, source_coordinate.getncattr(attr_name))
+                                                 for attr_name in source_coordinate.ncattrs()
+                                                 if attr_name != '_FillValue'))
+                target_coordinate[:] = source_coordinate[:]
+        dtype = np.dtype(sgrid_variable.dtype)
+        target_var = target.createVariable(sgrid_variable.variable,
+                                           dtype,
+                                           leading_dims + (location_dims[location],),
+                                           fill_value=nc4.default_fillvals[dtype.str[1:]]
+                                           )
+        target_var.mesh = mesh_name
+        target_var.location = 'edge' if location in ('edge1', 'edge2') else location
+        if location in ('face', 'node'):
+            target_var.coordinates = '{0}_{1}_lon {0}_{1}_lat'.format(mesh_name, location)
+        if sgrid_variable.standard_name is not None:
+            target_var.standard_name = sgrid_variable.standard_name
+        xi_edge_points, eta_edge_points = mesh_edge_points
+        xi_edge_count = xi_edge_points[0].size
+        face_window = tuple(self.face_window)
+        source_var = source.variables[sgrid_variable.variable]
+        # one step of the first dimension at a time bounds the memory used
+        step_keys = [(step,) for step in range(source_var.shape[0])] if leading_dims else [()]
+        for step_key in step_keys:
+            data = source_var[step_key + (Ellipsis,)]
+            if location == 'face':
+                face_data = data[(Ellipsis,) + face_window]
+                target_var[step_key + (Ellipsis,)] = face_data.reshape(data.shape[:-2] + (-1,))
+            elif location == 'node':
+                target_var[step_key + (Ellipsis,)] = data.reshape(data.shape[:-2] + (-1,))
+            elif location == 'edge1':
+                target_var[step_key + (Ellipsis, slice(xi_edge_count, None))] = data[(Ellipsis,) + eta_edge_points]
+            else:
+                target_var[step_key + (Ellipsis, slice(None, xi_edge_count))] = data[(Ellipsis,) + xi_edge_points]
 
               
 class SGrid3D(SGridND):
     
     topology_dimension = 3
+    coordinate_attributes = ('node_coordinates',
+                             'volume_coordinates',
+                             'edge1_coordinates',
+                             'edge2_coordinates',
+                             'edge3_coordinates',
+                             'face1_coordinates',
+                             'face2_coordinates',
+                             'face3_coordinates'
+                             )
     
     def __init__(self,
                  volume_padding=None,
@@ -324,7 +1753,8 @@ class SGrid3D(SGridND):
         super(SGrid3D, self).__init__(*args, **kwargs)
         
     @classmethod
-    def from_nc_dataset(cls, nc_dataset, topology_variable=None):
+    @netcdf_locked
+    def from_nc_dataset(cls, nc_dataset, topology_variable=None, variables=None, exclude_variables=None):
         sa = SGridAttributes(nc_dataset, cls.topology_dimension, topology_variable)
         dimensions = sa.get_dimensions()
         node_dimensions, node_coordinates = sa.get_node_coordinates()
@@ -347,6 +1777,7 @@ class SGrid3D(SGridND):
         nodes = sa.get_cell_node_lat_lon_3d()
         sgrid = cls(angles=None,
                     centers=centers,
+                    dataset_path=sa.get_dataset_path(),
                     dimensions=dimensions,
                     edge1_coordinates=edge1_coordinates,
                     edge1_dimensions=edge1_dimensions,
@@ -378,7 +1809,7 @@ class SGrid3D(SGridND):
                     volume_dimensions=volume_dimensions,
                     volume_padding=volume_padding
                     )
-        sa.get_variable_attributes(sgrid)
+        sa.get_variable_attributes(sgrid, variables, exclude_variables)
         return sgrid
     
     def get_all_face_padding(self):
@@ -402,9 +1833,13 @@ class SGrid3D(SGridND):
         return all_edge_padding
 
     def all_padding(self):
-        all_padding = self.volume_padding + self.get_all_face_padding() + self.get_all_edge_padding()
+        all_padding = []
+        if self.volume_padding is not None:
+            all_padding += self.volume_padding
+        all_padding += self.get_all_face_padding() + self.get_all_edge_padding()
         return all_padding
     
+    @netcdf_locked
     def save_as_netcdf(self, filepath):
         with nc4.Dataset(filepath, 'w') as nclocal:
             grid_vars = self._save_common_components(nclocal)
@@ -441,6 +1876,9 @@ class SGridAttributes(object):
         grid_dims = [(ds_dim, len(ds_dims[ds_dim])) for ds_dim in ds_dims]
         return grid_dims
         
+    def get_dataset_path(self):
+        return self.ncd.filepath
+        
     def get_topology_var(self):
         grid_topology_var = self.ncd.find_grid_topology_var()
         return grid_topology_var
@@ -480,17 +1918,76 @@ class SGridAttributes(object):
             node_coordinates = tuple(node_coordinate_val)
         return node_dimensions, node_coordinates
     
-    def get_variable_attributes(self, sgrid):
+    def get_grid_coordinate_variables(self, sgrid):
+        """
+        Get the names of the variables that make up the grid
+        itself: the grid topology variable, the coordinate
+        variables, and the angle variable if there is one.
+        
+        """
+        grid_coordinate_variables = [self.topology_variable]
+        for coordinate_attribute in sgrid.coordinate_attributes:
+            coordinates = getattr(sgrid, coordinate_attribute)
+            if coordinates is not None:
+                grid_coordinate_variables.extend(coordinates)
+        if 'angle' in self.nc_dataset.variables:
+            grid_coordinate_variables.append('angle')
+        return grid_coordinate_variables
+    
+    def select_variables(self, sgrid, variables=None, exclude_variables=None):
+        """
+        Determine which dataset variables should be attached
+        to the grid. The grid's own coordinate variables are
+        always selected. The land masks that wet_index reads
+        are selected with any variables, unless excluded.
+        
+        :param sgrid: the grid the variables will be attached to
+        :type sgrid: sgrid.SGrid2D or sgrid.SGrid3D
+        :param variables: names of the variables to select; defaults to all variables
+        :type variables: list
+        :param exclude_variables: names of variables not to select
+        :type exclude_variables: list
+        :return: names of the selected variables in dataset order
+        :rtype: list
+        
+        """
+        nc_variables = self.nc_dataset.variables
+        if variables is None and exclude_variables is None:
+            return list(nc_variables.keys())
+        if variables is not None:
+            missing_variables = [variable for variable in variables if variable not in nc_variables]
+            if missing_variables:
+                raise ValueError('Variables not found in the dataset: {0}'.format(', '.join(missing_variables)))
+            selected = set(variables)
+            selected.update(mask_variable for mask_variable in MASK_VARIABLES.values()
+                            if mask_variable in nc_variables)
+        else:
+            selected = set(nc_variables.keys())
+        if exclude_variables is not None:
+            selected.difference_update(exclude_variables)
+        selected.update(self.get_grid_coordinate_variables(sgrid))
+        return [nc_variable for nc_variable in nc_variables if nc_variable in selected]
+    
+    def get_variable_attributes(self, sgrid, variables=None, exclude_variables=None):
+        """
+        Record the variables of the dataset on the grid. Only
+        a small snapshot of each variable is kept here; the
+        SGridVariable is built the first time it is accessed
+        as an attribute of the grid.
+        
+        """
         dataset_variables = []
         grid_variables = []
+        variable_sources = {}
         nc_variables = self.nc_dataset.variables
-        for nc_variable in nc_variables:
+        for nc_variable in self.select_variables(sgrid, variables, exclude_variables):
             nc_var = nc_variables[nc_variable]
-            sgrid_var = SGridVariable.create_variable(nc_var, sgrid)
-            setattr(sgrid, sgrid_var.variable, sgrid_var)
-            dataset_variables.append(nc_var.name)
-            if hasattr(nc_var, 'grid'):
-                grid_variables.append(nc_var.name)
+            variable_source = NetCDFVariableAttributes.from_nc_variable(nc_var)
+            variable_sources[variable_source.name] = variable_source
+            dataset_variables.append(variable_source.name)
+            if 'grid' in variable_source.attributes:
+                grid_variables.append(variable_source.name)
+        sgrid._variable_sources = variable_sources
         sgrid.variables = dataset_variables
         sgrid.grid_variables = grid_variables
         
@@ -524,20 +2021,63 @@ class SGridAttributes(object):
         return cell_nodes
         
     def get_cell_center_lat_lon_3d(self):
+        """
+        Get the volume center longitudes and latitudes. 3-D
+        coordinates are too large to read unconditionally, so
+        they are read on demand.
+        
+        :return: paired center coordinates
+        :rtype: read_netcdf.NetCDFCoordinateArray
+        
+        """
         volume_coordinates = self.get_attr_coordinates('volume_coordinates')
         grid_cell_center_lon_var = volume_coordinates[0]
         grid_cell_center_lat_var = volume_coordinates[1]
-        grid_cell_center_lon = self.nc_dataset.variables[grid_cell_center_lon_var][:]
-        grid_cell_center_lat = self.nc_dataset.variables[grid_cell_center_lat_var][:]
-        return pair_arrays(grid_cell_center_lon, grid_cell_center_lat)
+        return self.get_coordinate_array((grid_cell_center_lon_var, grid_cell_center_lat_var))
         
     def get_cell_node_lat_lon_3d(self):
-        pass
+        """
+        Get the node coordinates of a 3-D grid, read on demand.
+        All of the variables named by node_coordinates are
+        paired, so the last axis holds (lon, lat) or
+        (lon, lat, z).
+        
+        :return: paired node coordinates, or None if the grid has none
+        :rtype: read_netcdf.NetCDFCoordinateArray
+        
+        """
+        node_coordinates = self.get_node_coordinates()[1]
+        if node_coordinates is None:
+            return None
+        return self.get_coordinate_array(node_coordinates)
+    
+    def get_coordinate_array(self, coordinate_variables):
+        """
+        Pair coordinate variables into an array that is read
+        on demand. Datasets without a file path cannot be
+        reopened, so their coordinates are read right away.
+        
+        :param tuple coordinate_variables: names of the coordinate variables
+        :return: paired coordinates
+        :rtype: read_netcdf.NetCDFCoordinateArray or numpy.array
+        
+        """
+        nc_variables = self.nc_dataset.variables
+        shapes = set(nc_variables[coordinate_variable].shape for coordinate_variable in coordinate_variables)
+        if len(shapes) != 1:
+            raise ValueError('Coordinate variables {0} do not have the same shape'.format(', '.join(coordinate_variables)))
+        dataset_path = self.get_dataset_path()
+        if dataset_path is None:
+            return np.stack([np.ma.getdata(nc_variables[coordinate_variable][:]) 
+                             for coordinate_variable in coordinate_variables], axis=-1).astype(np.float64)
+        return NetCDFCoordinateArray(dataset_path, coordinate_variables, shapes.pop())
         
         
 def _load_grid_from_nc_dataset(nc_dataset,
                                topology_dim,
-                               grid_topology_var=None
+                               grid_topology_var=None,
+                               variables=None,
+                               exclude_variables=None
                                ):
     """
     Create an SGridND object from an SGRID
@@ -551,14 +2091,24 @@ def _load_grid_from_nc_dataset(nc_dataset,
     :type nc_dataset: netCDF4.Dataset
     :param grid_topology_var: the name of the grid topology variable; defaults to None
     :type grid_topology_var: str
+    :param list variables: names of the variables to attach; defaults to all variables
+    :param list exclude_variables: names of variables not to attach; defaults to None
     :return: an SGrid object
     :rtype: sgrid.SGrid2D or sgrid.SGrid3D
     
     """
     if topology_dim == 2:
-        grid = SGrid2D.from_nc_dataset(nc_dataset, grid_topology_var)
+        grid = SGrid2D.from_nc_dataset(nc_dataset, 
+                                       grid_topology_var, 
+                                       variables=variables, 
+                                       exclude_variables=exclude_variables
+                                       )
     elif topology_dim == 3:
-        grid = SGrid3D.from_nc_dataset(nc_dataset, grid_topology_var)
+        grid = SGrid3D.from_nc_dataset(nc_dataset, 
+                                       grid_topology_var, 
+                                       variables=variables, 
+                                       exclude_variables=exclude_variables
+                                       )
     else:
         raise ValueError('Only topology dimensions of 2 or 3 are supported')
     return grid
@@ -592,13 +2142,21 @@ def _return_grid_topology_dim(nc_dataset, grid_topology_var=None):
         raise SGridNonCompliantError(nc_dataset)
     
     
-def from_ncfile(nc_url, grid_topology_var=None):
+@netcdf_locked
+def from_ncfile(nc_url, grid_topology_var=None, variables=None, exclude_variables=None):
     """
     Get a SGrid object from a file. There is no need
     to know the topology dimensions a priori.
     
+    Only the variables listed in variables (or all
+    variables not listed in exclude_variables) are
+    attached to the grid, along with the grid's own
+    coordinate variables.
+    
     :param str nc_url: URL or filepath to the netCDF file
     :param str grid_topology_vars: the name of the grid topology variable; defaults to None
+    :param list variables: names of the variables to attach; defaults to all variables
+    :param list exclude_variables: names of variables not to attach; defaults to None
     :return: SGrid object
     :rtype: sgrid.SGrid2D or sgrid.SGrid3D
     
@@ -611,18 +2169,28 @@ def from_ncfile(nc_url, grid_topology_var=None):
             topology_var = introspected_grid_topology_var
         grid = _load_grid_from_nc_dataset(nc_dataset, 
                                           topology_dim, 
-                                          topology_var
+                                          topology_var,
+                                          variables=variables,
+                                          exclude_variables=exclude_variables
                                           )
     return grid
 
 
-def from_nc_dataset(nc_dataset, grid_topology_var=None):
+@netcdf_locked
+def from_nc_dataset(nc_dataset, grid_topology_var=None, variables=None, exclude_variables=None):
     """
     Get a SGrid object from a netCDF4.Dataset. There is no need
     to know the topology dimensions a priori.
     
+    Only the variables listed in variables (or all
+    variables not listed in exclude_variables) are
+    attached to the grid, along with the grid's own
+    coordinate variables.
+    
     :param netCDF4.Dataset nc_dataset: a netCDF4 Dataset
     :param str grid_topology_vars: the name of the grid topology variable; defaults to None
+    :param list variables: names of the variables to attach; defaults to all variables
+    :param list exclude_variables: names of variables not to attach; defaults to None
     :return: SGrid object
     :rtype: sgrid.SGrid2D or sgrid.SGrid3D
     
@@ -634,6 +2202,8 @@ def from_nc_dataset(nc_dataset, grid_topology_var=None):
         topology_var = introspected_grid_topology_var
     grid = _load_grid_from_nc_dataset(nc_dataset, 
                                       topology_dim, 
-                                      topology_var
+                                      topology_var,
+                                      variables=variables,
+                                      exclude_variables=exclude_variables
                                       )
     return grid
\ No newline at end of file
@@ -0,0 +1,174 @@
+'''
+Created on Oct 18, 2026
+
+Extract time series at stations from one or more
+files without reading full fields.
+
+Stations are located on the grid once. For every
+file, stations that fall in the same block of cells
+share one read of the bounding box of their points,
+so the data read scale with the number of station
+clusters rather than the size of the grid.
+
+'''
+import collections
+
+import netCDF4 as nc4
+import numpy as np
+
+from .read_netcdf import NETCDF_LOCK
+from .sgrid import from_nc_dataset, from_ncfile
+from .variables import SGridVariable
+
+
+# stations in the same block of cells share one bounding read
+STATION_BLOCK_SIZE = 32
+
+
+StationPoints = collections.namedtuple('StationPoints', ('rows', 'columns', 'weights', 'valid'))
+
+
+def locate_stations(grid, variable, station_lons, station_lats):
+    """
+    Find the points of a variable that give its value
+    at each station. Face and node variables use the
+    nearest point; edge variables average the two edges
+    of the nearest face, as center_variable does.
+    Stations off the grid, further from the nearest point
+    than the corners of its cell, are marked invalid.
+
+    :param grid: the grid of the variable
+    :type grid: sgrid.SGrid2D
+    :param variable: a variable of the grid or its name
+    :type variable: variables.SGridVariable or str
+    :param station_lons: longitudes of the stations
+    :type station_lons: numpy.array
+    :param station_lats: latitudes of the stations
+    :type station_lats: numpy.array
+    :return: rows, columns, and weights of the points with shape (stations, points), and the stations that lie on the variable
+    :rtype: StationPoints
+
+    """
+    if not isinstance(variable, SGridVariable):
+        variable = grid.get_variable(variable)
+    station_lons = np.atleast_1d(np.asarray(station_lons, dtype=np.float64))
+    station_lats = np.atleast_1d(np.asarray(station_lats, dtype=np.float64))
+    if station_lons.shape != station_lats.shape or station_lons.ndim != 1:
+        raise ValueError('Station longitudes and latitudes must be 1-D arrays of the same length')
+    if variable.location == 'node':
+        nodes = grid.nodes
+        nearest, inside = grid.locator('node').locate(station_lons, station_lats)
+        rows, columns = np.unravel_index(nearest, nodes.shape[:2])
+        return StationPoints(rows[:, np.newaxis],
+                             columns[:, np.newaxis],
+                             np.ones((rows.size, 1)),
+                             inside
+                             )
+    center_shape = grid.centers.shape[:-1]
+    nearest, inside = grid.locator().locate(station_lons, station_lats)
+    rows, columns = np.unravel_index(nearest, center_shape)
+    if variable.location not in ('edge1', 'edge2'):
+        return StationPoints(rows[:, np.newaxis],
+                             columns[:, np.newaxis],
+                             np.ones((rows.size, 1)),
+                             inside
+                             )
+    # faces in the window take the average of the two edges
+    # bounding them; see SGrid2D.center_variable
+    row_window, column_window = (window.indices(size) for window, size in zip(grid.face_window, center_shape))
+    row_slicing, column_slicing = variable.center_slicing[-2:]
+    valid = (inside & (rows >= row_window[0]) & (rows < row_window[1]) &
+             (columns >= column_window[0]) & (columns < column_window[1]))
+    # stations off the window read the nearest face in it and are masked
+    edge_rows = np.clip(rows, row_window[0], row_window[1] - 1) - row_window[0] + (row_slicing.start or 0)
+    edge_columns = (np.clip(columns, column_window[0], column_window[1] - 1) - column_window[0] +
+                    (column_slicing.start or 0))
+    if variable.center_axis - 2 == -1:
+        edge_rows = np.stack((edge_rows, edge_rows), axis=-1)
+        edge_columns = np.stack((edge_columns, edge_columns + 1), axis=-1)
+    else:
+        edge_rows = np.stack((edge_rows, edge_rows + 1), axis=-1)
+        edge_columns = np.stack((edge_columns, edge_columns), axis=-1)
+    return StationPoints(edge_rows, edge_columns, np.full(edge_rows.shape, 0.5), valid)
+
+
+def _group_stations(station_points):
+    # stations whose first point falls in the same block of cells
+    blocks = collections.OrderedDict()
+    block_keys = zip(station_points.rows[:, 0] // STATION_BLOCK_SIZE,
+                     station_points.columns[:, 0] // STATION_BLOCK_SIZE)
+    for station, block_key in enumerate(block_keys):
+        blocks.setdefault(block_key, []).append(station)
+    for stations in blocks.values():
+        stations = np.array(stations)
+        rows = station_points.rows[stations]
+        columns = station_points.columns[stations]
+        box = (slice(rows.min(), rows.max() + 1), slice(columns.min(), columns.max() + 1))
+        yield stations, box
+
+
+def _read_stations(nc_var, station_points, groups):
+    leading_shape = nc_var.shape[:-2]
+    station_count = station_points.rows.shape[0]
+    result = np.ma.masked_all(leading_shape + (station_count,), dtype=np.float64)
+    for stations, box in groups:
+        with NETCDF_LOCK:
+            block = nc_var[(Ellipsis,) + box]
+        block = np.ma.filled(np.ma.asarray(block, dtype=np.float64), np.nan)
+        rows = station_points.rows[stations] - box[0].start
+        columns = station_points.columns[stations] - box[1].start
+        values = (block[..., rows, columns] * station_points.weights[stations]).sum(axis=-1)
+        result[..., stations] = values
+    invalid = ~station_points.valid | np.isnan(result.filled(np.nan))
+    return np.ma.masked_where(invalid, result)
+
+
+def extract_stations(sources, variable, station_lons, station_lats, grid=None):
+    """
+    Extract the values of a variable at stations from
+    one or more files.
+
+    Files are read in order and their results joined
+    along the first (time) dimension. All files must
+    share the grid of the first one.
+
+    :param sources: path or URL of a netCDF file, a sequence of them, or an open (multi-file) dataset
+    :type sources: str, list, or netCDF4.Dataset
+    :param str variable: name of the variable to extract
+    :param station_lons: longitudes of the stations
+    :type station_lons: numpy.array
+    :param station_lats: latitudes of the stations
+    :type station_lats: numpy.array
+    :param grid: grid of the files; loaded from the first source if not given
+    :type grid: sgrid.SGrid2D
+    :return: data with shape leading dimensions (such as time and depth) + (stations,); masked where a station has no data
+    :rtype: numpy.ma.MaskedArray
+
+    """
+    if isinstance(sources, str) or hasattr(sources, 'variables'):
+        sources = [sources]
+    sources = list(sources)
+    if not sources:
+        raise ValueError('No sources to extract stations from')
+    if grid is None:
+        if hasattr(sources[0], 'variables'):
+            grid = from_nc_dataset(sources[0], variables=[variable])
+        else:
+            grid = from_ncfile(sources[0], variables=[variable])
+    station_points = locate_stations(grid, variable, station_lons, station_lats)
+    groups = list(_group_stations(station_points))
+    results = []
+    for source in sources:
+        if hasattr(source, 'variables'):
+            results.append(_read_stations(source.variables[variable], station_points, groups))
+            continue
+        with NETCDF_LOCK:
+            nc_dataset = nc4.Dataset(source)
+        try:
+            results.append(_read_stations(nc_dataset.variables[variable], station_points, groups))
+        finally:
+            with NETCDF_LOCK:
+                nc_dataset.close()
+    if results[0].ndim == 1:
+        return np.ma.stack(results)
+    return np.ma.concatenate(results)
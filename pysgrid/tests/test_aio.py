@@ -0,0 +1,52 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import asyncio
+import os
+import unittest
+
+import numpy as np
+
+from .. import aio
+from ..sgrid import SGrid2D, from_ncfile
+from .write_nc_test_files import deltares_sgrid, roms_sgrid
+
+
+class TestAsyncLoading(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.roms_file = roms_sgrid()
+        cls.deltares_file = deltares_sgrid()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.roms_file)
+        os.remove(cls.deltares_file)
+
+    def test_from_ncfile(self):
+        sg_obj = asyncio.run(aio.from_ncfile(self.roms_file))
+        self.assertIsInstance(sg_obj, SGrid2D)
+        self.assertEqual(sg_obj.dataset_path, self.roms_file)
+
+    def test_concurrent_loads(self):
+        async def load_all():
+            paths = [self.roms_file, self.deltares_file] * 3
+            return await asyncio.gather(*[aio.from_ncfile(path) for path in paths])
+        grids = asyncio.run(load_all())
+        self.assertEqual(len(grids), 6)
+        self.assertEqual(grids[0].face_coordinates, ('lon_rho', 'lat_rho'))
+        self.assertEqual(grids[1].face_coordinates, ('XZ', 'YZ'))
+
+    def test_aread(self):
+        sg_obj = from_ncfile(self.roms_file)
+        expected = sg_obj.u.read(np.s_[0, 1])
+        result = asyncio.run(sg_obj.u.aread(np.s_[0, 1]))
+        np.testing.assert_equal(result, expected)
+        self.assertEqual(result.shape, (4, 3))
+
+    def test_read_without_dataset(self):
+        sg_obj = from_ncfile(self.roms_file)
+        sg_obj.u.dataset_path = None
+        self.assertRaises(ValueError, sg_obj.u.read)
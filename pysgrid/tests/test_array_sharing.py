@@ -0,0 +1,112 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import pickle
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..array_sharing import (MemmapArrayReference, SharedArrayReference, array_reference,
+                             create_shared_array, shareable_array)
+from ..sgrid import from_ncfile
+from .write_nc_test_files import roms_sgrid
+
+
+def _sum_centers(sgrid):
+    return float(sgrid.centers.sum())
+
+
+class TestArrayReferences(unittest.TestCase):
+
+    def setUp(self):
+        self.array = np.arange(12, dtype=np.float64).reshape(3, 4)
+
+    def test_shared_array_reference(self):
+        shm, shared_array = create_shared_array(self.array)
+        try:
+            reference = array_reference(shared_array, shm)
+            self.assertIsInstance(reference, SharedArrayReference)
+            unpickled_reference = pickle.loads(pickle.dumps(reference))
+            attached_shm, attached_array = unpickled_reference.attach()
+            np.testing.assert_equal(attached_array, self.array)
+            del attached_array
+            attached_shm.close()
+        finally:
+            del shared_array
+            shm.close()
+            shm.unlink()
+
+    def test_memmap_reference(self):
+        fd, npy_path = tempfile.mkstemp(suffix='.npy')
+        os.close(fd)
+        try:
+            np.save(npy_path, self.array)
+            mapped = np.load(npy_path, mmap_mode='r')
+            reference = array_reference(mapped)
+            self.assertIsInstance(reference, MemmapArrayReference)
+            attached = pickle.loads(pickle.dumps(reference)).attach()
+            np.testing.assert_equal(attached, self.array)
+            del mapped, attached
+        finally:
+            os.remove(npy_path)
+
+    def test_plain_array_has_no_reference(self):
+        self.assertIsNone(array_reference(self.array))
+
+    def test_masked_array_with_masked_values_not_shareable(self):
+        masked = np.ma.masked_less(self.array, 2)
+        self.assertIsNone(shareable_array(masked))
+        unmasked = np.ma.masked_array(self.array)
+        self.assertIsNotNone(shareable_array(unmasked))
+
+
+class TestSGridSharedMemory(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+        self.expected_centers = self.sg_obj.centers.copy()
+        self.sg_obj.share_memory()
+
+    def tearDown(self):
+        self.sg_obj.release_shared_memory()
+
+    def test_pickle_sends_references(self):
+        pickled = pickle.dumps(self.sg_obj)
+        unpickled = pickle.loads(pickled)
+        np.testing.assert_equal(unpickled.centers, self.expected_centers)
+        np.testing.assert_equal(unpickled.nodes, self.sg_obj.nodes)
+        self.assertEqual(unpickled.u.center_axis, 1)
+        self.assertNotIn(self.expected_centers.tobytes(), pickled)
+        unpickled.release_shared_memory()
+
+    def test_worker_release_keeps_parent_blocks(self):
+        pickled = pickle.dumps(self.sg_obj)
+        unpickled = pickle.loads(pickled)
+        unpickled.share_memory()  # nothing left to share
+        unpickled.release_shared_memory()
+        attached = pickle.loads(pickled)
+        np.testing.assert_equal(attached.centers, self.expected_centers)
+        attached.release_shared_memory()
+
+    def test_workers_share_geometry(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(_sum_centers, [self.sg_obj] * 4))
+        for result in results:
+            self.assertAlmostEqual(result, float(self.expected_centers.sum()))
+
+    def test_release_keeps_values(self):
+        self.sg_obj.release_shared_memory()
+        np.testing.assert_equal(self.sg_obj.centers, self.expected_centers)
+        self.assertNotIn('_shared_memory', self.sg_obj.__dict__)
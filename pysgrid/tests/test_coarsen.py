@@ -0,0 +1,81 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import pickle
+import unittest
+
+import mock
+import numpy as np
+
+from ..sgrid import SGrid2D, from_ncfile
+from .write_nc_test_files import roms_sgrid_vertical
+
+
+class TestSGridCoarsen(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+
+    def test_coarsen(self):
+        coarse = self.sg_obj.coarsen(2)
+        self.assertIsInstance(coarse, SGrid2D)
+        # 4 x 6 cells between nodes become 2 x 3 coarse cells
+        self.assertEqual(coarse.centers.shape, (2, 3, 2))
+        self.assertEqual(coarse.nodes.shape, (3, 4, 2))
+        np.testing.assert_allclose(coarse.nodes[1, 1], self.sg_obj.nodes[2, 2])
+        np.testing.assert_allclose(coarse.centers[0, 0], self.sg_obj.nodes[1, 1])
+        self.assertEqual([padding_info.padding for padding_info in coarse.face_padding], ['none', 'none'])
+        self.assertIn(('xi_rho', 3), coarse.dimensions)
+        self.assertIn(('eta_psi', 3), coarse.dimensions)
+        self.assertEqual(coarse.face_window, (slice(None), slice(None)))
+        self.assertEqual(coarse.get_metric('dx').shape, (2, 3))
+
+    def test_eta_first_face_dimensions(self):
+        self.sg_obj.face_padding = tuple(reversed(self.sg_obj.face_padding))
+        coarse = self.sg_obj.coarsen(2)
+        self.assertIn(('eta_rho', 2), coarse.dimensions)
+        self.assertIn(('xi_rho', 3), coarse.dimensions)
+        self.assertEqual(coarse.node_shape, (3, 4))
+        self.assertEqual(coarse.coarsen(2).centers.shape, (1, 1, 2))
+        self.assertIn(('xi_psi', 2), coarse.coarsen(2).dimensions)
+
+    def test_uneven_blocks(self):
+        coarse = self.sg_obj.coarsen(4)
+        self.assertEqual(coarse.centers.shape, (1, 1, 2))
+        np.testing.assert_allclose(coarse.nodes[-1, -1], self.sg_obj.nodes[4, 4])
+
+    def test_pyramid(self):
+        pyramid = self.sg_obj.pyramid(2)
+        self.assertEqual(len(pyramid), 3)
+        self.assertIs(pyramid[0], self.sg_obj)
+        self.assertEqual(pyramid[2].centers.shape, (1, 1, 2))
+        self.assertIs(self.sg_obj.pyramid(1)[1], pyramid[1])
+        self.assertNotIn('_pyramid', pickle.loads(pickle.dumps(self.sg_obj)).__dict__)
+
+    def test_pyramid_data(self):
+        levels = self.sg_obj.pyramid_data('temp', 1, 2)
+        self.assertEqual([level.shape for level in levels], [(4, 6, 8), (4, 2, 3), (4, 1, 1)])
+        np.testing.assert_allclose(levels[2][:, 0, 0], [10.0, 11.0, 12.0, 13.0])
+        self.assertIs(self.sg_obj.pyramid_data('temp', 1, 1)[1], levels[1])
+
+    def test_pyramid_edge_data(self):
+        levels = self.sg_obj.pyramid_data('u', 0, 1)
+        self.assertEqual(levels[0].shape, (4, 6, 8))
+        np.testing.assert_allclose(levels[1], 0.5)
+
+    def test_pyramid_data_cache_size(self):
+        with mock.patch('pysgrid.sgrid.PYRAMID_CACHE_BYTES', 512):
+            self.sg_obj.pyramid_data('temp', 1, 1)
+            self.assertEqual(len(self.sg_obj._pyramid_data), 0)  # larger than the cache
+            self.sg_obj.pyramid_data('zeta', 1, 1)
+            self.assertEqual(len(self.sg_obj._pyramid_data), 1)
@@ -0,0 +1,90 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import pickle
+import unittest
+
+import numpy as np
+
+from ..connectivity import connectivity_dtype, edge_nodes, edge_points, face_edges, face_nodes
+from ..sgrid import from_ncfile
+from .write_nc_test_files import roms_sgrid_vertical
+
+
+class TestConnectivity(unittest.TestCase):
+
+    def setUp(self):
+        self.node_shape = (3, 4)
+
+    def test_face_nodes(self):
+        faces = face_nodes(self.node_shape)
+        self.assertEqual(faces.shape, (6, 4))
+        self.assertEqual(faces.dtype, np.int32)
+        np.testing.assert_equal(faces[0], [0, 1, 5, 4])
+        np.testing.assert_equal(faces[-1], [6, 7, 11, 10])
+
+    def test_edge_nodes(self):
+        edges = edge_nodes(self.node_shape)
+        self.assertEqual(edges.shape, (3 * 3 + 2 * 4, 2))
+        np.testing.assert_equal(edges[0], [0, 1])
+        np.testing.assert_equal(edges[9], [0, 4])
+
+    def test_face_edges(self):
+        faces = face_nodes(self.node_shape)
+        edges = edge_nodes(self.node_shape)
+        edges_of_faces = edges[face_edges(self.node_shape)]
+        # each edge joins consecutive nodes of its face
+        for corner in range(4):
+            face_corners = faces[:, [corner, (corner + 1) % 4]]
+            np.testing.assert_equal(np.sort(edges_of_faces[:, corner], axis=-1), np.sort(face_corners, axis=-1))
+
+    def test_dtype(self):
+        self.assertEqual(connectivity_dtype(2 ** 31 - 1), np.int32)
+        self.assertEqual(connectivity_dtype(2 ** 31), np.int64)
+
+
+class TestSGridConnectivity(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+
+    def test_lazy_connectivity(self):
+        self.assertEqual(self.sg_obj.node_shape, (5, 7))
+        self.assertEqual(self.sg_obj.faces.shape, (4 * 6, 4))
+        self.assertIs(self.sg_obj.faces, self.sg_obj.faces)
+        self.assertEqual(self.sg_obj.edges.shape, (5 * 6 + 4 * 7, 2))
+        self.assertEqual(self.sg_obj.face_edges.shape, (24, 4))
+        self.assertNotIn('_connectivity', pickle.loads(pickle.dumps(self.sg_obj)).__dict__)
+
+    def test_node_dimension_sizes(self):
+        self.sg_obj.nodes = None
+        self.assertEqual(self.sg_obj.faces.shape, (24, 4))
+        self.assertEqual(self.sg_obj.node_shape, (5, 7))
+
+    def test_eta_first_node_dimensions(self):
+        self.sg_obj.nodes = None
+        self.sg_obj.node_dimensions = 'eta_psi xi_psi'
+        self.assertEqual(self.sg_obj.node_shape, (5, 7))
+
+    def test_explicit_faces(self):
+        self.sg_obj.faces = np.zeros((1, 4), dtype=np.int32)
+        self.assertEqual(self.sg_obj.faces.shape, (1, 4))
+        self.assertEqual(pickle.loads(pickle.dumps(self.sg_obj)).faces.shape, (1, 4))
+
+    def test_edge_points(self):
+        xi_edge_points, eta_edge_points = edge_points(self.sg_obj.node_shape)
+        node_lons = np.asarray(self.sg_obj.nodes)[..., 0].ravel()
+        midpoint_lons = node_lons[self.sg_obj.edges].mean(axis=-1)
+        xi_edge_count = xi_edge_points[0].size
+        np.testing.assert_allclose(self.sg_obj.lon_v.read()[xi_edge_points], midpoint_lons[:xi_edge_count])
+        np.testing.assert_allclose(self.sg_obj.lon_u.read()[eta_edge_points], midpoint_lons[xi_edge_count:])
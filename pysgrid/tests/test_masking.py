@@ -0,0 +1,114 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import unittest
+
+import mock
+import numpy as np
+
+from ..masking import WetPointIndex
+from ..regrid import Regridder
+from ..sgrid import from_ncfile
+from .write_nc_test_files import roms_sgrid_vertical
+
+
+class TestWetPointIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.mask = np.array([[0, 0, 1], [1, 1, 1]])
+        self.wet_index = WetPointIndex(self.mask)
+        self.data = np.arange(12, dtype=np.float64).reshape(2, 2, 3)
+
+    def test_counts(self):
+        self.assertEqual(self.wet_index.count, 4)
+        self.assertAlmostEqual(self.wet_index.land_fraction, 1.0 / 3.0)
+        np.testing.assert_equal(self.wet_index.positions, [[-1, -1, 0], [1, 2, 3]])
+
+    def test_round_trip(self):
+        compressed = self.wet_index.compress(self.data)
+        np.testing.assert_equal(compressed, [[2, 3, 4, 5], [8, 9, 10, 11]])
+        expanded = self.wet_index.expand(compressed)
+        self.assertEqual(expanded.shape, (2, 2, 3))
+        self.assertTrue(expanded.mask[:, 0, :2].all())
+        np.testing.assert_equal(expanded[:, 1], self.data[:, 1])
+        filled = self.wet_index.expand(compressed, fill_value=-1)
+        np.testing.assert_equal(filled[0, 0], [-1, -1, 2])
+
+    def test_from_fill_values(self):
+        data = np.ma.masked_equal([[1e37, 2.0], [3.0, 1e37]], 1e37)
+        wet_index = WetPointIndex.from_fill_values(data)
+        np.testing.assert_equal(wet_index.mask, [[False, True], [True, False]])
+
+    def test_blocks(self):
+        wet_index = WetPointIndex([[0, 0, 0], [0, 1, 1], [1, 0, 0], [0, 0, 0], [0, 1, 0]])
+        blocks = list(wet_index.blocks(2))
+        self.assertEqual([box for box, _, _ in blocks], [(slice(1, 2), slice(1, 3)),
+                                                         (slice(2, 3), slice(0, 1)),
+                                                         (slice(4, 5), slice(1, 2))])
+        np.testing.assert_equal(blocks[0][1], [0, 1])
+        self.assertEqual([positions for _, _, positions in blocks], [slice(0, 2), slice(2, 3), slice(3, 4)])
+
+    def test_wrong_shape(self):
+        self.assertRaises(ValueError, self.wet_index.compress, np.zeros((3, 3)))
+        self.assertRaises(ValueError, self.wet_index.expand, np.zeros(3))
+
+
+class TestCompressedRegridder(unittest.TestCase):
+
+    def test_coastal_weights(self):
+        lons, lats = np.meshgrid(np.arange(3.0), np.arange(2.0))
+        centers = np.stack((lons, lats), axis=-1)
+        regridder = Regridder.from_centers(centers, [[0.5, 1.5]], [[0.5, 0.5]])
+        wet_index = WetPointIndex([[0, 0, 1], [0, 1, 1]])
+        compressed_regridder = regridder.compress(wet_index)
+        result = compressed_regridder.apply(wet_index.compress(lons))
+        self.assertAlmostEqual(result[0, 0], 1.0)  # only one wet neighbor
+        self.assertAlmostEqual(result[0, 1], 1.5 + 1.0 / 6.0)
+
+
+class TestSGridWetPoints(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+
+    def test_wet_index_from_mask(self):
+        wet_index = self.sg_obj.wet_index('face')
+        self.assertEqual(wet_index.count, 6 * 8 - 6)
+        self.assertIs(self.sg_obj.wet_index('face'), wet_index)
+        self.assertEqual(self.sg_obj.wet_index('edge1').shape, (6, 7))
+
+    def test_read_compressed(self):
+        compressed, wet_index = self.sg_obj.read_compressed('temp', 1)
+        self.assertEqual(compressed.shape, (4, 42))
+        np.testing.assert_equal(wet_index.expand(compressed)[:, 3], self.sg_obj.temp.read(1)[:, 3])
+
+    def test_read_compressed_blocks(self):
+        with mock.patch('pysgrid.sgrid.WET_BLOCK_ROWS', 4):
+            compressed, wet_index = self.sg_obj.read_compressed('temp')
+        self.assertEqual(compressed.shape, (3, 4, 42))
+        np.testing.assert_equal(compressed, wet_index.compress(self.sg_obj.temp.read()))
+        compressed = self.sg_obj.read_compressed('u', (0, 1))[0]
+        self.assertEqual(compressed.shape, (self.sg_obj.wet_index('edge1').count,))
+        np.testing.assert_allclose(compressed, 0.5)
+
+    def test_mask_kept_with_selected_variables(self):
+        sg_obj = from_ncfile(self.sgrid_test_file, variables=['zeta'])
+        self.assertIn('mask_rho', sg_obj.variables)
+        np.testing.assert_equal(sg_obj.wet_index('face').mask, self.sg_obj.wet_index('face').mask)
+
+    def test_wet_index_from_fill_values(self):
+        sg_obj = from_ncfile(self.sgrid_test_file, exclude_variables=['mask_rho'])
+        self.assertRaises(ValueError, sg_obj.wet_index, 'face')
+        wet_index = sg_obj.wet_index('face', 'zeta')
+        self.assertEqual(wet_index.count, 48)
+        self.assertIs(sg_obj.wet_index('face', 'zeta'), wet_index)
@@ -0,0 +1,122 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import mock
+import netCDF4 as nc4
+import numpy as np
+
+from ..metrics import cell_widths_from_centers, cell_widths_from_nodes
+from ..sgrid import SGrid2D, from_nc_dataset, from_ncfile
+from .write_nc_test_files import roms_sgrid, roms_sgrid_vertical
+
+
+DEGREE_LENGTH = 111194.9  # meters per degree along a great circle
+
+
+class TestCellWidths(unittest.TestCase):
+
+    def setUp(self):
+        lons, lats = np.meshgrid(np.array([0.0, 0.1, 0.2, 0.3]), np.array([0.0, 0.1, 0.2]))
+        self.points = np.stack((lons, lats), axis=-1)
+
+    def test_from_nodes(self):
+        dx, dy = cell_widths_from_nodes(self.points)
+        self.assertEqual(dx.shape, (2, 3))
+        np.testing.assert_allclose(dx, 0.1 * DEGREE_LENGTH, rtol=1e-5)
+        np.testing.assert_allclose(dy, 0.1 * DEGREE_LENGTH, rtol=1e-5)
+
+    def test_from_centers(self):
+        dx, dy = cell_widths_from_centers(self.points)
+        self.assertEqual(dx.shape, (3, 4))
+        np.testing.assert_allclose(dy, 0.1 * DEGREE_LENGTH, rtol=1e-5)
+
+
+class TestSGridMetrics(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+
+    def test_metrics_from_pm_pn(self):
+        np.testing.assert_allclose(self.sg_obj.dx, 1.0 / self.sg_obj.pm.read())
+        np.testing.assert_allclose(self.sg_obj.dy, 1.0 / self.sg_obj.pn.read())
+        np.testing.assert_allclose(self.sg_obj.area, self.sg_obj.dx * self.sg_obj.dy)
+
+    def test_metrics_read_on_first_use(self):
+        with nc4.Dataset(self.sgrid_test_file) as ds:
+            sg_obj = from_nc_dataset(ds)
+            expected_dx = 1.0 / ds.variables['pm'][:]
+        self.assertNotIn('_inverse_widths', sg_obj.__dict__)
+        np.testing.assert_allclose(sg_obj.dx, expected_dx)
+        self.assertIn('_inverse_widths', sg_obj.__dict__)
+        np.testing.assert_allclose(pickle.loads(pickle.dumps(sg_obj)).dx, expected_dx)
+
+    def test_cached_metrics(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            self.sg_obj.to_cache(cache_dir)
+            cached = SGrid2D.from_cache(cache_dir)
+            self.assertIsInstance(cached._inverse_widths[0], np.memmap)
+            with mock.patch.object(nc4, 'Dataset', side_effect=AssertionError('the dataset was read')):
+                for metric_name in ('dx', 'dy', 'area'):
+                    metric = cached.get_metric(metric_name)
+                    self.assertIsInstance(metric, np.memmap)
+                    np.testing.assert_allclose(metric, self.sg_obj.get_metric(metric_name))
+                np.testing.assert_allclose(cached.get_metric('dx', 'edge1'), self.sg_obj.get_metric('dx', 'edge1'))
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_metrics_from_nodes(self):
+        sg_obj = from_ncfile(self.sgrid_test_file, exclude_variables=['pm', 'pn'])
+        self.assertTrue(np.isnan(sg_obj.dx[0]).all())  # padding cells have no nodes around them
+        np.testing.assert_allclose(sg_obj.dx[1:-1, 1:-1], self.sg_obj.dx[1:-1, 1:-1], rtol=1e-5)
+        np.testing.assert_allclose(sg_obj.dy[1:-1, 1:-1], self.sg_obj.dy[1:-1, 1:-1], rtol=1e-5)
+
+    def test_metrics_from_centers(self):
+        sg_obj = from_ncfile(self.sgrid_test_file, exclude_variables=['pm', 'pn'])
+        sg_obj.nodes = None
+        self.assertFalse(np.isnan(sg_obj.dx).any())
+        np.testing.assert_allclose(sg_obj.dy, self.sg_obj.dy, rtol=1e-5)
+
+    def test_edge_metrics(self):
+        dx_u = self.sg_obj.get_metric('dx', 'edge1')
+        self.assertEqual(dx_u.shape, (6, 7))
+        np.testing.assert_allclose(dx_u, 0.5 * (self.sg_obj.dx[:, 1:] + self.sg_obj.dx[:, :-1]))
+        self.assertEqual(self.sg_obj.get_metric('dy', 'edge2').shape, (5, 8))
+
+    def test_metrics_cached(self):
+        self.assertIs(self.sg_obj.dx, self.sg_obj.dx)
+        self.assertIs(self.sg_obj.get_metric('dx', 'edge1'), self.sg_obj.get_metric('dx', 'edge1'))
+
+    def test_unknown_metric(self):
+        self.assertRaises(ValueError, self.sg_obj.get_metric, 'volume')
+        self.assertRaises(ValueError, self.sg_obj.get_metric, 'dx', 'node')
+
+
+class TestSGridMetricsWithoutPmPn(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def test_metric_shapes(self):
+        sg_obj = from_ncfile(self.sgrid_test_file)
+        self.assertEqual(sg_obj.area.shape, sg_obj.centers.shape[:-1])
@@ -0,0 +1,129 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import unittest
+
+import numpy as np
+
+from ..operators import divergence, gradient, vorticity
+from ..sgrid import from_ncfile
+from .write_nc_test_files import roms_sgrid_vertical
+
+
+class TestOperatorsBothPadding(unittest.TestCase):
+    """
+    Unit spaced grid of 5 x 6 faces padded on both
+    sides, like ROMS rho points.
+
+    """
+    def setUp(self):
+        self.face_shape = (5, 6)
+        self.face_y, self.face_x = np.mgrid[0:5, 0:6].astype(np.float64)
+        # edge1 between faces i and i + 1 along x; edge2 between faces along y
+        self.u_x = self.face_x[:, :-1] + 0.5
+        self.u_y = self.face_y[:, :-1]
+        self.v_x = self.face_x[:-1, :]
+        self.v_y = self.face_y[:-1, :] + 0.5
+        self.dy_u = np.ones((5, 5))
+        self.dx_v = np.ones((4, 6))
+        self.area = np.ones(self.face_shape)
+
+    def test_divergence(self):
+        result = divergence(2 * self.u_x, 3 * self.v_y, self.dy_u, self.dx_v, self.area)
+        self.assertEqual(result.shape, self.face_shape)
+        np.testing.assert_allclose(result[1:-1, 1:-1], 5.0)
+        self.assertTrue(np.isnan(result[0]).all())
+        self.assertTrue(np.isnan(result[:, -1]).all())
+
+    def test_vorticity(self):
+        # solid body rotation u = -y, v = x has vorticity 2
+        result = vorticity(-self.u_y, self.v_x, self.dy_u, self.dx_v)
+        self.assertEqual(result.shape, (4, 5))
+        np.testing.assert_allclose(result, 2.0)
+
+    def test_gradient(self):
+        phi = 4 * self.face_x - self.face_y
+        grad_x, grad_y = gradient(phi, np.ones((5, 5)), np.ones((4, 6)))
+        np.testing.assert_allclose(grad_x, 4.0)
+        np.testing.assert_allclose(grad_y, -1.0)
+
+    def test_leading_dimensions_and_workers(self):
+        u = np.stack([self.u_x * scale for scale in range(1, 7)])
+        v = np.zeros((6,) + self.v_y.shape)
+        out = np.empty((6,) + self.face_shape)
+        result = divergence(u, v, self.dy_u, self.dx_v, self.area, out=out, workers=3)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(result[:, 2, 2], np.arange(1, 7))
+        np.testing.assert_equal(result, divergence(u, v, self.dy_u, self.dx_v, self.area))
+
+    def test_wrong_out_shape(self):
+        self.assertRaises(ValueError, divergence, self.u_x, self.v_y, self.dy_u, self.dx_v, self.area,
+                          out=np.empty((4, 4)))
+
+
+class TestOperatorsNoPadding(unittest.TestCase):
+    """
+    Unit spaced grid of 3 x 4 faces without padding,
+    like WRF mass points, with edges on the cell walls.
+
+    """
+    def setUp(self):
+        node_y, node_x = np.mgrid[0:4, 0:5].astype(np.float64)
+        self.u_x = node_x[:-1, :]
+        self.u_y = node_y[:-1, :] + 0.5
+        self.v_x = node_x[:, :-1] + 0.5
+        self.v_y = node_y[:, :-1]
+
+    def test_divergence(self):
+        result = divergence(self.u_x, self.v_y, np.ones((3, 5)), np.ones((4, 4)), np.ones((3, 4)),
+                            x_padding='none', y_padding='none')
+        np.testing.assert_allclose(result, 2.0)
+
+    def test_vorticity(self):
+        result = vorticity(-self.u_y, self.v_x, np.ones((3, 5)), np.ones((4, 4)),
+                           x_padding='none', y_padding='none')
+        self.assertEqual(result.shape, (4, 5))
+        np.testing.assert_allclose(result[1:-1, 1:-1], 2.0)
+        self.assertTrue(np.isnan(result[0]).all())
+
+    def test_gradient(self):
+        face_y, face_x = np.mgrid[0:3, 0:4].astype(np.float64)
+        grad_x, grad_y = gradient(face_x + 2 * face_y, np.ones((3, 5)), np.ones((4, 4)),
+                                  x_padding='none', y_padding='none')
+        np.testing.assert_allclose(grad_x[:, 1:-1], 1.0)
+        self.assertTrue(np.isnan(grad_x[:, 0]).all())
+        np.testing.assert_allclose(grad_y[1:-1], 2.0)
+
+
+class TestSGridOperators(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+
+    def test_divergence_of_uniform_flow(self):
+        u = self.sg_obj.u.read(0)
+        result = self.sg_obj.divergence(u, np.zeros_like(self.sg_obj.v.read(0)))
+        self.assertEqual(result.shape, (4, 6, 8))
+        # dy is constant, so uniform x flow has no divergence
+        np.testing.assert_allclose(result[:, 1:-1, 1:-1], 0.0, atol=1e-12)
+
+    def test_vorticity_shape(self):
+        result = self.sg_obj.vorticity(self.sg_obj.ubar.read(), self.sg_obj.vbar.read())
+        self.assertEqual(result.shape, (3, 5, 7))
+
+    def test_gradient_of_bathymetry(self):
+        grad_x, grad_y = self.sg_obj.gradient(self.sg_obj.h.read())
+        self.assertEqual(grad_x.shape, (6, 7))
+        self.assertEqual(grad_y.shape, (5, 8))
+        h = self.sg_obj.h.read()
+        np.testing.assert_allclose(grad_x, (h[:, 1:] - h[:, :-1]) / self.sg_obj.get_metric('dx', 'edge1'))
@@ -0,0 +1,79 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import unittest
+
+import netCDF4 as nc4
+import numpy as np
+
+from ..prefetch import PrefetchReader
+from ..sgrid import from_ncfile
+from .write_nc_test_files import roms_sgrid
+
+
+class TestPrefetchReader(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid()
+        with nc4.Dataset(cls.sgrid_test_file) as ds:
+            cls.expected_u = ds.variables['u'][:]
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def test_steps_across_files(self):
+        reader = PrefetchReader([self.sgrid_test_file, self.sgrid_test_file], 'u', prefetch=1)
+        steps = [step.copy() for step in reader]
+        self.assertEqual(len(steps), 4)
+        for step_number, step in enumerate(steps):
+            np.testing.assert_almost_equal(step, self.expected_u[step_number % 2])
+
+    def test_steps_are_kept(self):
+        reader = PrefetchReader([self.sgrid_test_file] * 3, 'u', prefetch=1)
+        steps = list(reader)
+        self.assertEqual(len(steps), 6)
+        for step_number, step in enumerate(steps):
+            np.testing.assert_almost_equal(step, self.expected_u[step_number % 2])
+
+    def test_steps_are_masked(self):
+        steps = list(PrefetchReader(self.sgrid_test_file, 'u'))
+        for step_number, step in enumerate(steps):
+            self.assertIsInstance(step, np.ma.MaskedArray)
+            np.testing.assert_array_equal(np.ma.getmaskarray(step),
+                                          np.ma.getmaskarray(self.expected_u[step_number]))
+
+    def test_step_index(self):
+        reader = PrefetchReader(self.sgrid_test_file, 'u', axis=1, index=(np.s_[1:3],))
+        steps = [step.copy() for step in reader]
+        self.assertEqual(len(steps), 2)
+        np.testing.assert_almost_equal(steps[1], self.expected_u[:, 1, 1:3])
+
+    def test_iterate_again(self):
+        reader = PrefetchReader(self.sgrid_test_file, 'u', prefetch=1)
+        self.assertEqual(len(list(reader)), 2)
+        steps = list(reader)
+        self.assertEqual(len(steps), 2)
+        np.testing.assert_almost_equal(steps[1], self.expected_u[1])
+        for _ in reader:
+            break
+        self.assertEqual(len(list(reader)), 2)
+
+    def test_early_exit_stops_reader(self):
+        reader = PrefetchReader([self.sgrid_test_file] * 5, 'u', prefetch=2)
+        for _ in reader:
+            break
+        self.assertFalse(reader._thread.is_alive())
+
+    def test_read_error_is_raised(self):
+        reader = PrefetchReader(self.sgrid_test_file, 'not_a_variable')
+        self.assertRaises(KeyError, list, reader)
+
+    def test_variable_iter_steps(self):
+        sg_obj = from_ncfile(self.sgrid_test_file)
+        steps = [step.copy() for step in sg_obj.salt.iter_steps()]
+        self.assertEqual(len(steps), 2)
+        self.assertEqual(steps[0].shape, (2, 4, 4))
@@ -6,7 +6,8 @@ Created on Apr 3, 2015
 import unittest
 import numpy as np
 
-from ..processing_2d import avg_to_cell_center, rotate_vectors, vector_sum
+from ..processing_2d import (avg_to_cell_center, block_mean, edge_faces, face_to_edge, 
+                             rotate_vectors, vector_sum)
 
 
 class TestVectorSum(unittest.TestCase):
@@ -59,4 +60,49 @@ class TestAvgToCellCenter(unittest.TestCase):
     def test_with_transpose(self):
         avg_result = avg_to_cell_center(self.data, self.avg_dim_0)
         expected = np.array([[6, 22, 25, 15], [6.5, 34, 29.5, 45.5]])
-        np.testing.assert_almost_equal(avg_result, expected, decimal=3)
\ No newline at end of file
+        np.testing.assert_almost_equal(avg_result, expected, decimal=3)
+        
+        
+class TestFaceToEdge(unittest.TestCase):
+    
+    def setUp(self):
+        self.data = np.array([[1.0, 3.0, 7.0], [2.0, 4.0, 8.0]])
+        
+    def test_both_padding(self):
+        result = face_to_edge(self.data, -1, 'both')
+        np.testing.assert_almost_equal(result, [[2, 5], [3, 6]])
+        
+    def test_no_padding(self):
+        result = face_to_edge(self.data, -1, 'none')
+        np.testing.assert_almost_equal(result, [[1, 2, 5, 7], [2, 3, 6, 8]])
+        
+    def test_low_and_high_padding(self):
+        np.testing.assert_almost_equal(face_to_edge(self.data, 0, 'low'), [[1.5, 3.5, 7.5], [2, 4, 8]])
+        np.testing.assert_almost_equal(face_to_edge(self.data, 0, 'high'), [[1, 3, 7], [1.5, 3.5, 7.5]])
+        
+    def test_unknown_padding(self):
+        self.assertRaises(ValueError, face_to_edge, self.data, 0, 'middle')
+        
+    def test_edge_faces(self):
+        for padding in ('both', 'none', 'low', 'high'):
+            edges = face_to_edge(self.data, -1, padding)
+            edge_indices = np.arange(edges.shape[-1])
+            lower_faces, upper_faces = edge_faces(edge_indices, self.data.shape[-1], padding)
+            np.testing.assert_almost_equal(0.5 * (self.data[:, lower_faces] + self.data[:, upper_faces]), edges)
+
+
+class TestBlockMean(unittest.TestCase):
+
+    def test_block_mean(self):
+        data = np.arange(30, dtype=np.float64).reshape(5, 6)
+        result = block_mean(data, 2)
+        self.assertEqual(result.shape, (2, 3))
+        np.testing.assert_equal(result[0], [3.5, 5.5, 7.5])
+
+    def test_masked_values(self):
+        data = np.ma.masked_array(np.ones((2, 2, 4)), mask=False)
+        data[:, 0, 0] = np.nan
+        data[:, :, 2:] = np.ma.masked
+        result = block_mean(data, 2)
+        np.testing.assert_equal(result[:, 0, 0], 1.0)
+        self.assertTrue(result.mask[:, 0, 1].all())
@@ -74,6 +74,19 @@ class TestParsePadding(unittest.TestCase):
         self.assertEqual(sub_dim, expected_sub_dim)
         self.assertEqual(dim, expected_dim)
         
+    def test_padding_is_immutable(self):
+        result = parse_padding(self.with_two_padding, self.grid_topology)
+        self.assertIsInstance(result, tuple)
+        
+    def test_padding_parsed_once(self):
+        parse_padding.cache_clear()
+        first_result = parse_padding(self.with_two_padding, self.grid_topology)
+        second_result = parse_padding(self.with_two_padding, self.grid_topology)
+        cache_info = parse_padding.cache_info()
+        self.assertIs(first_result, second_result)
+        self.assertEqual(cache_info.misses, 1)
+        self.assertEqual(cache_info.hits, 1)
+        
     def test_no_padding(self):
         self.assertRaises(CannotFindPaddingError, 
                           parse_padding, 
@@ -0,0 +1,153 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import numpy as np
+
+from ..regrid import CellLocator, Regridder, sample_polyline
+from ..sgrid import from_ncfile
+from .write_nc_test_files import roms_sgrid_vertical
+
+
+class TestRegridder(unittest.TestCase):
+
+    def setUp(self):
+        # a sheared curvilinear grid of 5 x 6 cell centers
+        rows, columns = np.meshgrid(np.arange(5.0), np.arange(6.0), indexing='ij')
+        self.lons = -70.0 + 0.1 * columns + 0.02 * rows
+        self.lats = 40.0 + 0.1 * rows
+        self.centers = np.stack((self.lons, self.lats), axis=-1)
+        self.target_lons = np.array([[-69.85, -69.6], [-69.5, -80.0]])
+        self.target_lats = np.array([[40.05, 40.22], [40.31, 40.0]])
+
+    def test_bilinear_reproduces_linear_fields(self):
+        regridder = Regridder.from_centers(self.centers, self.target_lons, self.target_lats)
+        result = regridder.apply(self.lons)
+        self.assertEqual(result.shape, (2, 2))
+        np.testing.assert_allclose(result[:1], self.target_lons[:1])
+        self.assertAlmostEqual(result[1, 0], -69.5)
+        self.assertIs(result[1, 1], np.ma.masked)  # off the grid
+        np.testing.assert_allclose(regridder.apply(self.lats)[0], self.target_lats[0])
+
+    def test_nearest(self):
+        regridder = Regridder.from_centers(self.centers, [-69.85], [40.21], method='nearest')
+        result = regridder.apply(self.lons)
+        self.assertAlmostEqual(result[0], self.lons[2, 1])
+
+    def test_nearest_off_the_grid(self):
+        regridder = Regridder.from_centers(self.centers, self.target_lons, self.target_lats, method='nearest')
+        result = regridder.apply(self.lons)
+        self.assertAlmostEqual(result[0, 1], self.lons[2, 4])
+        self.assertIs(result[1, 1], np.ma.masked)  # far west of the grid
+        # half a cell beyond the last column is still on the grid
+        result = Regridder.from_centers(self.centers, [-69.45], [40.0], method='nearest').apply(self.lons)
+        self.assertAlmostEqual(result[0], self.lons[0, 5])
+        result = Regridder.from_centers(self.centers, [-69.3], [40.0], method='nearest').apply(self.lons)
+        self.assertIs(result[0], np.ma.masked)
+
+    def test_leading_dimensions(self):
+        regridder = Regridder.from_centers(self.centers, self.target_lons, self.target_lats)
+        data = np.stack([self.lons, 2 * self.lons, 3 * self.lons])
+        result = regridder.apply(data)
+        self.assertEqual(result.shape, (3, 2, 2))
+        np.testing.assert_allclose(result[2, 0], 3 * self.target_lons[0])
+
+    def test_masked_source(self):
+        regridder = Regridder.from_centers(self.centers, self.target_lons, self.target_lats)
+        data = np.ma.masked_array(self.lons)
+        data[:2, :3] = np.ma.masked
+        self.assertIs(regridder.apply(data)[0, 0], np.ma.masked)
+
+    def test_wrong_shape(self):
+        regridder = Regridder.from_centers(self.centers, self.target_lons, self.target_lats)
+        self.assertRaises(ValueError, regridder.apply, np.zeros((4, 6)))
+
+    def test_save_load(self):
+        regridder = Regridder.from_centers(self.centers, self.target_lons, self.target_lats)
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            filepath = os.path.join(tmp_dir, 'regridder.npz')
+            regridder.save(filepath)
+            loaded = Regridder.load(filepath)
+        finally:
+            shutil.rmtree(tmp_dir)
+        self.assertEqual(loaded.method, 'bilinear')
+        self.assertEqual(loaded.target_shape, (2, 2))
+        np.testing.assert_equal(loaded.apply(self.lons), regridder.apply(self.lons))
+
+    def test_brute_force_search(self):
+        with mock.patch('pysgrid.regrid.cKDTree', None):
+            locator = CellLocator(self.centers)
+        nearest = locator.nearest(np.array([-69.85, -69.5]), np.array([40.21, 40.4]))
+        np.testing.assert_equal(nearest, [2 * 6 + 1, 4 * 6 + 4])
+        inside = locator.locate(np.array([-69.85, -80.0]), np.array([40.21, 40.0]))[1]
+        np.testing.assert_equal(inside, [True, False])
+
+
+class TestSamplePolyline(unittest.TestCase):
+
+    def test_equal_spacing(self):
+        lons, lats, distances = sample_polyline([0.0, 1.0, 1.0], [0.0, 0.0, 1.0], 5)
+        np.testing.assert_allclose(lons, [0.0, 0.5, 1.0, 1.0, 1.0], atol=1e-3)
+        np.testing.assert_allclose(lats, [0.0, 0.0, 0.0, 0.5, 1.0], atol=1e-3)
+        np.testing.assert_allclose(np.diff(distances), distances[-1] / 4)
+        self.assertAlmostEqual(distances[-1], 2 * 111195, delta=10)
+
+    def test_too_few_points(self):
+        self.assertRaises(ValueError, sample_polyline, [0.0], [0.0], 5)
+        self.assertRaises(ValueError, sample_polyline, [0.0, 1.0], [0.0, 1.0], 1)
+
+
+class TestSGridRegrid(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+        self.regridder = self.sg_obj.regridder(np.linspace(-69.95, -69.35, 5), np.linspace(40.05, 40.45, 3))
+
+    def test_regular_target_grid(self):
+        self.assertEqual(self.regridder.target_shape, (3, 5))
+        result = self.sg_obj.regrid('zeta', self.regridder, 2)
+        np.testing.assert_allclose(result, 0.2, rtol=1e-6)
+
+    def test_all_time_steps(self):
+        result = self.sg_obj.regrid('temp', self.regridder)
+        self.assertEqual(result.shape, (3, 4, 3, 5))
+        np.testing.assert_allclose(result[:, 3], 13.0)
+
+    def test_edge_variable(self):
+        result = self.sg_obj.regrid('u', self.regridder, 0)
+        self.assertEqual(result.shape, (4, 3, 5))
+        self.assertAlmostEqual(result[0, 1, 2], 0.5)
+        self.assertIs(result[0, 0, 0], np.ma.masked)  # outside the face window
+
+    def test_center_variable(self):
+        u = self.sg_obj.u.read(0)
+        centered = self.sg_obj.center_variable('u', u)
+        self.assertEqual(centered.shape, (4, 6, 8))
+        self.assertTrue(centered[:, 0].mask.all())
+        np.testing.assert_allclose(centered[:, 1:-1, 1:-1], 0.5)
+
+    def test_transect_section(self):
+        transect = self.sg_obj.transect([-69.9, -69.4, -69.4], [40.1, 40.1, 40.4], 9)
+        self.assertEqual(len(transect), 9)
+        section = self.sg_obj.regrid('temp', transect, 1)
+        self.assertEqual(section.shape, (4, 9))
+        np.testing.assert_allclose(section[:, 4], [10.0, 11.0, 12.0, 13.0])
+        np.testing.assert_allclose(transect.apply(self.sg_obj.centers[..., 0])[:6],
+                                   transect.lons[:6])
+        depths = transect.apply(self.sg_obj.depths(1))
+        self.assertEqual(depths.shape, (4, 9))
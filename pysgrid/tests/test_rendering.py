@@ -0,0 +1,108 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import io
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+import numpy as np
+
+from ..rendering import TileRenderer, tile_pixel_coordinates
+from ..sgrid import from_ncfile
+from .write_nc_test_files import roms_sgrid_vertical
+
+
+def _tile_containing(lon, lat, z):
+    tile_count = 2 ** z
+    x = int((lon + 180.0) / 360.0 * tile_count)
+    y = int((1 - np.arcsinh(np.tan(np.radians(lat))) / np.pi) / 2 * tile_count)
+    return x, y
+
+
+class TestTilePixelCoordinates(unittest.TestCase):
+
+    def test_world_tile(self):
+        lons, lats = tile_pixel_coordinates(0, 0, 0, tile_size=4)
+        np.testing.assert_allclose(lons[0], [-135.0, -45.0, 45.0, 135.0])
+        self.assertTrue((np.diff(lats[:, 0]) < 0).all())  # north to south
+        np.testing.assert_allclose(lats[:, 0], -lats[::-1, 0])
+
+    def test_missing_tile(self):
+        self.assertRaises(ValueError, tile_pixel_coordinates, 1, 2, 0)
+
+
+class TestTileRenderer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+        self.renderer = TileRenderer(self.sg_obj, tile_size=64)
+        self.z = 8
+        self.x, self.y = _tile_containing(-69.65, 40.25, self.z)
+
+    def _request(self, path, query=''):
+        environ = {'PATH_INFO': path, 'QUERY_STRING': query}
+        setup_testing_defaults(environ)
+        response = {}
+
+        def start_response(status, headers):
+            response['status'] = status
+            response['headers'] = dict(headers)
+
+        body = b''.join(self.renderer.wsgi_app(environ, start_response))
+        return response['status'], response['headers'], body
+
+    def test_render(self):
+        tile = self.renderer.render('zeta', 2, self.z, self.x, self.y)
+        self.assertEqual(tile.shape, (64, 64))
+        self.assertEqual(tile.dtype, np.float32)
+        on_grid = np.isfinite(tile)
+        self.assertTrue(on_grid.any() and not on_grid.all())
+        np.testing.assert_allclose(tile[on_grid], 0.2, rtol=1e-6)
+
+    def test_caches(self):
+        tile = self.renderer.render('zeta', 1, self.z, self.x, self.y)
+        self.assertIs(self.renderer.render('zeta', 1, self.z, self.x, self.y), tile)
+        lookup = self.renderer.get_lookup(self.z, self.x, self.y)
+        self.renderer.render('zeta', 0, self.z, self.x, self.y)
+        self.assertIs(self.renderer.get_lookup(self.z, self.x, self.y), lookup)
+
+    def test_threads(self):
+        renderer = TileRenderer(self.sg_obj, tile_size=64, pyramid_levels=1)
+        tile_keys = [(z, x, y) for z in (0, 4, self.z) for x, y in [_tile_containing(-69.65, 40.25, z)]]
+        with ThreadPoolExecutor(4) as executor:
+            tiles = list(executor.map(lambda tile_key: renderer.render('zeta', 2, *tile_key), tile_keys * 4))
+        self.assertEqual(len(self.sg_obj._pyramid), 2)
+        for tile in tiles:
+            np.testing.assert_allclose(tile[np.isfinite(tile)], 0.2, rtol=1e-6)
+
+    def test_pyramid_level(self):
+        renderer = TileRenderer(self.sg_obj, pyramid_levels=2)
+        self.assertEqual(renderer.get_level(self.z, self.y), 0)
+        self.assertEqual(renderer.get_level(0, 0), 2)
+
+    def test_wsgi_tile(self):
+        path = '/temp/1/{0}/{1}/{2}.npy'.format(self.z, self.x, self.y)
+        status, headers, body = self._request(path, 'level=3')
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(headers['Content-Type'], 'application/octet-stream')
+        tile = np.load(io.BytesIO(body))
+        np.testing.assert_allclose(tile[np.isfinite(tile)], 13.0)
+
+    def test_wsgi_errors(self):
+        self.assertEqual(self._request('/zeta/0/8/1')[0], '404 Not Found')
+        self.assertEqual(self._request('/nothing/0/8/1/1.npy')[0], '404 Not Found')
+        self.assertEqual(self._request('/zeta/a/8/1/1.npy')[0], '400 Bad Request')
+        self.assertEqual(self._request('/zeta/0/1/5/0.npy')[0], '400 Bad Request')
+        # 4-D variables need a vertical level
+        self.assertEqual(self._request('/temp/0/8/{0}/{1}.npy'.format(self.x, self.y))[0], '400 Bad Request')
@@ -4,6 +4,9 @@ Created on Apr 7, 2015
 @author: ayan
 '''
 import os
+import pickle
+import shutil
+import tempfile
 import unittest
 
 import mock
@@ -11,10 +14,12 @@ import netCDF4 as nc4
 import numpy as np
 
 from ..custom_exceptions import SGridNonCompliantError
+from ..read_netcdf import NetCDFCoordinateArray
 from ..sgrid import SGrid2D, SGrid3D, from_ncfile, from_nc_dataset
-from ..utils import GridPadding
+from ..utils import GridPadding, infer_dimension_attributes
+from ..variables import SGridVariable
 from .write_nc_test_files import (deltares_sgrid, deltares_sgrid_no_optional_attr, 
-                                  non_compliant_sgrid, roms_sgrid, wrf_sgrid, 
+                                  non_compliant_sgrid, roms_sgrid, sgrid_3d_node_coordinates, wrf_sgrid, 
                                   wrf_sgrid_2d)
 
 
@@ -159,6 +164,30 @@ class TestSGridRomsDataset(unittest.TestCase):
         self.assertEqual(u_center_slices, u_center_expected)
         self.assertEqual(v_center_slices, v_center_expected)
         
+    def test_shared_dimension_attributes(self):
+        u_center_slices = self.sg_obj.u.center_slicing
+        fake_u_center_slices = self.sg_obj.fake_u.center_slicing
+        self.assertIs(u_center_slices, fake_u_center_slices)
+        
+    @mock.patch('pysgrid.sgrid.infer_dimension_attributes', 
+                wraps=infer_dimension_attributes)
+    def test_dimension_attributes_computed_once_per_signature(self, mock_infer):
+        sg_obj = from_ncfile(self.sgrid_test_file)
+        self.assertEqual(mock_infer.call_count, 0)  # variables are built lazily
+        self.assertEqual(sg_obj.u.center_axis, 1)
+        self.assertEqual(sg_obj.fake_u.center_axis, 1)
+        self.assertEqual(mock_infer.call_count, 1)
+        
+    def test_lazy_variable_materialization(self):
+        self.assertNotIn('salt', self.sg_obj.__dict__)
+        salt = self.sg_obj.salt
+        self.assertIsInstance(salt, SGridVariable)
+        self.assertIs(self.sg_obj.__dict__['salt'], salt)
+        self.assertIs(self.sg_obj.salt, salt)
+        
+    def test_unknown_attribute(self):
+        self.assertRaises(AttributeError, getattr, self.sg_obj, 'not_a_variable')
+        
     def test_grid_variable_average_axes(self):
         uc_axis = self.sg_obj.u.center_axis
         uc_axis_expected = 1
@@ -191,6 +220,150 @@ class TestSGridRomsDataset(unittest.TestCase):
         mock_nc.Dataset.assert_called_with(self.write_path, 'w')
         
 
+class TestSGridSelectVariables(unittest.TestCase):
+    """
+    Test loading only some of the variables in a dataset.
+    
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid()
+        
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+        
+    def setUp(self):
+        self.grid_coordinate_vars = [u'grid', 
+                                     u'lon_rho', 
+                                     u'lat_rho', 
+                                     u'lon_psi', 
+                                     u'lat_psi', 
+                                     u'lat_u', 
+                                     u'lon_u', 
+                                     u'lat_v', 
+                                     u'lon_v'
+                                     ]
+        
+    def test_select_variables(self):
+        sg_obj = from_ncfile(self.sgrid_test_file, variables=['u', 'v', 'zeta'])
+        expected_vars = set(self.grid_coordinate_vars + [u'u', u'v', u'zeta'])
+        self.assertEqual(set(sg_obj.variables), expected_vars)
+        self.assertEqual(set(sg_obj.grid_variables), set([u'u', u'v']))
+        self.assertEqual(sg_obj.u.center_axis, 1)
+        self.assertFalse(hasattr(sg_obj, 'salt'))
+        
+    def test_exclude_variables(self):
+        sg_obj = from_ncfile(self.sgrid_test_file, exclude_variables=['salt', 'fake_u', 'lon_rho'])
+        self.assertNotIn(u'salt', sg_obj.variables)
+        self.assertNotIn(u'fake_u', sg_obj.variables)
+        self.assertIn(u'lon_rho', sg_obj.variables)  # grid coordinates are always loaded
+        self.assertIn(u'u', sg_obj.variables)
+        
+    def test_select_from_dataset(self):
+        with nc4.Dataset(self.sgrid_test_file) as ds:
+            sg_obj = SGrid2D.from_nc_dataset(ds, variables=['salt'])
+        self.assertEqual(set(sg_obj.variables), set(self.grid_coordinate_vars + [u'salt']))
+        
+    def test_select_missing_variable(self):
+        self.assertRaises(ValueError, 
+                          from_ncfile, 
+                          self.sgrid_test_file, 
+                          variables=['not_a_variable']
+                          )
+        
+
+class TestSGridShadowedVariables(unittest.TestCase):
+    """
+    Test reaching variables whose names are taken by
+    grid attributes.
+    
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid(nc_filename='test_sgrid_roms_shadowed.nc')
+        with nc4.Dataset(cls.sgrid_test_file, 'a') as ds:
+            for name in ('dx', 'angles'):
+                shadowed_var = ds.createVariable(name, 'f8', ds.variables['lon_rho'].dimensions)
+                shadowed_var[:] = 1.0
+        
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+        
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+        
+    def test_get_variable(self):
+        self.assertNotIsInstance(self.sg_obj.angles, SGridVariable)
+        for name in ('dx', 'angles'):
+            sgrid_var = self.sg_obj.get_variable(name)
+            self.assertIsInstance(sgrid_var, SGridVariable)
+            self.assertEqual(sgrid_var.variable, name)
+            self.assertIs(self.sg_obj.get_variable(name), sgrid_var)
+            np.testing.assert_equal(sgrid_var.read(), 1.0)
+        self.assertIs(self.sg_obj.get_variable('u'), self.sg_obj.u)
+        self.assertRaises(ValueError, self.sg_obj.get_variable, 'not_a_variable')
+        
+    def test_save_as_ugrid(self):
+        ugrid_file = self.sgrid_test_file.replace('.nc', '_ugrid.nc')
+        try:
+            self.sg_obj.save_as_ugrid(ugrid_file, variables=['dx', 'angles'])
+            with nc4.Dataset(ugrid_file) as ds:
+                for name in ('dx', 'angles'):
+                    self.assertEqual(ds.variables[name].location, 'face')
+                    np.testing.assert_equal(ds.variables[name][:], 1.0)
+        finally:
+            if os.path.exists(ugrid_file):
+                os.remove(ugrid_file)
+        
+
+class TestSGridCache(unittest.TestCase):
+    """
+    Test writing a grid to a cache directory and
+    opening it again.
+    
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid()
+        
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+        
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+        self.sg_obj.to_cache(self.cache_dir)
+        self.cached = SGrid2D.from_cache(self.cache_dir)
+        
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+        
+    def test_arrays_are_memory_mapped(self):
+        self.assertIsInstance(self.cached.centers, np.memmap)
+        np.testing.assert_equal(self.cached.centers, self.sg_obj.centers)
+        np.testing.assert_equal(self.cached.nodes, self.sg_obj.nodes)
+        np.testing.assert_almost_equal(self.cached.angles, self.sg_obj.angles)
+        
+    def test_topology_metadata(self):
+        self.assertEqual(self.cached.face_padding, tuple(self.sg_obj.face_padding))
+        self.assertEqual(self.cached.face_coordinates, self.sg_obj.face_coordinates)
+        self.assertEqual(self.cached.dimensions, self.sg_obj.dimensions)
+        self.assertEqual(self.cached.variables, self.sg_obj.variables)
+        self.assertEqual(self.cached.grid_variables, self.sg_obj.grid_variables)
+        
+    def test_cached_variables(self):
+        self.assertEqual(self.cached.u.center_slicing, self.sg_obj.u.center_slicing)
+        self.assertEqual(self.cached.u.location, 'edge1')
+        self.assertEqual(self.cached.u.dtype, np.dtype('float32'))
+        self.assertEqual(self.cached.u.coordinates, self.sg_obj.u.coordinates)
+        
+    def test_wrong_grid_class(self):
+        self.assertRaises(ValueError, SGrid3D.from_cache, self.cache_dir)
+        
+
 class TestSGridNoCoordinates(unittest.TestCase):
     """
     Test to make sure that if no coordinates (e.g. face, edge1, etc)
@@ -539,10 +712,10 @@ class Test3DimensionalSGrid(unittest.TestCase):
         
     def test_volume_padding(self):
         volume_padding = self.sg_obj.volume_padding
-        volume_padding_expected = [GridPadding(mesh_topology_var=u'grid', face_dim=u'west_east', node_dim=u'west_east_stag', padding=u'none'), 
+        volume_padding_expected = (GridPadding(mesh_topology_var=u'grid', face_dim=u'west_east', node_dim=u'west_east_stag', padding=u'none'), 
                                    GridPadding(mesh_topology_var=u'grid', face_dim=u'south_north', node_dim=u'south_north_stag', padding=u'none'), 
                                    GridPadding(mesh_topology_var=u'grid', face_dim=u'bottom_top', node_dim=u'bottom_top_stag', padding=u'none')
-                                   ]
+                                   )
         self.assertEqual(volume_padding, volume_padding_expected)
         
     def test_volume_coordinates(self):
@@ -586,4 +759,68 @@ class Test3DimensionalSGrid(unittest.TestCase):
         self.assertTrue(hasattr(self.sg_obj, 'face3_coordinates'))
         self.assertTrue(hasattr(self.sg_obj, 'edge3_padding'))
         self.assertTrue(hasattr(self.sg_obj, 'edge3_coordinates'))
-        self.assertTrue(hasattr(self.sg_obj, 'edge3_dimensions'))
\ No newline at end of file
+        self.assertTrue(hasattr(self.sg_obj, 'edge3_dimensions'))
+
+
+class TestSGrid3DNodeCoordinates(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = sgrid_3d_node_coordinates()
+        
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+    
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+        
+    def test_nodes_are_lazy(self):
+        self.assertIsInstance(self.sg_obj.nodes, NetCDFCoordinateArray)
+        self.assertIsInstance(self.sg_obj.centers, NetCDFCoordinateArray)
+        self.assertEqual(self.sg_obj.nodes.shape, (3, 4, 5, 3))
+        self.assertEqual(self.sg_obj.centers.shape, (2, 3, 4, 2))
+        
+    def test_node_values(self):
+        nodes = np.asarray(self.sg_obj.nodes)
+        self.assertEqual(nodes.shape, (3, 4, 5, 3))
+        np.testing.assert_allclose(nodes[2, 3, 4], (-69.6, 40.3, -20.0))
+        
+    def test_read_block(self):
+        block = self.sg_obj.nodes[1, :2, ..., 1:]
+        np.testing.assert_allclose(block, np.asarray(self.sg_obj.nodes)[1, :2, :, 1:])
+        np.testing.assert_allclose(self.sg_obj.nodes[..., 2], np.asarray(self.sg_obj.nodes)[..., 2])
+        
+    def test_masked_coordinates(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_path = os.path.join(tmp_dir, 'masked_coordinates.nc')
+            with nc4.Dataset(file_path, 'w') as ds:
+                ds.createDimension('x', 3)
+                lon = ds.createVariable('lon', 'f8', ('x',), fill_value=-999.0)
+                lat = ds.createVariable('lat', 'f8', ('x',))
+                lon[:] = np.ma.masked_values([1.0, -999.0, 3.0], -999.0)
+                lat[:] = [4.0, 5.0, 6.0]
+            coordinates = NetCDFCoordinateArray(file_path, ('lon', 'lat'), (3,))
+            paired = coordinates[...]
+            np.testing.assert_equal(np.ma.getmaskarray(paired), [[False, False], [True, False], [False, False]])
+            np.testing.assert_equal(paired[:, 1], [4.0, 5.0, 6.0])
+            np.testing.assert_equal(np.ma.getmaskarray(coordinates[:, 0]), [False, True, False])
+            self.assertFalse(np.ma.isMaskedArray(coordinates[:, 1]))
+            np.testing.assert_equal(np.asarray(coordinates)[:, 0], [1.0, np.nan, 3.0])
+        finally:
+            shutil.rmtree(tmp_dir)
+        
+    def test_pickle_keeps_nodes_lazy(self):
+        unpickled = pickle.loads(pickle.dumps(self.sg_obj))
+        self.assertIsInstance(unpickled.nodes, NetCDFCoordinateArray)
+        np.testing.assert_equal(np.asarray(unpickled.nodes), np.asarray(self.sg_obj.nodes))
+        
+    def test_cache_stores_nodes(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            self.sg_obj.to_cache(cache_dir)
+            cached = SGrid3D.from_cache(cache_dir)
+            np.testing.assert_equal(cached.nodes, np.asarray(self.sg_obj.nodes))
+        finally:
+            shutil.rmtree(cache_dir)
@@ -0,0 +1,90 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import copy
+import os
+import unittest
+
+import mock
+import numpy as np
+
+from .. import extract_stations
+from ..sgrid import from_ncfile
+from ..stations import locate_stations
+from .write_nc_test_files import roms_sgrid_vertical
+
+
+class TestExtractStations(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_files = [roms_sgrid_vertical(nc_filename='test_stations_{0}.nc'.format(file_number))
+                                for file_number in range(2)]
+
+    @classmethod
+    def tearDownClass(cls):
+        for sgrid_test_file in cls.sgrid_test_files:
+            os.remove(sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_files[0])
+        self.station_lons = np.array([-69.7, -69.4, -69.98])
+        self.station_lats = np.array([40.2, 40.5, 40.0])
+
+    def test_face_variable(self):
+        result = extract_stations(self.sgrid_test_files, 'temp', self.station_lons, self.station_lats)
+        self.assertEqual(result.shape, (6, 4, 3))
+        temp = self.sg_obj.temp.read()
+        np.testing.assert_equal(result[:3, :, 0], temp[:, :, 2, 3])
+        np.testing.assert_equal(result[3:, :, 1], temp[:, :, 5, 6])
+
+    def test_time_series(self):
+        result = extract_stations(self.sgrid_test_files[0], 'zeta', self.station_lons, self.station_lats)
+        self.assertEqual(result.shape, (3, 3))
+        np.testing.assert_allclose(result[:, 2], [0.0, 0.1, 0.2], rtol=1e-6)
+
+    def test_edge_variable(self):
+        result = extract_stations(self.sgrid_test_files, 'ubar', self.station_lons, self.station_lats,
+                                  grid=self.sg_obj)
+        np.testing.assert_allclose(result[:, :2], 0.5)
+        self.assertTrue(result.mask[:, 2].all())  # outside the face window
+
+    def test_edge_points(self):
+        station_points = locate_stations(self.sg_obj, 'u', [-69.7], [40.2])
+        np.testing.assert_equal(station_points.rows, [[2, 2]])
+        np.testing.assert_equal(station_points.columns, [[2, 3]])
+
+    def test_locators_are_reused(self):
+        node_variable = copy.copy(self.sg_obj.zeta)
+        node_variable.location = 'node'
+        for location, variable in (('face', 'zeta'), ('node', node_variable)):
+            locate_stations(self.sg_obj, variable, self.station_lons, self.station_lats)
+            locator = self.sg_obj.locator(location)
+            locate_stations(self.sg_obj, variable, self.station_lons, self.station_lats)
+            self.assertIs(self.sg_obj.locator(location), locator)
+        self.assertIsNot(self.sg_obj.locator('node'), self.sg_obj.locator('face'))
+        self.assertRaises(ValueError, self.sg_obj.locator, 'edge1')
+
+    def test_stations_off_the_grid(self):
+        lons = np.array([-69.7, -75.0, -69.7])
+        lats = np.array([40.2, 40.2, 45.0])
+        result = extract_stations(self.sgrid_test_files[0], 'zeta', lons, lats, grid=self.sg_obj)
+        self.assertFalse(result.mask[:, 0].any())
+        self.assertTrue(result.mask[:, 1:].all())
+        node_variable = copy.copy(self.sg_obj.zeta)
+        node_variable.location = 'node'
+        for variable in ('u', node_variable):
+            station_points = locate_stations(self.sg_obj, variable, lons, lats)
+            np.testing.assert_equal(station_points.valid, [True, False, False])
+
+    def test_nearby_stations_share_reads(self):
+        with mock.patch('pysgrid.stations.STATION_BLOCK_SIZE', 4):
+            with mock.patch('pysgrid.stations.nc4.Dataset') as mock_dataset:
+                mock_var = mock.MagicMock()
+                mock_var.shape = (3, 6, 8)
+                mock_var.__getitem__.return_value = np.zeros((3, 4, 4))
+                mock_dataset.return_value.variables = {'zeta': mock_var}
+                extract_stations(['dummy.nc'], 'zeta', self.station_lons, self.station_lats, grid=self.sg_obj)
+        # the first and last stations share a block of cells
+        self.assertEqual(mock_var.__getitem__.call_count, 2)
@@ -0,0 +1,177 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..operators import divergence
+from ..read_netcdf import NETCDF_LOCK
+from ..sgrid import from_ncfile
+from .. import tiling
+from ..tiling import iter_tiles, open_worker_dataset
+from .write_nc_test_files import roms_sgrid_vertical
+
+
+def _salinity_anomaly(temp, salt):
+    return salt - 35.0 + temp
+
+
+class _MarkedDataset(object):
+    # appends a line to a marker file each time the dataset is closed
+
+    def __init__(self, nc_dataset, marker_path):
+        self.nc_dataset = nc_dataset
+        self.marker_path = marker_path
+
+    def close(self):
+        self.nc_dataset.close()
+        with open(self.marker_path, 'a') as marker_file:
+            marker_file.write('closed\n')
+
+
+def _open_marked_dataset(dataset_path, marker_path):
+    open_worker_dataset(dataset_path)
+    open_worker_dataset(dataset_path)
+    tiling._worker_dataset = _MarkedDataset(tiling._worker_dataset, marker_path)
+
+
+def _worker_state():
+    return tiling._worker_dataset.nc_dataset.isopen(), tiling._exit_handlers_pid == os.getpid()
+
+
+class _LockCheckingOut(object):
+    # records whether the netCDF lock is held during each write
+
+    def __init__(self, shape):
+        self.array = np.zeros(shape)
+        self.locked_writes = []
+
+    def __setitem__(self, key, value):
+        self.locked_writes.append(NETCDF_LOCK._is_owned())
+        self.array[key] = value
+
+
+class TestIterTiles(unittest.TestCase):
+
+    def test_tiles_cover_faces(self):
+        covered = np.zeros((7, 9), dtype=int)
+        for tile in iter_tiles((7, 9), (3, 4), halo=1):
+            covered[tile.core] += 1
+            window = np.arange(63).reshape(7, 9)[tile.window]
+            np.testing.assert_equal(window[tile.inner], np.arange(63).reshape(7, 9)[tile.core])
+        np.testing.assert_equal(covered, 1)
+
+    def test_halo(self):
+        tiles = list(iter_tiles((7, 9), (3, 4), halo=2))
+        self.assertEqual(tiles[0].window, (slice(0, 5), slice(0, 6)))
+        self.assertEqual(tiles[4].window, (slice(1, 7), slice(2, 9)))
+        self.assertEqual(tiles[4].inner, (slice(2, 5), slice(2, 6)))
+
+    def test_edge_slices_both_padding(self):
+        # 8 faces padded on both sides have 7 edges; edge i lies between faces i and i + 1
+        tiles = list(iter_tiles((1, 8), (1, 4), halo=0, padding=('both', 'both')))
+        self.assertEqual(tiles[0].index('edge1'), (slice(0, 1), slice(0, 4)))
+        self.assertEqual(tiles[0].padding[1], 'low')
+        self.assertEqual(tiles[1].index('edge1'), (slice(0, 1), slice(3, 7)))
+        self.assertEqual(tiles[1].padding[1], 'high')
+
+    def test_edge_slices_no_padding(self):
+        tiles = list(iter_tiles((4, 4), (2, 2), halo=0, padding=('none', 'none')))
+        self.assertEqual(tiles[3].index('node'), (slice(2, 5), slice(2, 5)))
+        self.assertEqual(tiles[3].padding, ('none', 'none'))
+
+    def test_bad_arguments(self):
+        self.assertRaises(ValueError, list, iter_tiles((4, 4), (0, 2)))
+        self.assertRaises(ValueError, list, iter_tiles((4, 4), (2, 2), padding=('both', 'middle')))
+
+
+class TestSGridMapTiles(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+
+    def test_identity(self):
+        result = self.sg_obj.map_tiles(lambda temp: temp, ['temp'], tile_shape=(4, 3), index=1)
+        np.testing.assert_equal(result, self.sg_obj.temp.read(1))
+
+    def test_write_into_out(self):
+        out = np.zeros((6, 8))
+        result = self.sg_obj.map_tiles(lambda h: 2 * h, [self.sg_obj.h], tile_shape=(2, 5), out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, 2 * self.sg_obj.h.read())
+
+    def test_writes_hold_netcdf_lock(self):
+        out = _LockCheckingOut((6, 8))
+        self.sg_obj.map_tiles(lambda h: h, [self.sg_obj.h], tile_shape=(3, 4), out=out)
+        self.assertEqual(out.locked_writes, [True] * 4)
+        np.testing.assert_allclose(out.array, self.sg_obj.h.read())
+
+    def test_tiled_divergence_matches_grid(self):
+        u = self.sg_obj.u.read(0)
+        v = self.sg_obj.v.read(0) * np.linspace(1, 2, 8)
+        expected = self.sg_obj.divergence(u, v)
+        dy_u = self.sg_obj.get_metric('dy', 'edge1')
+        dx_v = self.sg_obj.get_metric('dx', 'edge2')
+        area = self.sg_obj.area
+        out = np.full(expected.shape, np.nan)
+        for tile in self.sg_obj.tiles((4, 3), halo=1):
+            edge1_index = (Ellipsis,) + tile.index('edge1')
+            edge2_index = (Ellipsis,) + tile.index('edge2')
+            result = divergence(u[edge1_index], v[edge2_index], dy_u[tile.index('edge1')],
+                                dx_v[tile.index('edge2')], area[tile.window],
+                                x_padding=tile.padding[1], y_padding=tile.padding[0])
+            out[(Ellipsis,) + tile.core] = result[(Ellipsis,) + tile.inner]
+        np.testing.assert_allclose(out, expected)
+
+
+class TestSGridParallelMap(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+
+    def test_worker_dataset_closed(self):
+        marker_path = self.sgrid_test_file.replace('.nc', '_closed.txt')
+        try:
+            with ProcessPoolExecutor(max_workers=1, initializer=_open_marked_dataset,
+                                     initargs=(self.sgrid_test_file, marker_path)) as executor:
+                is_open, registered = executor.submit(_worker_state).result()
+            self.assertTrue(is_open)
+            self.assertTrue(registered)
+            with open(marker_path) as marker_file:
+                self.assertEqual(marker_file.readlines(), ['closed\n'])
+        finally:
+            if os.path.exists(marker_path):
+                os.remove(marker_path)
+        self.assertIsNone(tiling._worker_dataset)
+
+    def test_matches_serial_map(self):
+        expected = self.sg_obj.map_tiles(_salinity_anomaly, ['temp', 'salt'], tile_shape=(3, 3), index=2)
+        result = self.sg_obj.parallel_map(_salinity_anomaly, ['temp', 'salt'], workers=2, 
+                                          tile_shape=(3, 3), index=2)
+        self.assertEqual(result.shape, (4, 6, 8))
+        np.testing.assert_allclose(result, expected)
+
+    def test_write_into_out(self):
+        out = np.zeros((3, 4, 6, 8))
+        self.sg_obj.parallel_map(_salinity_anomaly, ['temp', 'salt'], workers=2, tile_shape=(2, 8), out=out)
+        np.testing.assert_allclose(out, self.sg_obj.temp.read())
@@ -0,0 +1,93 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import unittest
+
+import numpy as np
+
+from ..sgrid import from_ncfile
+from ..transport import section_edges, staircase_path
+from .write_nc_test_files import roms_sgrid_vertical
+
+
+class TestStaircasePath(unittest.TestCase):
+
+    def test_unit_steps(self):
+        rows, columns = staircase_path([0, 2], [0, 4])
+        self.assertEqual(rows.size, 7)
+        np.testing.assert_equal(np.abs(np.diff(rows)) + np.abs(np.diff(columns)), 1)
+        self.assertEqual((rows[-1], columns[-1]), (2, 4))
+
+    def test_multiple_segments(self):
+        rows, columns = staircase_path([3, 3, 0], [0, 2, 2])
+        np.testing.assert_equal(rows, [3, 3, 3, 2, 1, 0])
+        np.testing.assert_equal(columns, [0, 1, 2, 2, 2, 2])
+
+
+class TestSectionEdges(unittest.TestCase):
+
+    def test_padding_both(self):
+        section = section_edges([1, 1, 2], [1, 2, 2])
+        np.testing.assert_equal(section.v_rows, [1])
+        np.testing.assert_equal(section.v_columns, [2])
+        np.testing.assert_equal(section.v_signs, [1])
+        np.testing.assert_equal(section.u_rows, [2])
+        np.testing.assert_equal(section.u_columns, [2])
+        np.testing.assert_equal(section.u_signs, [-1])
+
+    def test_padding_none(self):
+        section = section_edges([1, 1], [2, 1], x_padding='none')
+        np.testing.assert_equal(section.v_columns, [1])
+        np.testing.assert_equal(section.v_signs, [-1])
+
+    def test_not_neighbors(self):
+        self.assertRaises(ValueError, section_edges, [0, 1], [0, 1])
+
+
+class TestSGridSectionTransport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+        # along node row 3 from node column 1 to 5
+        self.x_section = self.sg_obj.section([-69.8, -69.4], [40.35, 40.35])
+
+    def _column_depth(self, time, rows, columns):
+        w_depths = self.sg_obj.depths(time, location='w')
+        column_depth = w_depths[-1] - w_depths[0]
+        return 0.5 * (column_depth[rows, columns] + column_depth[rows + 1, columns])
+
+    def test_section_nodes(self):
+        np.testing.assert_equal(self.x_section.node_rows, [3] * 5)
+        np.testing.assert_equal(self.x_section.node_columns, [1, 2, 3, 4, 5])
+        self.assertEqual(self.x_section.u_rows.size, 0)
+
+    def test_x_section(self):
+        transport = self.sg_obj.section_transport(self.x_section)
+        self.assertEqual(transport.shape, (3,))
+        columns = self.x_section.v_columns
+        dx_v = self.sg_obj.get_metric('dx', 'edge2')[3, columns]
+        expected = (0.25 * dx_v * self._column_depth(2, 3, columns)).sum()
+        self.assertAlmostEqual(transport[2] / expected, 1.0)
+
+    def test_layers_and_barotropic_agree(self):
+        by_layer = self.sg_obj.section_transport(self.x_section, times=[1], by_layer=True)
+        self.assertEqual(by_layer.shape, (1, 4))
+        barotropic = self.sg_obj.section_transport(self.x_section, times=[1], u_variable='ubar',
+                                                   v_variable='vbar')
+        self.assertAlmostEqual(by_layer.sum() / barotropic[0], 1.0)
+
+    def test_y_section_sign(self):
+        section = self.sg_obj.section([-69.75, -69.75], [40.05, 40.45])
+        np.testing.assert_equal(section.node_columns, 2)
+        transport = self.sg_obj.section_transport(section, zeta_variable=None)
+        self.assertTrue((transport < 0).all())  # eastward flow crosses to the right
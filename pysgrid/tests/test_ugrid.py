@@ -0,0 +1,79 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import netCDF4 as nc4
+import numpy as np
+
+from ..sgrid import from_ncfile
+from .write_nc_test_files import roms_sgrid_vertical
+
+
+class TestSaveAsUgrid(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+        cls.sg_obj = from_ncfile(cls.sgrid_test_file)
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.ugrid_file = os.path.join(cls.tmp_dir, 'test_ugrid.nc')
+        cls.sg_obj.save_as_ugrid(cls.ugrid_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_mesh_topology(self):
+        with nc4.Dataset(self.ugrid_file) as nc_dataset:
+            mesh = nc_dataset.variables['mesh']
+            self.assertEqual(mesh.cf_role, 'mesh_topology')
+            self.assertEqual(len(nc_dataset.dimensions['nmesh_node']), 5 * 7)
+            self.assertEqual(len(nc_dataset.dimensions['nmesh_face']), 4 * 6)
+            face_nodes = nc_dataset.variables[mesh.face_node_connectivity]
+            self.assertEqual(face_nodes.dtype, np.int32)
+            np.testing.assert_equal(face_nodes[:], self.sg_obj.faces)
+            node_lon = nc_dataset.variables['mesh_node_lon'][:]
+            face_lon = nc_dataset.variables['mesh_face_lon'][:]
+        # each face center lies between its nodes
+        np.testing.assert_allclose(node_lon[self.sg_obj.faces].mean(axis=-1), face_lon)
+
+    def test_face_variables(self):
+        with nc4.Dataset(self.ugrid_file) as nc_dataset:
+            temp = nc_dataset.variables['temp']
+            self.assertEqual(temp.dimensions, ('ocean_time', 's_rho', 'nmesh_face'))
+            self.assertEqual(temp.location, 'face')
+            np.testing.assert_equal(temp[1, 2], 12.0)
+            self.assertIn('ocean_time', nc_dataset.variables)
+            self.assertNotIn('lon_rho', nc_dataset.variables)
+
+    def test_edge_variables(self):
+        xi_edge_count = 5 * 6
+        with nc4.Dataset(self.ugrid_file) as nc_dataset:
+            ubar = nc_dataset.variables['ubar']
+            vbar = nc_dataset.variables['vbar']
+            self.assertEqual(ubar.location, 'edge')
+            self.assertTrue(ubar[0, :xi_edge_count].mask.all())
+            np.testing.assert_equal(ubar[0, xi_edge_count:], 0.5)
+            np.testing.assert_equal(vbar[0, :xi_edge_count], 0.25)
+            self.assertTrue(vbar[0, xi_edge_count:].mask.all())
+
+    def test_selected_variables(self):
+        ugrid_file = os.path.join(self.tmp_dir, 'test_ugrid_zeta.nc')
+        self.sg_obj.save_as_ugrid(ugrid_file, variables=['zeta', 'h'])
+        with nc4.Dataset(ugrid_file) as nc_dataset:
+            self.assertNotIn('temp', nc_dataset.variables)
+            np.testing.assert_allclose(nc_dataset.variables['zeta'][2], 0.2, rtol=1e-6)
+            self.assertEqual(nc_dataset.variables['h'].dimensions, ('nmesh_face',))
+
+    def test_no_nodes(self):
+        sg_obj = from_ncfile(self.sgrid_test_file)
+        sg_obj.nodes = None
+        ugrid_file = os.path.join(self.tmp_dir, 'test_ugrid_no_nodes.nc')
+        self.assertRaises(ValueError, sg_obj.save_as_ugrid, ugrid_file)
+        self.assertFalse(os.path.exists(ugrid_file))
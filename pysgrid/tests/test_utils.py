@@ -7,8 +7,10 @@ import unittest
 
 import numpy as np
 
-from ..utils import (calculate_bearing, calculate_angle_from_true_east, 
-                     check_element_equal, does_intersection_exist, pair_arrays)
+from ..sgrid import SGrid2D
+from ..utils import (GridPadding, build_padding_lookup, calculate_bearing, calculate_distance, 
+                     calculate_angle_from_true_east, check_element_equal, 
+                     does_intersection_exist, pair_arrays)
 
 
 class TestDoesIntersectionExist(unittest.TestCase):
@@ -27,6 +29,46 @@ class TestDoesIntersectionExist(unittest.TestCase):
         self.assertFalse(result)
 
 
+class TestBuildPaddingLookup(unittest.TestCase):
+    
+    def setUp(self):
+        self.face_padding = [GridPadding(mesh_topology_var=u'grid', face_dim=u'xi_rho', node_dim=u'xi_psi', padding=u'both'), 
+                             GridPadding(mesh_topology_var=u'grid', face_dim=u'eta_rho', node_dim=u'eta_psi', padding=u'both')
+                             ]
+        self.edge1_padding = [GridPadding(mesh_topology_var=u'grid', face_dim=u'eta_u', node_dim=u'eta_psi', padding=u'both')]
+        self.vertical_padding = [GridPadding(mesh_topology_var=u'grid', face_dim=u's_rho', node_dim=u's_w', padding=u'none')]
+        self.sgrid = SGrid2D(face_padding=self.face_padding,
+                             edge1_padding=self.edge1_padding,
+                             vertical_padding=self.vertical_padding,
+                             node_dimensions='xi_psi eta_psi'
+                             )
+        
+    def test_padding_lookup(self):
+        result = build_padding_lookup(self.sgrid)
+        self.assertEqual(result.node_dims, frozenset(['xi_psi', 'eta_psi']))
+        self.assertEqual(result.center_padding['xi_rho'], self.face_padding[0])
+        self.assertEqual(set(result.face_edge_padding.keys()), set(['xi_rho', 'eta_rho', 'eta_u']))
+        self.assertEqual(result.all_padding['s_rho'], self.vertical_padding[0])
+        self.assertNotIn('s_rho', result.face_edge_padding)
+        
+    def test_padding_lookup_is_read_only(self):
+        result = build_padding_lookup(self.sgrid)
+        with self.assertRaises(TypeError):
+            result.all_padding['xi_u'] = None
+            
+    def test_padding_lookup_is_shared(self):
+        first_lookup = self.sgrid.padding_lookup
+        second_lookup = self.sgrid.padding_lookup
+        self.assertIs(first_lookup, second_lookup)
+        
+    def test_padding_lookup_rebuilt_on_padding_change(self):
+        first_lookup = self.sgrid.padding_lookup
+        self.sgrid.edge2_padding = [GridPadding(mesh_topology_var=u'grid', face_dim=u'xi_v', node_dim=u'xi_psi', padding=u'both')]
+        second_lookup = self.sgrid.padding_lookup
+        self.assertIsNot(first_lookup, second_lookup)
+        self.assertIn('xi_v', second_lookup.edge_padding)
+
+
 class TestPairArrays(unittest.TestCase):
     
     def setUp(self):
@@ -76,6 +118,18 @@ class TestCalculateBearing(unittest.TestCase):
         np.testing.assert_almost_equal(result, expected, decimal=3)
         
         
+class TestCalculateDistance(unittest.TestCase):
+    
+    def test_one_degree_of_latitude(self):
+        result = calculate_distance(np.array([-70.0, 40.0]), np.array([-70.0, 41.0]))
+        np.testing.assert_almost_equal(result, 111194.9, decimal=1)
+        
+    def test_longitude_shrinks_with_latitude(self):
+        points = np.array([[[0.0, 0.0], [0.0, 60.0]], [[1.0, 0.0], [1.0, 60.0]]])
+        result = calculate_distance(points[0], points[1])
+        np.testing.assert_almost_equal(result[1] / result[0], 0.5, decimal=4)
+        
+        
 class TestCalculateAngleFromTrueEast(unittest.TestCase):
     
     def setUp(self):
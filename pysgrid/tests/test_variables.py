@@ -9,6 +9,7 @@ import unittest
 import netCDF4 as nc4
 import numpy as np
 
+from ..read_netcdf import NetCDFVariableAttributes
 from ..sgrid import SGrid2D
 from ..utils import GridPadding
 from ..variables import SGridVariable
@@ -44,6 +45,14 @@ class TestSGridVariableROMS(unittest.TestCase):
     def test_create_sgrid_variable_object(self):
         sgrid_var = SGridVariable.create_variable(self.test_var_1, self.sgrid)
         self.assertIsInstance(sgrid_var, SGridVariable)
+        self.assertFalse(hasattr(sgrid_var, '__dict__'))
+        
+    def test_create_from_variable_snapshot(self):
+        snapshot = NetCDFVariableAttributes.from_nc_variable(self.test_var_1)
+        sgrid_var = SGridVariable.create_variable(snapshot, self.sgrid)
+        expected = SGridVariable.create_variable(self.test_var_1, self.sgrid)
+        for attr in SGridVariable.__slots__:
+            self.assertEqual(getattr(sgrid_var, attr), getattr(expected, attr))
         
     def test_attributes_with_grid(self):
         sgrid_var = SGridVariable.create_variable(self.test_var_1, self.sgrid)
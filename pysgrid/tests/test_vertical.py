@@ -0,0 +1,165 @@
+'''
+Created on Oct 18, 2026
+
+'''
+import os
+import unittest
+
+import mock
+import numpy as np
+
+from ..sgrid import from_ncfile
+from ..vertical import (average_to_location, interpolate_to_z, s_coordinate_depths, s_coordinate_terms, 
+                        z_interpolation)
+from .write_nc_test_files import roms_sgrid_vertical
+
+
+class TestSCoordinateDepths(unittest.TestCase):
+
+    def setUp(self):
+        self.s = np.array([-0.5])
+        self.cs = np.array([-0.3])
+        self.h = np.array([[50.0]])
+        self.hc = 10.0
+
+    def test_vtransform_1(self):
+        depth_terms = s_coordinate_terms(self.s, self.cs, self.h, self.hc, vtransform=1)
+        # z0 = 10 * -0.5 + 40 * -0.3 = -17; z = z0 + zeta * (1 + z0 / h)
+        result = s_coordinate_depths(depth_terms, np.array([[1.0]]))
+        self.assertAlmostEqual(result[0, 0, 0], -17.0 + 1.0 * (1.0 - 17.0 / 50.0))
+
+    def test_vtransform_2(self):
+        depth_terms = s_coordinate_terms(self.s, self.cs, self.h, self.hc, vtransform=2)
+        # z0 = (-5 - 15) / 60 = -1/3; z = zeta + (zeta + h) * z0
+        result = s_coordinate_depths(depth_terms, np.array([[1.0]]))
+        self.assertAlmostEqual(result[0, 0, 0], -16.0)
+
+    def test_flat_surface(self):
+        depth_terms = s_coordinate_terms(self.s, self.cs, self.h, self.hc, vtransform=2)
+        result = s_coordinate_depths(depth_terms)
+        self.assertAlmostEqual(result[0, 0, 0], -50.0 / 3.0)
+
+    def test_unknown_vtransform(self):
+        self.assertRaises(ValueError, s_coordinate_terms, self.s, self.cs, self.h, self.hc, 3)
+
+    def test_average_to_location(self):
+        data = np.arange(12, dtype=np.float64).reshape(3, 4)
+        np.testing.assert_equal(average_to_location(data, 'u'), 0.5 * (data[:, 1:] + data[:, :-1]))
+        np.testing.assert_equal(average_to_location(data, 'v'), 0.5 * (data[1:, :] + data[:-1, :]))
+        self.assertIs(average_to_location(data, 'w'), data)
+
+
+class TestSGridDepths(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+
+    def test_rho_depths(self):
+        result = self.sg_obj.depths(time=1)
+        self.assertEqual(result.shape, (4, 6, 8))
+        h = self.sg_obj.h.read()
+        s_rho = self.sg_obj.s_rho.read()
+        cs_r = self.sg_obj.Cs_r.read()
+        zeta = self.sg_obj.zeta.read()[1]
+        z0 = (10.0 * s_rho[2] + h[3, 4] * cs_r[2]) / (10.0 + h[3, 4])
+        self.assertAlmostEqual(result[2, 3, 4], zeta[3, 4] + (zeta[3, 4] + h[3, 4]) * z0, places=5)
+
+    def test_w_depths_span_water_column(self):
+        result = self.sg_obj.depths(time=2, location='w')
+        self.assertEqual(result.shape, (5, 6, 8))
+        np.testing.assert_allclose(result[0], -self.sg_obj.h.read())
+        np.testing.assert_allclose(result[-1], 0.2, rtol=1e-6)
+
+    def test_u_v_depths(self):
+        self.assertEqual(self.sg_obj.depths(time=0, location='u').shape, (4, 6, 7))
+        self.assertEqual(self.sg_obj.depths(time=0, location='v').shape, (4, 5, 8))
+
+    def test_time_slice(self):
+        result = self.sg_obj.depths(time=slice(0, 3))
+        self.assertEqual(result.shape, (3, 4, 6, 8))
+        np.testing.assert_allclose(result[1], self.sg_obj.depths(time=1))
+
+    def test_iter_depths(self):
+        steps = list(self.sg_obj.iter_depths(location='u'))
+        self.assertEqual(len(steps), 3)
+        np.testing.assert_allclose(steps[2], self.sg_obj.depths(time=2, location='u'))
+
+    def test_terms_cached(self):
+        depth_terms = self.sg_obj.depth_terms('rho')
+        self.sg_obj.depths(time=0)
+        self.assertIs(self.sg_obj.depth_terms('rho'), depth_terms)
+
+    def test_unknown_location(self):
+        self.assertRaises(ValueError, self.sg_obj.depths, 0, 'psi')
+
+
+class TestZInterpolation(unittest.TestCase):
+
+    def setUp(self):
+        # two columns with levels at -30, -20, -10, 0 and -15, -10, -5, 0
+        self.depths = np.array([[-30.0, -15.0],
+                                [-20.0, -10.0],
+                                [-10.0, -5.0],
+                                [0.0, 0.0]])
+
+    def test_weights(self):
+        z_interp = z_interpolation(self.depths, [-25.0, -12.5, 0.0])
+        np.testing.assert_equal(z_interp.lower, [[0, 0], [1, 0], [2, 2]])
+        np.testing.assert_allclose(z_interp.weight, [[0.5, -2.0], [0.75, 0.5], [1.0, 1.0]])
+        np.testing.assert_equal(z_interp.valid, [[True, False], [True, True], [True, True]])
+
+    def test_interpolate(self):
+        data = np.array([[1.0, 10.0], [2.0, 20.0], [3.0, 30.0], [4.0, 40.0]])
+        z_interp = z_interpolation(self.depths, [-25.0, -12.5])
+        result = interpolate_to_z(data, z_interp)
+        self.assertAlmostEqual(result[0, 0], 1.5)
+        self.assertIs(result[0, 1], np.ma.masked)
+        self.assertAlmostEqual(result[1, 0], 2.75)
+        self.assertAlmostEqual(result[1, 1], 15.0)
+
+
+class TestSGridInterpToZ(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sgrid_test_file = roms_sgrid_vertical()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.sgrid_test_file)
+
+    def setUp(self):
+        self.sg_obj = from_ncfile(self.sgrid_test_file)
+        self.z_levels = np.array([-100.0, -15.0, -5.0])
+
+    def test_interp_temp(self):
+        result = self.sg_obj.interp_to_z('temp', self.z_levels, time=1)
+        self.assertEqual(result.shape, (3, 6, 8))
+        self.assertTrue(result[0].mask.all())  # deeper than the bathymetry
+        depths = self.sg_obj.depths(time=1)[:, 5, 7]
+        expected = np.interp(-15.0, depths, 10.0 + np.arange(4))
+        self.assertAlmostEqual(result[1, 5, 7], expected, places=5)
+
+    def test_edge_locations(self):
+        self.assertEqual(self.sg_obj.interp_to_z(self.sg_obj.u, self.z_levels, time=0).shape, (3, 6, 7))
+        self.assertEqual(self.sg_obj.interp_to_z('v', self.z_levels, time=0).shape, (3, 5, 8))
+
+    def test_weights_shared_across_variables(self):
+        self.sg_obj.interp_to_z('temp', self.z_levels, time=2)
+        with mock.patch('pysgrid.sgrid.z_interpolation') as mock_z_interpolation:
+            self.sg_obj.interp_to_z('salt', self.z_levels, time=2)
+        self.assertFalse(mock_z_interpolation.called)
+
+    def test_single_time_step(self):
+        z_interp = self.sg_obj.get_z_interpolation(self.z_levels, np.int64(1))
+        self.assertIs(self.sg_obj.get_z_interpolation(self.z_levels, 1), z_interp)
+        self.assertRaises(TypeError, self.sg_obj.get_z_interpolation, self.z_levels, slice(0, 2))
+        self.assertRaises(TypeError, self.sg_obj.interp_to_z, 'temp', self.z_levels, time=slice(0, 2))
@@ -491,4 +491,176 @@ def non_compliant_sgrid(target_dir=TEST_FILES, nc_filename='test_noncompliant_sg
         lon_u[:] = np.random.random(size=(4, 3))
         lat_v[:] = np.random.random(size=(3, 4))
         lon_v[:] = np.random.random(size=(3, 4))
-    return file_name
\ No newline at end of file
+    return file_name
+
+def roms_sgrid_vertical(target_dir=TEST_FILES, nc_filename='test_sgrid_roms_vertical.nc'):
+    """
+    Create a netCDF file that is structurally similar to
+    ROMS output with the variables needed for depth
+    calculations, land masks, and grid metrics. The grid
+    is a regular 0.1 degree lon/lat grid so results can
+    be checked by hand.
+    
+    """
+    file_name = os.path.join(target_dir, nc_filename)
+    eta_rho, xi_rho = 6, 8
+    s_rho = 4
+    times = 3
+    with nc4.Dataset(file_name, 'w') as rg:
+        rg.createDimension('ocean_time', times)
+        rg.createDimension('s_rho', s_rho)
+        rg.createDimension('s_w', s_rho + 1)
+        rg.createDimension('eta_rho', eta_rho)
+        rg.createDimension('xi_rho', xi_rho)
+        rg.createDimension('eta_psi', eta_rho - 1)
+        rg.createDimension('xi_psi', xi_rho - 1)
+        rg.createDimension('eta_u', eta_rho)
+        rg.createDimension('xi_u', xi_rho - 1)
+        rg.createDimension('eta_v', eta_rho - 1)
+        rg.createDimension('xi_v', xi_rho)
+        grid = rg.createVariable('grid', 'i2')
+        grid.cf_role = 'grid_topology'
+        grid.topology_dimension = 2
+        grid.node_dimensions = 'xi_psi eta_psi'
+        grid.face_dimensions = 'xi_rho: xi_psi (padding: both) eta_rho: eta_psi (padding: both)'
+        grid.edge1_dimensions = 'xi_u: xi_psi eta_u: eta_psi (padding: both)'
+        grid.edge2_dimensions = 'xi_v: xi_psi (padding: both) eta_v: eta_psi'
+        grid.node_coordinates = 'lon_psi lat_psi'
+        grid.face_coordinates = 'lon_rho lat_rho'
+        grid.edge1_coordinates = 'lon_u lat_u'
+        grid.edge2_coordinates = 'lon_v lat_v'
+        grid.vertical_dimensions = 's_rho: s_w (padding: none)'
+        ocean_time = rg.createVariable('ocean_time', 'f8', ('ocean_time',))
+        s_rho_var = rg.createVariable('s_rho', 'f8', ('s_rho',))
+        s_w_var = rg.createVariable('s_w', 'f8', ('s_w',))
+        cs_r = rg.createVariable('Cs_r', 'f8', ('s_rho',))
+        cs_w = rg.createVariable('Cs_w', 'f8', ('s_w',))
+        hc = rg.createVariable('hc', 'f8')
+        vtransform = rg.createVariable('Vtransform', 'i4')
+        h = rg.createVariable('h', 'f8', ('eta_rho', 'xi_rho'))
+        pm = rg.createVariable('pm', 'f8', ('eta_rho', 'xi_rho'))
+        pn = rg.createVariable('pn', 'f8', ('eta_rho', 'xi_rho'))
+        mask_rho = rg.createVariable('mask_rho', 'f8', ('eta_rho', 'xi_rho'))
+        mask_u = rg.createVariable('mask_u', 'f8', ('eta_u', 'xi_u'))
+        mask_v = rg.createVariable('mask_v', 'f8', ('eta_v', 'xi_v'))
+        mask_psi = rg.createVariable('mask_psi', 'f8', ('eta_psi', 'xi_psi'))
+        coordinates = {}
+        for location, (eta_dim, xi_dim) in (('rho', ('eta_rho', 'xi_rho')),
+                                            ('psi', ('eta_psi', 'xi_psi')),
+                                            ('u', ('eta_u', 'xi_u')),
+                                            ('v', ('eta_v', 'xi_v'))):
+            lon = rg.createVariable('lon_{0}'.format(location), 'f8', (eta_dim, xi_dim))
+            lat = rg.createVariable('lat_{0}'.format(location), 'f8', (eta_dim, xi_dim))
+            lon.standard_name = 'longitude'
+            lat.standard_name = 'latitude'
+            coordinates[location] = (lon, lat)
+        zeta = rg.createVariable('zeta', 'f4', ('ocean_time', 'eta_rho', 'xi_rho'))
+        zeta.location = 'face'
+        zeta.coordinates = 'lon_rho lat_rho'
+        temp = rg.createVariable('temp', 'f4', ('ocean_time', 's_rho', 'eta_rho', 'xi_rho'))
+        temp.grid = 'grid'
+        temp.location = 'face'
+        salt = rg.createVariable('salt', 'f4', ('ocean_time', 's_rho', 'eta_rho', 'xi_rho'))
+        salt.grid = 'grid'
+        salt.location = 'face'
+        u = rg.createVariable('u', 'f4', ('ocean_time', 's_rho', 'eta_u', 'xi_u'))
+        u.grid = 'grid'
+        u.location = 'edge1'
+        u.standard_name = 'sea_water_x_velocity'
+        v = rg.createVariable('v', 'f4', ('ocean_time', 's_rho', 'eta_v', 'xi_v'))
+        v.grid = 'grid'
+        v.location = 'edge2'
+        v.standard_name = 'sea_water_y_velocity'
+        ubar = rg.createVariable('ubar', 'f4', ('ocean_time', 'eta_u', 'xi_u'))
+        ubar.grid = 'grid'
+        ubar.location = 'edge1'
+        vbar = rg.createVariable('vbar', 'f4', ('ocean_time', 'eta_v', 'xi_v'))
+        vbar.grid = 'grid'
+        vbar.location = 'edge2'
+        # regular 0.1 degree grid; psi points sit between rho points
+        xi_index = np.arange(xi_rho, dtype=np.float64)
+        eta_index = np.arange(eta_rho, dtype=np.float64)
+        positions = {'rho': (xi_index, eta_index),
+                     'psi': (xi_index[:-1] + 0.5, eta_index[:-1] + 0.5),
+                     'u': (xi_index[:-1] + 0.5, eta_index),
+                     'v': (xi_index, eta_index[:-1] + 0.5)
+                     }
+        for location, (xi_pos, eta_pos) in positions.items():
+            lon, lat = coordinates[location]
+            lon_2d, lat_2d = np.meshgrid(-70.0 + 0.1 * xi_pos, 40.0 + 0.1 * eta_pos)
+            lon[:] = lon_2d
+            lat[:] = lat_2d
+        ocean_time[:] = np.arange(times) * 3600.0
+        s_w_values = np.linspace(-1, 0, s_rho + 1)
+        s_w_var[:] = s_w_values
+        s_rho_var[:] = 0.5 * (s_w_values[1:] + s_w_values[:-1])
+        cs_w[:] = s_w_values ** 3
+        cs_r[:] = (0.5 * (s_w_values[1:] + s_w_values[:-1])) ** 3
+        hc[:] = 10.0
+        vtransform[:] = 2
+        h[:] = 20.0 + 5.0 * np.arange(eta_rho * xi_rho).reshape(eta_rho, xi_rho) / 7.0
+        cos_lat = np.cos(np.deg2rad(coordinates['rho'][1][:]))
+        pm[:] = 1.0 / (0.1 * np.pi / 180.0 * 6371000.0 * cos_lat)
+        pn[:] = np.ones((eta_rho, xi_rho)) / (0.1 * np.pi / 180.0 * 6371000.0)
+        land = np.zeros((eta_rho, xi_rho), dtype=bool)
+        land[:2, :3] = True  # a block of land in one corner
+        mask_rho[:] = ~land
+        mask_u[:] = ~(land[:, 1:] | land[:, :-1])
+        mask_v[:] = ~(land[1:, :] | land[:-1, :])
+        mask_psi[:] = ~(land[1:, 1:] | land[1:, :-1] | land[:-1, 1:] | land[:-1, :-1])
+        zeta[:] = 0.1 * np.arange(times)[:, np.newaxis, np.newaxis] * np.ones((times, eta_rho, xi_rho))
+        temp[:] = 10.0 + np.arange(s_rho)[np.newaxis, :, np.newaxis, np.newaxis] * np.ones((times, s_rho, eta_rho, xi_rho))
+        salt[:] = 35.0 * np.ones((times, s_rho, eta_rho, xi_rho))
+        u[:] = 0.5 * np.ones((times, s_rho, eta_rho, xi_rho - 1))
+        v[:] = 0.25 * np.ones((times, s_rho, eta_rho - 1, xi_rho))
+        ubar[:] = 0.5 * np.ones((times, eta_rho, xi_rho - 1))
+        vbar[:] = 0.25 * np.ones((times, eta_rho - 1, xi_rho))
+    return file_name
+
+
+def sgrid_3d_node_coordinates(target_dir=TEST_FILES, nc_filename='test_sgrid_3d_nodes.nc'):
+    """
+    Create a netCDF file for a 3-D grid with
+    node coordinates (lon, lat, z) defined on
+    the staggered dimensions.
+    
+    """
+    file_name = os.path.join(target_dir, nc_filename)
+    with nc4.Dataset(file_name, 'w') as sg:
+        sg.createDimension('x_center', 4)
+        sg.createDimension('y_center', 3)
+        sg.createDimension('z_center', 2)
+        sg.createDimension('x_node', 5)
+        sg.createDimension('y_node', 4)
+        sg.createDimension('z_node', 3)
+        center_dims = ('z_center', 'y_center', 'x_center')
+        node_dims = ('z_node', 'y_node', 'x_node')
+        lon_center = sg.createVariable('lon_center', 'f8', center_dims)
+        lat_center = sg.createVariable('lat_center', 'f8', center_dims)
+        z_center = sg.createVariable('z_center', 'f8', center_dims)
+        lon_node = sg.createVariable('lon_node', 'f8', node_dims)
+        lat_node = sg.createVariable('lat_node', 'f8', node_dims)
+        z_node = sg.createVariable('z_node', 'f8', node_dims)
+        temp = sg.createVariable('temp', 'f4', center_dims)
+        temp.grid = 'grid'
+        temp.location = 'volume'
+        grid = sg.createVariable('grid', 'i2')
+        grid.cf_role = 'grid_topology'
+        grid.topology_dimension = 3
+        grid.node_dimensions = 'x_node y_node z_node'
+        grid.volume_dimensions = ('x_center: x_node (padding: none) '
+                                  'y_center: y_node (padding: none) '
+                                  'z_center: z_node (padding: none)')
+        grid.node_coordinates = 'lon_node lat_node z_node'
+        grid.volume_coordinates = 'lon_center lat_center z_center'
+        z_index, y_index, x_index = np.meshgrid(np.arange(3), np.arange(4), np.arange(5), indexing='ij')
+        lon_node[:] = -70.0 + 0.1 * x_index
+        lat_node[:] = 40.0 + 0.1 * y_index
+        z_node[:] = -10.0 * z_index
+        lon_center[:] = 0.25 * (lon_node[:-1, :-1, :-1] + lon_node[:-1, :-1, 1:] + 
+                                lon_node[:-1, 1:, :-1] + lon_node[:-1, 1:, 1:])
+        lat_center[:] = 0.25 * (lat_node[:-1, :-1, :-1] + lat_node[:-1, :-1, 1:] + 
+                                lat_node[:-1, 1:, :-1] + lat_node[:-1, 1:, 1:])
+        z_center[:] = 0.5 * (z_node[:-1, :-1, :-1] + z_node[1:, :-1, :-1])
+        temp[:] = np.random.random(size=(2, 3, 4))
+    return file_name
@@ -0,0 +1,199 @@
+'''
+Created on Oct 18, 2026
+
+Split the face space of a grid into tiles with halos
+so that large fields can be processed one hyperslab
+at a time.
+
+Each tile knows the slices of its window (the tile
+plus its halo) at every grid location, and the local
+padding type of the window, so the staggered
+operators can be run on a tile as if it were a grid
+of its own.
+
+'''
+import atexit
+import os
+from multiprocessing import util
+
+import netCDF4 as nc4
+
+from .operators import EDGE_FACE_OFFSETS
+
+
+# change in the number of edges relative to faces, by face padding type
+EDGE_COUNT_CHANGES = {'both': -1,
+                      'none': 1,
+                      'low': 0,
+                      'high': 0
+                      }
+# face padding type by (edge to face offset, edge count change)
+PADDING_BY_EDGE_LAYOUT = dict(((EDGE_FACE_OFFSETS[padding], EDGE_COUNT_CHANGES[padding]), padding)
+                              for padding in EDGE_COUNT_CHANGES)
+
+# the dataset opened by each worker process of a parallel map
+_worker_dataset = None
+# id of the process that registered the handlers closing it; forked
+# workers inherit the parent's value but not its finalizers
+_exit_handlers_pid = None
+
+
+class Tile(object):
+    """
+    A rectangular block of faces and the halo around it.
+
+    """
+    def __init__(self, core, window, inner, edge_slices, padding):
+        """
+        :param tuple core: (row, column) slices of the faces in the tile
+        :param tuple window: (row, column) slices of the faces in the tile and its halo
+        :param tuple inner: slices of the core within the window
+        :param tuple edge_slices: (row, column) slices of the edges bounding the window faces
+        :param tuple padding: local (row, column) padding types of the window
+        """
+        self.core = core
+        self.window = window
+        self.inner = inner
+        self.edge_slices = edge_slices
+        self.padding = padding
+
+    def __repr__(self):
+        return 'Tile(core={0!r}, window={1!r})'.format(self.core, self.window)
+
+    def index(self, location='face'):
+        """
+        Get the slices of the tile window for data
+        at a grid location.
+
+        :param str location: 'face', 'edge1', 'edge2', or 'node'
+        :return: slices for the last two dimensions
+        :rtype: tuple
+
+        """
+        row_window, column_window = self.window
+        row_edges, column_edges = self.edge_slices
+        if location == 'face':
+            return self.window
+        elif location == 'edge1':
+            return row_window, column_edges
+        elif location == 'edge2':
+            return row_edges, column_window
+        elif location == 'node':
+            return self.edge_slices
+        else:
+            raise ValueError('Unknown grid location: {0}'.format(location))
+
+
+def _edge_span(face_span, face_count, padding):
+    # edges bounding a range of faces, and the local padding type of the range
+    edge_face_offset = EDGE_FACE_OFFSETS[padding]
+    edge_count = face_count + EDGE_COUNT_CHANGES[padding]
+    start = face_span.start - edge_face_offset
+    stop = face_span.stop - edge_face_offset + 1
+    if start < 0:
+        local_offset = edge_face_offset
+        start = 0
+    else:
+        local_offset = 0
+    stop = min(stop, edge_count)
+    local_padding = PADDING_BY_EDGE_LAYOUT[(local_offset, (stop - start) - (face_span.stop - face_span.start))]
+    return slice(start, stop), local_padding
+
+
+def iter_tiles(face_shape, tile_shape, halo=1, padding=('both', 'both')):
+    """
+    Split the faces of a grid into tiles.
+
+    :param tuple face_shape: shape of the faces
+    :param tuple tile_shape: number of (row, column) faces in each tile
+    :param int halo: number of faces around each tile to include in its window
+    :param tuple padding: padding types of the (row, column) face dimensions
+    :return: generator of tiles in row-major order
+    :rtype: generator
+
+    """
+    if min(tile_shape) < 1:
+        raise ValueError('Tiles must have at least one face along each axis')
+    if halo < 0:
+        raise ValueError('The halo cannot be negative')
+    for padding_type in padding:
+        if padding_type not in EDGE_COUNT_CHANGES:
+            raise ValueError('Unknown padding type: {0}'.format(padding_type))
+    row_count, column_count = face_shape
+    tile_rows, tile_columns = tile_shape
+    for row_start in range(0, row_count, tile_rows):
+        for column_start in range(0, column_count, tile_columns):
+            core = (slice(row_start, min(row_start + tile_rows, row_count)),
+                    slice(column_start, min(column_start + tile_columns, column_count)))
+            window = tuple(slice(max(core_span.start - halo, 0), min(core_span.stop + halo, count))
+                           for core_span, count in zip(core, face_shape))
+            inner = tuple(slice(core_span.start - window_span.start, core_span.stop - window_span.start)
+                          for core_span, window_span in zip(core, window))
+            edge_spans = [_edge_span(window_span, count, padding_type)
+                          for window_span, count, padding_type in zip(window, face_shape, padding)]
+            yield Tile(core,
+                       window,
+                       inner,
+                       tuple(edge_span for edge_span, _ in edge_spans),
+                       tuple(local_padding for _, local_padding in edge_spans)
+                       )
+
+
+def open_worker_dataset(dataset_path):
+    """
+    Open the dataset a worker process reads its tiles
+    from. Used as the initializer of the process pool,
+    so each worker opens the file once and the grid
+    itself is never sent to the workers. The dataset is
+    closed when the worker exits.
+
+    :param str dataset_path: file or URL to open
+
+    """
+    global _worker_dataset
+    close_worker_dataset()
+    _worker_dataset = nc4.Dataset(dataset_path)
+    _register_exit_handlers()
+
+
+def _register_exit_handlers():
+    global _exit_handlers_pid
+    if _exit_handlers_pid == os.getpid():
+        return
+    # forked workers leave through os._exit, which skips atexit; the
+    # only hook multiprocessing runs on the way out is its finalizers
+    util.Finalize(None, close_worker_dataset, exitpriority=0)
+    atexit.register(close_worker_dataset)
+    _exit_handlers_pid = os.getpid()
+
+
+def close_worker_dataset():
+    """
+    Close the dataset opened by open_worker_dataset, if
+    it is open.
+
+    """
+    global _worker_dataset
+    if _worker_dataset is not None:
+        _worker_dataset.close()
+        _worker_dataset = None
+
+
+def process_tile(func, variable_names, keys, inner):
+    """
+    Read one tile of each variable from the worker's
+    dataset, apply func, and trim the halo from the
+    result.
+
+    :param func: function to apply; must be picklable
+    :param list variable_names: names of the variables to read
+    :param list keys: index of the tile window for each variable
+    :param tuple inner: slices of the tile core within the window
+    :return: the result on the tile core
+    :rtype: numpy.array
+
+    """
+    tile_data = [_worker_dataset.variables[variable_name][key]
+                 for variable_name, key in zip(variable_names, keys)]
+    result = func(*tile_data)
+    return result[(Ellipsis,) + tuple(inner)]
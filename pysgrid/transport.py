@@ -0,0 +1,145 @@
+'''
+Created on Oct 18, 2026
+
+Volume transport through sections that follow a
+staircase path of grid nodes.
+
+Each step of the path between neighboring nodes runs
+along one cell edge: a step along xi crosses an edge2
+(v) point and a step along eta crosses an edge1 (u)
+point. The transport through the section is the sum
+of the normal velocity times the edge length and the
+layer thickness over those points. It is positive to
+the left of the direction of travel along the path.
+
+'''
+import collections
+
+import numpy as np
+
+from .operators import EDGE_FACE_OFFSETS
+
+
+Section = collections.namedtuple('Section', ('node_rows',
+                                             'node_columns',
+                                             'u_rows',
+                                             'u_columns',
+                                             'u_signs',  # sign of the flux to the left of the path
+                                             'v_rows',
+                                             'v_columns',
+                                             'v_signs'
+                                             ))
+
+
+def staircase_path(node_rows, node_columns):
+    """
+    Join vertices given as node indices with unit
+    steps along eta or xi, staying as close as possible
+    to the straight line between each pair of vertices.
+
+    :param node_rows: eta indices of the vertices
+    :type node_rows: numpy.array
+    :param node_columns: xi indices of the vertices
+    :type node_columns: numpy.array
+    :return: eta and xi indices of every node on the path
+    :rtype: tuple
+
+    """
+    vertices = list(zip(np.asarray(node_rows, dtype=np.intp).tolist(),
+                        np.asarray(node_columns, dtype=np.intp).tolist()))
+    if not vertices:
+        raise ValueError('A section needs at least one vertex')
+    path = [vertices[0]]
+    for (start_row, start_column), (end_row, end_column) in zip(vertices[:-1], vertices[1:]):
+        row_steps = abs(end_row - start_row)
+        column_steps = abs(end_column - start_column)
+        row_direction = 1 if end_row > start_row else -1
+        column_direction = 1 if end_column > start_column else -1
+        rows_done = columns_done = 0
+        while rows_done < row_steps or columns_done < column_steps:
+            # step along the axis that is furthest behind the straight line
+            if rows_done == row_steps or (columns_done < column_steps and
+                                          (2 * columns_done + 1) * row_steps <= (2 * rows_done + 1) * column_steps):
+                columns_done += 1
+            else:
+                rows_done += 1
+            path.append((start_row + row_direction * rows_done, start_column + column_direction * columns_done))
+    path = np.array(path, dtype=np.intp)
+    return path[:, 0], path[:, 1]
+
+
+def section_edges(node_rows, node_columns, x_padding='both', y_padding='both'):
+    """
+    Find the edge points crossed by a staircase path
+    of nodes.
+
+    :param node_rows: eta indices of consecutive nodes on the path
+    :type node_rows: numpy.array
+    :param node_columns: xi indices of consecutive nodes on the path
+    :type node_columns: numpy.array
+    :param str x_padding: padding type of the x face dimension
+    :param str y_padding: padding type of the y face dimension
+    :return: the section
+    :rtype: Section
+
+    """
+    node_rows = np.asarray(node_rows, dtype=np.intp)
+    node_columns = np.asarray(node_columns, dtype=np.intp)
+    row_steps = np.diff(node_rows)
+    column_steps = np.diff(node_columns)
+    if np.any(np.abs(row_steps) + np.abs(column_steps) != 1):
+        raise ValueError('Consecutive nodes of a section must be neighbors along eta or xi')
+    # the face between nodes i and i + 1 is face i + offset
+    x_offset = EDGE_FACE_OFFSETS[x_padding]
+    y_offset = EDGE_FACE_OFFSETS[y_padding]
+    x_steps = column_steps != 0
+    y_steps = ~x_steps
+    # moving along +xi, the left is +eta; moving along +eta, the left is -xi
+    return Section(node_rows,
+                   node_columns,
+                   np.minimum(node_rows[:-1], node_rows[1:])[y_steps] + y_offset,
+                   node_columns[:-1][y_steps],
+                   -row_steps[y_steps],
+                   node_rows[:-1][x_steps],
+                   np.minimum(node_columns[:-1], node_columns[1:])[x_steps] + x_offset,
+                   column_steps[x_steps]
+                   )
+
+
+def section_box(rows, columns):
+    """
+    Get the bounding box of section points and their
+    indices within it, so that only the box is read.
+
+    :param rows: row indices of the points
+    :type rows: numpy.array
+    :param columns: column indices of the points
+    :type columns: numpy.array
+    :return: the (row, column) slices of the box and the rows and columns within it
+    :rtype: tuple
+
+    """
+    if rows.size == 0:
+        return (slice(0, 0), slice(0, 0)), rows, columns
+    box = (slice(rows.min(), rows.max() + 1), slice(columns.min(), columns.max() + 1))
+    return box, rows - box[0].start, columns - box[1].start
+
+
+def edge_transport(velocity, widths, thicknesses, signs):
+    """
+    Sum the flux through edge points of a section.
+
+    :param velocity: normal velocities at the points with shape (..., points)
+    :type velocity: numpy.array
+    :param widths: edge lengths at the points with shape (points,)
+    :type widths: numpy.array
+    :param thicknesses: layer or water column thicknesses with shape (..., points)
+    :type thicknesses: numpy.array
+    :param signs: sign of the flux to the left of the path at each point
+    :type signs: numpy.array
+    :return: transport with the leading shape of velocity
+    :rtype: numpy.array
+
+    """
+    velocity = np.ma.filled(np.ma.asarray(velocity, dtype=np.float64), 0)  # no flow through land
+    return (velocity * thicknesses * (widths * signs)).sum(axis=-1)
@@ -4,10 +4,14 @@ Created on Mar 23, 2015
 @author: ayan
 '''
 from collections import namedtuple
+from types import MappingProxyType
 
 import numpy as np
 
 
+# mean radius of the earth in meters
+EARTH_RADIUS = 6371000.0
+
 GridPadding = namedtuple('GridPadding', ['mesh_topology_var',  # the variable containing the padding information
                                          'face_dim',  # the topology attribute
                                          'node_dim',  # node dimension within the topology attribute
@@ -16,6 +20,24 @@ GridPadding = namedtuple('GridPadding', ['mesh_topology_var',  # the variable co
                          )
 
 
+GridPaddingLookup = namedtuple('GridPaddingLookup', ['node_dims',  # frozenset of the grid's node dimensions
+                                                     'center_padding',  # face (2D) or volume (3D) padding by dimension
+                                                     'face_padding',  # face padding by dimension
+                                                     'edge_padding',  # edge padding by dimension
+                                                     'face_edge_padding',  # face and edge padding by dimension
+                                                     'all_padding'  # every padding known to the grid by dimension
+                                                     ]
+                               )
+
+
+DimensionAttributes = namedtuple('DimensionAttributes', ['center_slicing',  # slices to trim padding before centering
+                                                         'center_axis',  # axis to average over to cell centers
+                                                         'node_axis',  # axis to average over to cell nodes
+                                                         'location'  # location inferred from the dimensions
+                                                         ]
+                                 )
+
+
 def pair_arrays(x_array, y_array):
     """
     Given two arrays to equal dimensions,
@@ -68,6 +90,58 @@ def does_intersection_exist(a, b):
     return intersect_exists
 
 
+def map_padding_by_dimension(padding):
+    """
+    Build a read-only mapping of face dimension
+    names to their padding information. If a
+    dimension appears more than once, the first
+    occurrence wins.
+    
+    :param padding: GridPadding named tuples
+    :type padding: list or tuple
+    :return: mapping of face dimension to GridPadding
+    :rtype: types.MappingProxyType
+    
+    """
+    padding_map = {}
+    if padding is not None:
+        for padding_info in padding:
+            padding_map.setdefault(padding_info.face_dim, padding_info)
+    return MappingProxyType(padding_map)
+
+
+def build_padding_lookup(sgrid_obj):
+    """
+    Precompute the dimension to padding mappings
+    and node dimension set used when inferring
+    variable slicing, averaging axes, and locations.
+    
+    :param sgrid_obj: an SGrid object
+    :type sgrid_obj: sgrid.SGrid2D or sgrid.SGrid3D
+    :return: padding lookups for the grid
+    :rtype: GridPaddingLookup
+    
+    """
+    if sgrid_obj.node_dimensions is not None:
+        node_dims = frozenset(sgrid_obj.node_dimensions.split())
+    else:
+        node_dims = frozenset()
+    try:
+        center_padding = sgrid_obj.face_padding  # try 2D sgrid
+    except AttributeError:
+        center_padding = sgrid_obj.volume_padding  # if not 2D, try 3D sgrid
+    face_padding = sgrid_obj.get_all_face_padding()
+    edge_padding = sgrid_obj.get_all_edge_padding()
+    padding_lookup = GridPaddingLookup(node_dims=node_dims,
+                                       center_padding=map_padding_by_dimension(center_padding),
+                                       face_padding=map_padding_by_dimension(face_padding),
+                                       edge_padding=map_padding_by_dimension(edge_padding),
+                                       face_edge_padding=map_padding_by_dimension(face_padding + edge_padding),
+                                       all_padding=map_padding_by_dimension(sgrid_obj.all_padding())
+                                       )
+    return padding_lookup
+
+
 def determine_variable_slicing(sgrid_obj, nc_variable, method='center'):
     """
     Figure out how to slice a variable. This function
@@ -85,25 +159,18 @@ def determine_variable_slicing(sgrid_obj, nc_variable, method='center'):
     :rtype: tuple
     
     """
-    grid_variables = sgrid_obj.grid_variables
-    if grid_variables is None:
-        grid_variables = []
+    padding_lookup = sgrid_obj.padding_lookup
     var_dims = nc_variable.dimensions
-    node_dims = tuple(sgrid_obj.node_dimensions.split(' '))
-    separate_edge_dim_exists = does_intersection_exist(var_dims, node_dims)
+    separate_edge_dim_exists = not padding_lookup.node_dims.isdisjoint(var_dims)
     slice_indices = tuple()
     if separate_edge_dim_exists:
-        try:
-            padding = sgrid_obj.face_padding  # try 2D sgrid
-        except AttributeError:
-            padding = sgrid_obj.volume_padding  # if not 2D, try 3D sgrid
+        padding = padding_lookup.center_padding
     else:
-        padding = sgrid_obj.all_padding()
+        padding = padding_lookup.all_padding
     if method == 'center':
         for var_dim in var_dims:
-            try:
-                padding_info = next((info for info in padding if info.face_dim == var_dim))
-            except StopIteration:
+            padding_info = padding.get(var_dim)
+            if padding_info is None:
                 slice_index = np.s_[:]
                 slice_indices += (slice_index,)
             else:
@@ -124,25 +191,17 @@ def infer_avg_axes(sgrid_obj, nc_var_obj):
     well for 2D. Not so sure about 3D.
     
     """
+    padding_lookup = sgrid_obj.padding_lookup
     var_dims = nc_var_obj.dimensions
-    node_dimensions = tuple(sgrid_obj.node_dimensions.split(' '))
-    separate_edge_dim_exists = does_intersection_exist(node_dimensions, var_dims)
+    separate_edge_dim_exists = not padding_lookup.node_dims.isdisjoint(var_dims)
     if separate_edge_dim_exists:
-        padding = sgrid_obj.get_all_face_padding()
+        padding = padding_lookup.face_padding
     else:
-        padding = sgrid_obj.get_all_face_padding() + sgrid_obj.get_all_edge_padding()
+        padding = padding_lookup.face_edge_padding
     # define center averaging axis for a variable
-    for var_dim in var_dims:
-        try:
-            padding_info = next((info for info in padding if info.face_dim == var_dim))
-        except StopIteration:
-            padding_info = None
-            avg_dim = None
-            continue
-        else:
-            avg_dim = var_dim  # name of the dimension we're averaging over
-            break  # exit the loop once it's found
-    if padding_info is not None and avg_dim is not None:
+    # (name of the first dimension we're averaging over)
+    avg_dim = next((var_dim for var_dim in var_dims if var_dim in padding), None)
+    if avg_dim is not None:
         var_position = var_dims.index(avg_dim)
         center_avg_axis = len(var_dims) - var_position - 1
     else:
@@ -158,18 +217,17 @@ def infer_avg_axes(sgrid_obj, nc_var_obj):
 
 
 def infer_variable_location(sgrid, variable):
-    node_dims_val = sgrid.node_dimensions.split(' ')
-    node_dims = tuple(node_dims_val)
-    face_dims = tuple([f.face_dim for f in sgrid.get_all_face_padding()])
-    try:
-        edge_dims = tuple([e.face_dim for e in sgrid.get_all_edge_padding()])
-    except TypeError:
-        edge_dims = []
+    padding_lookup = sgrid.padding_lookup
+    node_dims = padding_lookup.node_dims
+    face_dims = padding_lookup.face_padding
+    edge_dims = padding_lookup.edge_padding
     var_dims = variable.dimensions
-    if does_intersection_exist(var_dims, face_dims) and not does_intersection_exist(var_dims, node_dims):
+    on_face_dims = any(var_dim in face_dims for var_dim in var_dims)
+    on_node_dims = any(var_dim in node_dims for var_dim in var_dims)
+    if on_face_dims and not on_node_dims:
         inferred_location = 'face'
-    elif ((does_intersection_exist(var_dims, face_dims) and does_intersection_exist(var_dims, node_dims)) or
-          (does_intersection_exist(var_dims, edge_dims))
+    elif ((on_face_dims and on_node_dims) or
+          any(var_dim in edge_dims for var_dim in var_dims)
           ):
         inferred_location = 'edge'
     else:
@@ -177,6 +235,32 @@ def infer_variable_location(sgrid, variable):
     return inferred_location
 
 
+def infer_dimension_attributes(sgrid_obj, nc_var_obj):
+    """
+    Infer the slicing, averaging axes, and location
+    of a variable. These only depend on the dimensions
+    of the variable, so the result can be shared by
+    every variable with the same dimensions.
+    
+    :param sgrid_obj: an SGrid object
+    :type sgrid_obj: sgrid.SGrid2D or sgrid.SGrid3D
+    :param nc_var_obj: a netCDF variable defined on the grid
+    :type nc_var_obj: netCDF4.Variable
+    :return: attributes inferred from the variable's dimensions
+    :rtype: DimensionAttributes
+    
+    """
+    center_slicing = determine_variable_slicing(sgrid_obj, nc_var_obj, method='center')
+    center_axis, node_axis = infer_avg_axes(sgrid_obj, nc_var_obj)
+    location = infer_variable_location(sgrid_obj, nc_var_obj)
+    dimension_attributes = DimensionAttributes(center_slicing=center_slicing,
+                                               center_axis=center_axis,
+                                               node_axis=node_axis,
+                                               location=location
+                                               )
+    return dimension_attributes
+
+
 def calculate_bearing(lon_lat_1, lon_lat_2):
     """
     return bearing from true north in degrees
@@ -195,6 +279,24 @@ def calculate_bearing(lon_lat_1, lon_lat_2):
     return (bearing_degrees + 360) % 360
 
 
+def calculate_distance(lon_lat_1, lon_lat_2):
+    """
+    Return the great circle distance in meters
+    between paired lon/lat points using the
+    haversine formula.
+    
+    """
+    lon_lat_1_radians = lon_lat_1 * np.pi/180
+    lon_lat_2_radians = lon_lat_2 * np.pi/180
+    lon_1 = lon_lat_1_radians[..., 0]
+    lat_1 = lon_lat_1_radians[..., 1]
+    lon_2 = lon_lat_2_radians[..., 0]
+    lat_2 = lon_lat_2_radians[..., 1]
+    haversine = (np.sin((lat_2-lat_1)/2)**2 + 
+                 np.cos(lat_1)*np.cos(lat_2)*np.sin((lon_2-lon_1)/2)**2)
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(haversine, 0, 1)))
+
+
 def calculate_angle_from_true_east(lon_lat_1, lon_lat_2):
     """
     Return the angle from true east in radians
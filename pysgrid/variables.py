@@ -3,8 +3,10 @@ Created on Apr 15, 2015
 
 @author: ayan
 '''
-from .read_netcdf import parse_axes, parse_vector_axis
-from .utils import determine_variable_slicing, infer_avg_axes, infer_variable_location
+import netCDF4 as nc4
+
+from .prefetch import PrefetchReader
+from .read_netcdf import NETCDF_LOCK, parse_axes, parse_vector_axis
 
 
 class SGridVariable(object):
@@ -13,10 +15,29 @@ class SGridVariable(object):
     from an SGRID compliant dataset.
     
     """
+    __slots__ = ('center_axis',
+                 'center_slicing',
+                 'coordinates',
+                 'dataset_path',
+                 'dimensions',
+                 'dtype',
+                 'grid',
+                 'location',
+                 'node_axis',
+                 'node_slicing',
+                 'standard_name',
+                 'variable',
+                 'vector_axis',
+                 'x_axis',
+                 'y_axis',
+                 'z_axis'
+                 )
+    
     def __init__(self, 
                  center_axis=None,
                  center_slicing=None,
                  coordinates=None,
+                 dataset_path=None,
                  dimensions=None,
                  dtype=None,
                  grid=None,
@@ -32,6 +53,7 @@ class SGridVariable(object):
         self.center_axis = center_axis
         self.center_slicing = center_slicing
         self.coordinates = coordinates
+        self.dataset_path = dataset_path
         self.dimensions = dimensions
         self.dtype = dtype
         self.grid = grid
@@ -48,6 +70,9 @@ class SGridVariable(object):
     @classmethod
     def create_variable(cls, nc_var_obj, sgrid_obj):
         variable = nc_var_obj.name
+        # slicing, axes, and location are shared by all
+        # variables with the same dimensions
+        dimension_attributes = sgrid_obj.get_dimension_attributes(nc_var_obj)
         try:
             grid = nc_var_obj.grid
         except AttributeError:
@@ -55,17 +80,15 @@ class SGridVariable(object):
             center_axis = None
             node_axis = None
         else:
-            center_axis, node_axis = infer_avg_axes(sgrid_obj, nc_var_obj)
-        center_slicing = determine_variable_slicing(sgrid_obj, 
-                                                    nc_var_obj, 
-                                                    method='center'
-                                                    )
+            center_axis = dimension_attributes.center_axis
+            node_axis = dimension_attributes.node_axis
+        center_slicing = dimension_attributes.center_slicing
         dimensions = nc_var_obj.dimensions
         dtype = nc_var_obj.dtype
         try:
             location = nc_var_obj.location
         except AttributeError:
-            location = infer_variable_location(sgrid_obj, nc_var_obj)
+            location = dimension_attributes.location
         if location == 'edge':
             if center_axis == 0:
                 location = 'edge2'
@@ -108,6 +131,63 @@ class SGridVariable(object):
                         location=location,
                         standard_name=standard_name,
                         vector_axis=vector_axis,
-                        coordinates=coordinates
+                        coordinates=coordinates,
+                        dataset_path=getattr(sgrid_obj, 'dataset_path', None)
                         )
-        return sgrid_var
\ No newline at end of file
+        return sgrid_var
+    
+    def read(self, index=Ellipsis, nc_dataset=None):
+        """
+        Read data for this variable.
+        
+        :param index: index or slices of the data to read; defaults to all data
+        :param nc_dataset: an open dataset to read from; defaults to opening the grid's dataset
+        :type nc_dataset: netCDF4.Dataset
+        :return: the requested data
+        :rtype: numpy.ma.MaskedArray
+        
+        """
+        with NETCDF_LOCK:
+            if nc_dataset is not None:
+                return nc_dataset.variables[self.variable][index]
+            if self.dataset_path is None:
+                raise ValueError('There is no dataset to read {0} from'.format(self.variable))
+            with nc4.Dataset(self.dataset_path) as nc_dataset:
+                return nc_dataset.variables[self.variable][index]
+    
+    def iter_steps(self, axis=0, prefetch=2, index=(), sources=None):
+        """
+        Iterate over the steps of this variable along an axis
+        (time by default) while the next steps are read on a
+        background thread.
+        
+        Each step is a new array, so it can be kept
+        after the next step is requested.
+        
+        :param int axis: axis to step along
+        :param int prefetch: number of steps to read ahead
+        :param tuple index: index applied to the dimensions after axis
+        :param sources: files to read in order; defaults to the grid's dataset
+        :type sources: str or list
+        :return: reader yielding one array per step
+        :rtype: prefetch.PrefetchReader
+        
+        """
+        if sources is None:
+            if self.dataset_path is None:
+                raise ValueError('There is no dataset to read {0} from'.format(self.variable))
+            sources = self.dataset_path
+        return PrefetchReader(sources, self.variable, axis=axis, prefetch=prefetch, index=index)
+    
+    async def aread(self, index=Ellipsis):
+        """
+        Read data for this variable without blocking the event
+        loop. The read runs in pysgrid's bounded I/O executor.
+        
+        :param index: index or slices of the data to read; defaults to all data
+        :return: the requested data
+        :rtype: numpy.ma.MaskedArray
+        
+        """
+        from .aio import run_in_executor  # aio imports the grid classes
+        return await run_in_executor(self.read, index)
\ No newline at end of file
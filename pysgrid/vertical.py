@@ -0,0 +1,216 @@
+'''
+Created on Oct 18, 2026
+
+Depths of ROMS terrain-following (s-coordinate) levels.
+
+For both ROMS vertical transformations the depth is
+affine in the free surface, z = offset + zeta * scale,
+where offset and scale only depend on the bathymetry
+and the stretching parameters. Those two terms are
+computed once per grid location and reused for every
+time step.
+
+'''
+import collections
+
+import numpy as np
+
+
+# s-coordinate and stretching curve variables by vertical location
+S_COORDINATE_VARIABLES = {'rho': ('s_rho', 'Cs_r'),
+                          'w': ('s_w', 'Cs_w')
+                          }
+# horizontal location of the depths and the vertical location they use
+DEPTH_LOCATIONS = {'rho': 'rho',
+                   'w': 'w',
+                   'u': 'rho',
+                   'v': 'rho'
+                   }
+# depth location of variables by SGRID location
+SGRID_DEPTH_LOCATIONS = {'face': 'rho',
+                         'edge1': 'u',
+                         'edge2': 'v'
+                         }
+# number of time steps whose interpolation weights are kept per grid
+Z_INTERPOLATION_CACHE_SIZE = 8
+
+
+DepthTerms = collections.namedtuple('DepthTerms', ('offset', 'scale'))
+ZInterpolation = collections.namedtuple('ZInterpolation', ('lower',  # index of the level below each target depth
+                                                           'weight',  # weight of the level above
+                                                           'valid'  # target depths inside the water column
+                                                           ))
+
+
+def average_to_location(data_array, location):
+    """
+    Average an array on rho points to u points (adjacent
+    values along the last axis) or v points (adjacent
+    values along the second to last axis). Arrays for
+    rho and w locations are returned unchanged.
+
+    :param data_array: data on rho points; leading dimensions are kept
+    :type data_array: numpy.array
+    :param str location: one of 'rho', 'w', 'u', or 'v'
+    :return: data at location
+    :rtype: numpy.array
+
+    """
+    if location == 'u':
+        return 0.5 * (data_array[..., :-1] + data_array[..., 1:])
+    elif location == 'v':
+        return 0.5 * (data_array[..., :-1, :] + data_array[..., 1:, :])
+    elif location in ('rho', 'w'):
+        return data_array
+    else:
+        raise ValueError('Unknown depth location: {0}'.format(location))
+
+
+def s_coordinate_terms(s, cs, h, hc, vtransform=1):
+    """
+    Compute the time-invariant terms of the ROMS
+    s-coordinate transformation for every level
+    and water column at once.
+
+    :param s: s-coordinate values of the levels
+    :type s: numpy.array
+    :param cs: stretching curve values of the levels
+    :type cs: numpy.array
+    :param h: bathymetry; positive down
+    :type h: numpy.array
+    :param float hc: critical depth
+    :param int vtransform: ROMS vertical transformation, 1 or 2
+    :return: offset and scale arrays with shape (levels,) + h.shape
+    :rtype: DepthTerms
+
+    """
+    h = np.asarray(h, dtype=np.float64)
+    level_shape = (-1,) + (1,) * h.ndim
+    s = np.asarray(s, dtype=np.float64).reshape(level_shape)
+    cs = np.asarray(cs, dtype=np.float64).reshape(level_shape)
+    if vtransform == 1:
+        z0 = hc * s + (h - hc) * cs
+        offset = z0
+        scale = 1.0 + z0 / h
+    elif vtransform == 2:
+        z0 = (hc * s + h * cs) / (hc + h)
+        offset = h * z0
+        scale = 1.0 + z0
+    else:
+        raise ValueError('Unsupported Vtransform: {0}'.format(vtransform))
+    return DepthTerms(offset, scale)
+
+
+def s_coordinate_depths(depth_terms, zeta=None, out=None):
+    """
+    Compute depths from the time-invariant terms
+    and the free surface.
+
+    :param depth_terms: terms from s_coordinate_terms
+    :type depth_terms: DepthTerms
+    :param zeta: free surface for one time step, or several steps along a leading axis; None uses a flat surface
+    :type zeta: numpy.array
+    :param out: array to write the depths into
+    :type out: numpy.array
+    :return: depths; negative below the surface
+    :rtype: numpy.array
+
+    """
+    if zeta is None:
+        if out is None:
+            return depth_terms.offset.copy()
+        out[...] = depth_terms.offset
+        return out
+    zeta = np.expand_dims(np.asarray(zeta, dtype=np.float64), -3)  # broadcast over levels
+    out = np.multiply(zeta, depth_terms.scale, out=out)
+    out += depth_terms.offset
+    return out
+
+
+def read_depth_terms(nc_dataset, location='rho'):
+    """
+    Read the ROMS stretching parameters and bathymetry
+    from a dataset and compute the time-invariant depth
+    terms at a location. Vtransform defaults to 1 when
+    the dataset does not define it.
+
+    :param nc_dataset: an open ROMS dataset
+    :type nc_dataset: netCDF4.Dataset
+    :param str location: one of 'rho', 'w', 'u', or 'v'
+    :return: offset and scale arrays
+    :rtype: DepthTerms
+
+    """
+    try:
+        vertical_location = DEPTH_LOCATIONS[location]
+    except KeyError:
+        raise ValueError('Unknown depth location: {0}'.format(location))
+    s_name, cs_name = S_COORDINATE_VARIABLES[vertical_location]
+    nc_variables = nc_dataset.variables
+    missing_variables = [name for name in (s_name, cs_name, 'hc', 'h') if name not in nc_variables]
+    if missing_variables:
+        raise ValueError('Variables needed for depths are missing: {0}'.format(', '.join(missing_variables)))
+    if 'Vtransform' in nc_variables:
+        vtransform = int(nc_variables['Vtransform'][...])
+    else:
+        vtransform = 1
+    h = average_to_location(np.ma.filled(nc_variables['h'][:], np.nan), location)
+    return s_coordinate_terms(nc_variables[s_name][:],
+                              nc_variables[cs_name][:],
+                              h,
+                              float(nc_variables['hc'][...]),
+                              vtransform
+                              )
+
+
+def z_interpolation(depths, z_levels):
+    """
+    Find the levels bracketing each target depth in
+    every water column, and the linear interpolation
+    weights between them. All columns are searched at
+    once; the only loop is over the model levels.
+
+    :param depths: depths of the model levels with shape (level, ...), increasing with level
+    :type depths: numpy.array
+    :param z_levels: target depths; negative below the surface
+    :type z_levels: numpy.array
+    :return: bracketing indices, weights, and validity with shape (z_level, ...)
+    :rtype: ZInterpolation
+
+    """
+    depths = np.asarray(depths, dtype=np.float64)
+    level_count = depths.shape[0]
+    if level_count < 2:
+        raise ValueError('At least two levels are needed to interpolate')
+    z_levels = np.asarray(z_levels, dtype=np.float64)
+    targets = z_levels.reshape(z_levels.shape + (1,) * (depths.ndim - 1))
+    levels_below = np.zeros(z_levels.shape + depths.shape[1:], dtype=np.intp)
+    for level in range(level_count):
+        levels_below += depths[level] <= targets
+    lower = np.clip(levels_below - 1, 0, level_count - 2)
+    z_lower = np.take_along_axis(depths, lower, axis=0)
+    z_upper = np.take_along_axis(depths, lower + 1, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = (targets - z_lower) / (z_upper - z_lower)
+    valid = (targets >= depths[0]) & (targets <= depths[-1])
+    return ZInterpolation(lower, weight, valid)
+
+
+def interpolate_to_z(data_array, z_interp):
+    """
+    Interpolate data on model levels to the target
+    depths of a z_interpolation.
+
+    :param data_array: data with shape (level, ...) matching the depths used for z_interp
+    :type data_array: numpy.array
+    :param z_interp: bracketing indices and weights
+    :type z_interp: ZInterpolation
+    :return: data with shape (z_level, ...); masked outside the water column or where data are masked
+    :rtype: numpy.ma.MaskedArray
+
+    """
+    data = np.ma.filled(np.ma.asarray(data_array, dtype=np.float64), np.nan)
+    data_lower = np.take_along_axis(data, z_interp.lower, axis=0)
+    data_upper = np.take_along_axis(data, z_interp.lower + 1, axis=0)
+    result = data_lower + z_interp.weight * (data_upper - data_lower)
+    return np.ma.masked_where(~z_interp.valid | np.isnan(result), result)
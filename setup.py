@@ -22,7 +22,8 @@ setup(
     license             = 'BSD',
     long_description    = readme(),
     install_requires    = reqs,
-    tests_require       = ['mock', 'nose'],
+    python_requires     = '>=3.8',
+    tests_require       = ['mock', 'pytest'],
     classifiers         = [
             'Development Status :: 3 - Alpha',
             'Intended Audience :: Developers',
@@ -30,6 +31,7 @@ setup(
             'License :: OSI Approved :: BSD License',
             'Operating System :: POSIX :: Linux',
             'Programming Language :: Python',
+            'Programming Language :: Python :: 3',
             'Topic :: Scientific/Engineering',
         ],
     include_package_data = True,